@@ -0,0 +1,48 @@
+"""add login_attempts and login_counters tables
+
+Revision ID: b4d1e9c7a2f6
+Revises: f3b8d6a1c5e9
+Create Date: 2026-10-18 16:42:19.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d1e9c7a2f6'
+down_revision: Union[str, None] = 'f3b8d6a1c5e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Failed logins counted by the login throttle, per email and OS user
+    op.create_table(
+        'login_attempts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('attempted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_login_attempts_kind_key', 'login_attempts',
+                    ['kind', 'key', 'attempted_at'], unique=False)
+    login_counters = op.create_table(
+        'login_counters',
+        sa.Column('name', sa.String(length=20), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # Seeded so that concurrent logins only ever update them
+    op.bulk_insert(login_counters, [
+        {'name': name, 'value': 0}
+        for name in ('allowed', 'rejected', 'failed', 'succeeded')
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('login_counters')
+    op.drop_index('ix_login_attempts_kind_key', table_name='login_attempts')
+    op.drop_table('login_attempts')
@@ -0,0 +1,32 @@
+"""add permissions_version table
+
+Revision ID: c3e8a1f4b2d7
+Revises: 38a6c7ed96cc
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a1f4b2d7'
+down_revision: Union[str, None] = '38a6c7ed96cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Version of the permission matrix the roles and permissions were synced to
+    op.create_table(
+        'permissions_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('synced_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('permissions_version')
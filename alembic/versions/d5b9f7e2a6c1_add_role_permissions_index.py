@@ -0,0 +1,34 @@
+"""add composite index on role_permissions
+
+Revision ID: d5b9f7e2a6c1
+Revises: c3e8a1f4b2d7
+Create Date: 2026-10-18 10:04:27.551962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b9f7e2a6c1'
+down_revision: Union[str, None] = 'c3e8a1f4b2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the EXISTS permission check joining roles to their permissions.
+    # permissions.name is already covered by the permissions_name_key unique
+    # constraint created in the initial migration.
+    op.create_index(
+        'ix_role_permissions_role_id_permission_id',
+        'role_permissions',
+        ['role_id', 'permission_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_role_permissions_role_id_permission_id',
+        table_name='role_permissions',
+    )
@@ -0,0 +1,34 @@
+"""add revoked_tokens table
+
+Revision ID: e7a2c4d9f1b3
+Revises: d5b9f7e2a6c1
+Create Date: 2026-10-18 11:26:08.734415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c4d9f1b3'
+down_revision: Union[str, None] = 'd5b9f7e2a6c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tokens revoked at logout, by their jti claim
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('revoked_tokens')
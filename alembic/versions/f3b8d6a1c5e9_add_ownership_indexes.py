@@ -0,0 +1,33 @@
+"""add indexes on the ownership columns
+
+Revision ID: f3b8d6a1c5e9
+Revises: e7a2c4d9f1b3
+Create Date: 2026-10-18 13:02:51.208746
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d6a1c5e9'
+down_revision: Union[str, None] = 'e7a2c4d9f1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns holding the collaborator who owns each row
+OWNER_COLUMNS = [
+    ('clients', 'commercial_collaborator_id'),
+    ('contracts', 'commercial_collaborator_id'),
+    ('events', 'collaborator_support_id'),
+]
+
+
+def upgrade() -> None:
+    for table, column in OWNER_COLUMNS:
+        op.create_index(f'ix_{table}_{column}', table, [column])
+
+
+def downgrade() -> None:
+    for table, column in OWNER_COLUMNS:
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
@@ -0,0 +1,73 @@
+"""
+Benchmark of the login latency against the bcrypt work factor.
+
+For each cost, times hashing a password (set_password, paid by create,
+update and the rehash on login) and checking it (verify_password, paid by
+every login), then prints the median times and the logins one core can
+verify per second. Use it to pick BCRYPT_ROUNDS for the host.
+
+Usage:
+    python benchmarks/bcrypt_cost.py [--min 10] [--max 14] [--runs 5]
+                                     [--target-ms 250]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import bcrypt
+
+PASSWORD = b"benchmark-password"
+
+
+def time_cost(rounds, runs):
+    """
+    Times bcrypt at one work factor.
+
+    Args:
+        rounds (int): The work factor.
+        runs (int): The number of timed runs (the median is kept).
+
+    Returns:
+        tuple: The median hashing and checking times, in milliseconds.
+    """
+    hash_times = []
+    check_times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        hashed = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds))
+        hash_times.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        bcrypt.checkpw(PASSWORD, hashed)
+        check_times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(hash_times), statistics.median(check_times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min", type=int, default=10, help="The lowest cost.")
+    parser.add_argument("--max", type=int, default=14, help="The highest cost.")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Timed runs per cost (the median is kept).")
+    parser.add_argument("--target-ms", type=float, default=250,
+                        help="The login latency to stay under.")
+    options = parser.parse_args(argv)
+
+    print(f"{'rounds':<8}{'hash_ms':>12}{'login_ms':>12}{'logins/s/core':>16}")
+    recommended = None
+    for rounds in range(options.min, options.max + 1):
+        hash_ms, check_ms = time_cost(rounds, options.runs)
+        print(f"{rounds:<8}{hash_ms:>12.1f}{check_ms:>12.1f}"
+              f"{1000 / check_ms:>16.1f}")
+        if check_ms <= options.target_ms:
+            recommended = rounds
+    if recommended is None:
+        print(f"No cost logs in under {options.target_ms:.0f} ms.")
+    else:
+        print(f"Highest cost under {options.target_ms:.0f} ms: "
+              f"BCRYPT_ROUNDS={recommended}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
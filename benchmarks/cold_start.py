@@ -0,0 +1,332 @@
+"""
+Cold-start benchmark of the epic_events.py command line.
+
+Runs each command in a fresh interpreter against a seeded SQLite database,
+reports its wall-clock time and a ``-X importtime`` breakdown per module,
+and exits with status 1 when a command exceeds its budget: the baseline
+recorded in budgets.json times its tolerance.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--update-budgets]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_DIR)
+
+from benchmarks.seed import ADMIN_EMAIL, ADMIN_PASSWORD  # noqa: E402
+
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), "budgets.json")
+
+# Commands measured, in order: login writes the token the others use.
+COMMANDS = {
+    "--help": ["--help"],
+    "login": ["login", "--email", ADMIN_EMAIL, "--password", ADMIN_PASSWORD],
+    "whoami": ["whoami"],
+    "list-collaborators": ["list-collaborators"],
+    "list-clients": ["list-clients"],
+    "list-contracts": ["list-contracts"],
+    "list-events": ["list-events"],
+}
+
+# Modules reported in the import breakdown. A trailing ".*" sums the
+# outermost imports of a package's submodules.
+TRACKED_MODULES = [
+    "click",
+    "config.logger",
+    "sentry_sdk",
+    "pydantic",
+    "sqlalchemy",
+    "models",
+    "controllers.*",
+    "validators.*",
+    "views.*",
+]
+
+# Slowdown over the recorded baseline a command may show before it fails:
+# above the run-to-run noise, below a real regression.
+BUDGET_TOLERANCE = 1.3
+
+
+def parse_importtime(stderr):
+    """
+    Parses the output of ``python -X importtime``.
+
+    Args:
+        stderr (str): The standard error of the interpreter.
+
+    Returns:
+        list: (module, depth, self_us, cumulative_us) tuples, in the order
+        the imports finished.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        imports.append((module, depth, int(fields[0]), int(fields[1])))
+    return imports
+
+
+def build_import_tree(imports):
+    """
+    Rebuilds the import tree from the importtime output, which lists each
+    module after the modules it imported.
+
+    Args:
+        imports (list): The result of parse_importtime.
+
+    Returns:
+        list: The top-level imports, as (module, cumulative_us, children)
+        tuples.
+    """
+    stack = []
+    for module, depth, _, cumulative in imports:
+        children = []
+        while stack and stack[-1][0] > depth:
+            children.insert(0, stack.pop()[1])
+        stack.append((depth, (module, cumulative, children)))
+    return [node for _, node in stack]
+
+
+def import_breakdown(imports, tracked=TRACKED_MODULES):
+    """
+    Returns the cumulative import time of the tracked modules. A module
+    imported by another tracked module of the same entry is counted once,
+    in its outermost import.
+
+    Args:
+        imports (list): The result of parse_importtime.
+        tracked (list): Module names, or package prefixes ending with ".*".
+
+    Returns:
+        dict: Milliseconds per tracked module, plus "total" for the whole
+        run.
+    """
+    roots = build_import_tree(imports)
+
+    def outermost_time(nodes, name):
+        total = 0
+        for module, cumulative, children in nodes:
+            if name.endswith(".*"):
+                matches = module.startswith(name[:-1])
+            else:
+                matches = module == name
+            total += cumulative if matches else outermost_time(children, name)
+        return total
+
+    breakdown = {name: outermost_time(roots, name) / 1000 for name in tracked}
+    breakdown["total"] = sum(cumulative for _, cumulative, _ in roots) / 1000
+    return breakdown
+
+
+def benchmark_env(workdir):
+    """
+    Returns the environment the commands run with: an isolated HOME for the
+    token, the seeded database, no Sentry DSN and no daemon.
+
+    Args:
+        workdir (str): The temporary directory of the run.
+
+    Returns:
+        dict: The environment variables.
+    """
+    env = dict(os.environ)
+    env.update({
+        "HOME": workdir,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "SECRET_KEY": "benchmark-secret-key",
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        "TOKEN_DIR_PATH": ".epic_events",
+        "TOKEN_FILENAME": "access_token",
+        "SENTRY_DSN": "",
+        "EPIC_EVENTS_NO_DAEMON": "1",
+    })
+    return env
+
+
+def run_cli(args, env, importtime=False):
+    """
+    Runs epic_events.py in a fresh interpreter.
+
+    Args:
+        args (list): The command line arguments.
+        env (dict): The environment variables.
+        importtime (bool): Whether to run with ``-X importtime``.
+
+    Returns:
+        tuple: The wall-clock time in milliseconds and the completed process.
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += [os.path.join(ROOT_DIR, "epic_events.py")] + args
+    start = time.perf_counter()
+    result = subprocess.run(command, env=env, cwd=ROOT_DIR, capture_output=True,
+                            text=True, stdin=subprocess.DEVNULL)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"'{' '.join(args)}' failed: {result.stdout}"
+                           f"{result.stderr}")
+    return elapsed, result
+
+
+def measure(env, runs):
+    """
+    Measures every command of COMMANDS.
+
+    Args:
+        env (dict): The environment variables.
+        runs (int): The number of timed and of ``-X importtime`` runs per
+        command.
+
+    Returns:
+        dict: Per command, the median wall-clock time and the import
+        breakdown of the run with the median import time, in milliseconds.
+    """
+    results = {}
+    for name, args in COMMANDS.items():
+        breakdowns = sorted(
+            (import_breakdown(parse_importtime(run_cli(args, env, True)[1].stderr))
+             for _ in range(runs)),
+            key=lambda breakdown: breakdown["total"],
+        )
+        timings = [run_cli(args, env)[0] for _ in range(runs)]
+        results[name] = {"wall_ms": statistics.median(timings),
+                         "imports_ms": breakdowns[len(breakdowns) // 2]}
+    return results
+
+
+def load_budgets(path=BUDGETS_PATH):
+    """
+    Derives the budgets from the recorded baseline.
+
+    Args:
+        path (str): The budgets file, with the "baseline" times per command
+        and the "tolerance" they are multiplied by.
+
+    Returns:
+        dict: Per command, the maximum "wall_ms" and "import_ms".
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        recorded = json.load(f)
+    tolerance = recorded.get("tolerance", BUDGET_TOLERANCE)
+    return {
+        name: {key: value * tolerance for key, value in baseline.items()}
+        for name, baseline in recorded.get("baseline", {}).items()
+    }
+
+
+def write_baseline(results, path=BUDGETS_PATH, tolerance=BUDGET_TOLERANCE):
+    """
+    Records the measured times as the new baseline.
+
+    Args:
+        results (dict): The result of measure.
+        path (str): The budgets file.
+        tolerance (float): The slowdown allowed over the baseline.
+    """
+    recorded = {
+        "tolerance": tolerance,
+        "baseline": {
+            name: {"wall_ms": round(result["wall_ms"]),
+                   "import_ms": round(result["imports_ms"]["total"])}
+            for name, result in results.items()
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(recorded, f, indent=2)
+        f.write("\n")
+
+
+def check_budgets(results, budgets):
+    """
+    Compares the results with the budgets.
+
+    Args:
+        results (dict): The result of measure.
+        budgets (dict): Per command, the maximum "wall_ms" and "import_ms".
+
+    Returns:
+        list: A message for each exceeded budget.
+    """
+    failures = []
+    for name, result in results.items():
+        budget = budgets.get(name, {})
+        measured = {"wall_ms": result["wall_ms"],
+                    "import_ms": result["imports_ms"]["total"]}
+        for key, value in measured.items():
+            if key in budget and value > budget[key]:
+                failures.append(f"{name}: {key} {value:.0f} > budget "
+                                f"{budget[key]:.0f}")
+    return failures
+
+
+def print_report(results, budgets):
+    columns = ["wall_ms", "import_ms"] + TRACKED_MODULES
+    print(f"{'command':<20}" + "".join(f"{column:>15}" for column in columns))
+    for name, result in results.items():
+        imports = result["imports_ms"]
+        values = [result["wall_ms"], imports["total"]]
+        values += [imports[module] for module in TRACKED_MODULES]
+        print(f"{name:<20}" + "".join(f"{value:>15.1f}" for value in values))
+        budget = budgets.get(name)
+        if budget:
+            print(f"{'  budget':<20}"
+                  f"{budget.get('wall_ms', 0):>15.0f}"
+                  f"{budget.get('import_ms', 0):>15.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Timed runs per command (the median is kept).")
+    parser.add_argument("--budgets", default=BUDGETS_PATH,
+                        help="The budgets file.")
+    parser.add_argument("--update-budgets", action="store_true",
+                        help="Record the measured times as the new baseline.")
+    parser.add_argument("--json", dest="json_path",
+                        help="Also write the results to this file.")
+    options = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = benchmark_env(workdir)
+        subprocess.run([sys.executable, os.path.join(ROOT_DIR, "benchmarks",
+                                                     "seed.py")],
+                       env=env, cwd=ROOT_DIR, check=True)
+        results = measure(env, options.runs)
+
+    if options.json_path:
+        with open(options.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if options.update_budgets:
+        write_baseline(results, options.budgets)
+        print_report(results, load_budgets(options.budgets))
+        return 0
+
+    budgets = load_budgets(options.budgets)
+    print_report(results, budgets)
+    failures = check_budgets(results, budgets)
+    for failure in failures:
+        print(f"Budget exceeded - {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark of the lazy engine for commands that never query the database.
+
+Runs each command in fresh interpreters twice: as shipped, where the engine
+is only built by the first query, and with the engine built as soon as
+config.database is imported, as it was before. Prints the median wall-clock
+times, the time the eager run spends building the engine (the saving), and
+whether the lazy run loaded a dialect.
+
+Usage:
+    python benchmarks/lazy_engine.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_DIR)
+
+from benchmarks.cold_start import benchmark_env  # noqa: E402
+
+# Commands that end before any query: no token is stored during the run.
+COMMANDS = {
+    "--help": ["--help"],
+    "logout": ["logout"],
+    "whoami (logged out)": ["whoami"],
+    "list-clients (logged out)": ["list-clients"],
+}
+
+RUNNER = """\
+import atexit, runpy, sys, time
+args = sys.argv[1:]
+sys.argv = ["epic_events.py", *args[1:]]
+if args[0] == "eager":
+    # Build the engine as soon as config.database is imported, as before.
+    import builtins
+    real_import = builtins.__import__
+
+    def eager_import(name, *rest, **kwargs):
+        module = real_import(name, *rest, **kwargs)
+        database = sys.modules.get("config.database")
+        if builtins.__import__ is eager_import and \\
+                hasattr(database, "get_engine"):
+            builtins.__import__ = real_import
+            start = time.perf_counter()
+            database.get_engine()
+            elapsed = (time.perf_counter() - start) * 1000
+            print("ENGINE", elapsed, file=sys.stderr)
+        return module
+    builtins.__import__ = eager_import
+atexit.register(lambda: print(
+    "DIALECT", any(m.startswith("sqlalchemy.dialects.") for m in sys.modules),
+    file=sys.stderr))
+runpy.run_path("epic_events.py", run_name="__main__")
+"""
+
+
+def run(mode, args, env):
+    """
+    Runs epic_events.py in a fresh interpreter.
+
+    Args:
+        mode (str): "lazy" as shipped, or "eager" to build the engine on import.
+        args (list): The command line arguments.
+        env (dict): The environment variables.
+
+    Returns:
+        tuple: The wall-clock time and the time spent building the engine,
+        in milliseconds, and whether a database dialect was imported.
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", RUNNER, mode] + args,
+                            env=env, cwd=ROOT_DIR, capture_output=True,
+                            text=True, stdin=subprocess.DEVNULL)
+    elapsed = (time.perf_counter() - start) * 1000
+    engine_ms = 0.0
+    for line in result.stderr.splitlines():
+        if line.startswith("ENGINE "):
+            engine_ms = float(line.split()[1])
+    return elapsed, engine_ms, "DIALECT True" in result.stderr
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10,
+                        help="Timed runs per command and mode (the median is kept).")
+    options = parser.parse_args(argv)
+
+    print(f"{'command':<28}{'eager_ms':>12}{'lazy_ms':>12}{'engine_ms':>12}"
+          f"{'lazy dialect':>14}")
+    with tempfile.TemporaryDirectory() as workdir:
+        env = benchmark_env(workdir)
+        for name, args in COMMANDS.items():
+            eager = [run("eager", args, env) for _ in range(options.runs)]
+            lazy = [run("lazy", args, env) for _ in range(options.runs)]
+            # engine_ms is the cost the lazy engine saves on this command.
+            print(f"{name:<28}"
+                  f"{statistics.median(ms for ms, _, _ in eager):>12.1f}"
+                  f"{statistics.median(ms for ms, _, _ in lazy):>12.1f}"
+                  f"{statistics.median(ms for _, ms, _ in eager):>12.1f}"
+                  f"{str(any(loaded for _, _, loaded in lazy)):>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
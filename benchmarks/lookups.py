@@ -0,0 +1,147 @@
+"""
+Micro-benchmark of the primary key and unique column lookups.
+
+Fills a SQLite database with collaborators and clients, then times each
+lookup per call the way it was written before (a legacy
+``session.query(...).filter(...).first()`` built on every call) and as
+shipped (``session.get`` and statements built once), in two cases:
+
+- cold: the identity map is emptied before each call, so every lookup
+  runs a SELECT and only the statement building and compiling differ;
+- warm: the object is already loaded, as when a validator and the
+  controller of one command look up the same row.
+
+Usage:
+    python benchmarks/lookups.py [--rows 1000] [--calls 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_DIR)
+
+from config import database  # noqa: E402
+from config.database import Base, SessionLocal  # noqa: E402
+from models import Client, Collaborator, Contract, Event  # noqa: E402, F401
+
+
+def legacy_get_by_id(model):
+    return lambda row_id, session: (
+        session.query(model).filter(model.id == row_id).first()
+    )
+
+
+def legacy_get_by_email(email, session):
+    return session.query(Collaborator).filter(Collaborator.email == email).first()
+
+
+def legacy_get_by_employee_number(employee_number, session):
+    return (
+        session.query(Collaborator)
+        .filter(Collaborator.employee_number == employee_number)
+        .first()
+    )
+
+
+LOOKUPS = {
+    "Client.get_by_id": (legacy_get_by_id(Client), Client.get_by_id, "id"),
+    "Collaborator.get_by_id": (
+        legacy_get_by_id(Collaborator), Collaborator.get_by_id, "id"
+    ),
+    "Collaborator.get_by_email": (
+        legacy_get_by_email, Collaborator.get_by_email, "email"
+    ),
+    "Collaborator.get_by_employee_number": (
+        legacy_get_by_employee_number, Collaborator.get_by_employee_number,
+        "employee_number",
+    ),
+}
+
+
+def fill(rows):
+    """
+    Inserts ``rows`` collaborators and as many clients.
+
+    Args:
+        rows (int): The number of rows of each table.
+    """
+    with database.get_engine().begin() as connection:
+        connection.execute(Collaborator.__table__.insert(), [
+            {"id": number, "employee_number": number, "name": f"Name {number}",
+             "email": f"user{number}@example.com", "role_id": 1,
+             "password": "x"}
+            for number in range(1, rows + 1)
+        ])
+        connection.execute(Client.__table__.insert(), [
+            {"id": number, "full_name": f"Client {number}",
+             "email": f"client{number}@example.com", "phone_number": "+3312345",
+             "company_name": "Corp", "commercial_collaborator_id": number}
+            for number in range(1, rows + 1)
+        ])
+
+
+def key_of(field, number):
+    return f"user{number}@example.com" if field == "email" else number
+
+
+def per_call_us(lookup, field, rows, calls, warm):
+    """
+    Times a lookup function.
+
+    Returns:
+        float: The median time per call in microseconds, over 5 runs of
+        ``calls`` calls.
+    """
+    timings = []
+    session = SessionLocal()
+    try:
+        for _ in range(5):
+            # The identity map only holds weak references: keep the object.
+            loaded = lookup(key_of(field, 1), session) if warm else None
+            start = time.perf_counter()
+            for call in range(calls):
+                number = 1 if warm else call % rows + 1
+                if not warm:
+                    session.expunge_all()
+                assert lookup(key_of(field, number), session) is not None
+            timings.append((time.perf_counter() - start) / calls * 1e6)
+            del loaded
+    finally:
+        session.close()
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000,
+                        help="Collaborators and clients in the database.")
+    parser.add_argument("--calls", type=int, default=2000,
+                        help="Lookups per timed run.")
+    options = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database.dispose()
+        database.DATABASE_URL = f"sqlite:///{os.path.join(workdir, 'lookups.db')}"
+        Base.metadata.create_all(database.get_engine())
+        fill(options.rows)
+        print(f"{'lookup':<38}{'case':>6}{'before_us':>11}{'after_us':>10}"
+              f"{'speedup':>9}")
+        for name, (before, after, field) in LOOKUPS.items():
+            for warm in (False, True):
+                before_us = per_call_us(before, field, options.rows,
+                                        options.calls, warm)
+                after_us = per_call_us(after, field, options.rows,
+                                       options.calls, warm)
+                print(f"{name:<38}{'warm' if warm else 'cold':>6}"
+                      f"{before_us:>11.1f}{after_us:>10.1f}"
+                      f"{before_us / after_us:>8.1f}x")
+        database.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Benchmark of the revocation check against the number of revoked tokens.
+
+For each size, fills a SQLite revoked_tokens table, builds the local Bloom
+filter, then times what a command pays to check a token that is not
+revoked: reading the cached filter and testing the jti, without a query.
+The database lookup the filter avoids and an incremental refresh of 100 new
+revocations are timed for comparison.
+
+Usage:
+    python benchmarks/revocation.py [--sizes 0 1000 10000 100000] [--runs 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_DIR)
+
+from config import database, revocation  # noqa: E402
+from config.database import Base, SessionLocal  # noqa: E402
+from models.collaborator import RevokedToken  # noqa: E402
+
+
+def fill(size, start=0):
+    """
+    Inserts ``size`` revoked tokens expiring in an hour.
+
+    Args:
+        size (int): The number of tokens.
+        start (int): The id of the first row minus one.
+    """
+    expires_at = datetime.utcnow() + timedelta(hours=1)
+    rows = [{"id": start + number + 1, "jti": uuid.uuid4().hex,
+             "expires_at": expires_at, "revoked_at": datetime.utcnow()}
+            for number in range(size)]
+    if rows:
+        with database.get_engine().begin() as connection:
+            connection.execute(RevokedToken.__table__.insert(), rows)
+
+
+def median_ms(function, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure(size, runs, workdir):
+    """
+    Measures the revocation check with ``size`` revoked tokens.
+
+    Returns:
+        tuple: The check, database lookup and refresh times in milliseconds,
+        and the size of the filter file in KB.
+    """
+    database.dispose()
+    database.DATABASE_URL = f"sqlite:///{os.path.join(workdir, f'{size}.db')}"
+    Base.metadata.create_all(database.get_engine(),
+                             tables=[RevokedToken.__table__])
+    fill(size)
+    cache_path = os.path.join(workdir, f"{size}.bloom")
+    os.environ["REVOCATION_CACHE_PATH"] = cache_path
+    revocation.get_revocation_filter()
+    jti = uuid.uuid4().hex
+
+    def check():
+        # A new command: nothing in memory, a fresh filter on disk.
+        revocation._cache = None
+        assert not revocation.is_revoked(jti)
+
+    def lookup():
+        session = SessionLocal()
+        try:
+            RevokedToken.is_revoked(session, jti)
+        finally:
+            session.close()
+
+    check_ms = median_ms(check, runs)
+    lookup_ms = median_ms(lookup, runs)
+    fill(100, start=size)
+    start = time.perf_counter()
+    session = SessionLocal()
+    try:
+        revocation.refresh_filter(session, revocation.read_filter(cache_path)[0])
+    finally:
+        session.close()
+    refresh_ms = (time.perf_counter() - start) * 1000
+    return check_ms, lookup_ms, refresh_ms, os.path.getsize(cache_path) / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[0, 1000, 10000, 100000],
+                        help="The numbers of revoked tokens.")
+    parser.add_argument("--runs", type=int, default=50,
+                        help="Timed runs per size (the median is kept).")
+    options = parser.parse_args(argv)
+
+    print(f"{'revoked':>10}{'check_ms':>12}{'db_lookup_ms':>14}"
+          f"{'refresh_100_ms':>16}{'filter_kb':>12}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in options.sizes:
+            check_ms, lookup_ms, refresh_ms, filter_kb = measure(
+                size, options.runs, workdir
+            )
+            print(f"{size:>10}{check_ms:>12.3f}{lookup_ms:>14.3f}"
+                  f"{refresh_ms:>16.1f}{filter_kb:>12.0f}")
+        database.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import os
+import sys
+
+# Add the project root directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "benchmark-password"
+
+
+def seed(clients=200, contracts_per_client=2):
+    """
+    Creates the tables of DATABASE_URL and fills them with roles, permissions,
+    a management user, sales and support collaborators, clients, contracts
+    and events.
+
+    Args:
+        clients (int): The number of clients to create.
+        contracts_per_client (int): The number of contracts per client, the
+        first one of each client with an event.
+    """
+    from datetime import datetime, timedelta
+
+    from config.database import Base, SessionLocal, engine
+    from controllers.permission_controller import sync_permissions
+    from models import Client, Collaborator, Contract, Event
+    from models.collaborator import Role
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        sync_permissions(session)
+        roles = {str(role): role for role in session.query(Role)}
+
+        admin = Collaborator(employee_number=1, name="admin", email=ADMIN_EMAIL,
+                             role_id=roles["management"].id)
+        admin.set_password(ADMIN_PASSWORD)
+        sales = Collaborator(employee_number=2, name="sales",
+                             email="sales@example.com",
+                             role_id=roles["sales"].id)
+        sales.set_password(ADMIN_PASSWORD)
+        support = Collaborator(employee_number=3, name="support",
+                               email="support@example.com",
+                               role_id=roles["support"].id)
+        support.set_password(ADMIN_PASSWORD)
+        session.add_all([admin, sales, support])
+        session.flush()
+
+        start = datetime.now() + timedelta(days=30)
+        for i in range(clients):
+            client = Client(full_name=f"Client {i}", email=f"client{i}@example.com",
+                            phone_number="0123456789", company_name=f"Company {i}",
+                            commercial_collaborator_id=sales.id)
+            session.add(client)
+            for j in range(contracts_per_client):
+                contract = Contract(client=client, collaborator=sales,
+                                    total_amount=1000, amount_due=500 * j,
+                                    status=j == 0)
+                session.add(contract)
+                if j == 0:
+                    session.add(Event(client=client, contract=contract,
+                                      description=f"Event {i}",
+                                      date_start=start, date_end=start,
+                                      collaborator_support_id=support.id,
+                                      location="Paris", attendees=10))
+        session.commit()
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    seed()
@@ -0,0 +1,50 @@
+import click
+
+from controllers.collaborator_controller import (
+    authentication,
+    login_stats_controller,
+    logout_controller,
+    whoami_controller,
+)
+from validators.click_validator import validate_email
+
+
+# Login
+@click.command()
+@click.option(
+    "--email",
+    type=str,
+    prompt="Email",
+    callback=validate_email,
+    help="The email of the user.",
+)
+@click.option(
+    "--password",
+    prompt=True,
+    hide_input=True,
+    help="The password of the user.",
+)
+def login(email, password):
+    """Login"""
+    authentication(email, password)
+
+
+# Logout
+@click.command()
+def logout():
+    """Logout"""
+    logout_controller()
+
+
+# Whoami
+@click.command()
+def whoami():
+    """Print the current user"""
+    whoami_controller()
+
+
+# Login stats
+@click.command()
+def login_stats():
+    """Print the counters of the login throttle"""
+    login_stats_controller()
@@ -0,0 +1,21 @@
+import click
+
+from controllers.batch_controller import DEFAULT_CHUNK_SIZE, run_batch_controller
+
+
+# Run batch
+@click.command()
+@click.argument("file", type=click.File("r"))
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="Operations per commit, 0 to commit once at the end.",
+)
+@click.pass_context
+def run_batch(ctx, file, chunk_size):
+    """Run the operations of a JSONL file"""
+    result = run_batch_controller(ctx.find_root().command, ctx, file, chunk_size)
+    if result is None or result[1]:
+        ctx.exit(1)
@@ -0,0 +1,133 @@
+import click
+
+from controllers.client_controller import (
+    create_client_controller,
+    delete_client_controller,
+    list_clients_controller,
+    update_client_controller,
+)
+from validators.click_validator import (
+    validate_client_by_sales,
+    validate_commercial,
+    validate_email,
+    validate_phone_number,
+)
+
+
+# Create client
+@click.command()
+@click.option(
+    "--full-name",
+    type=str,
+    prompt="Full-name",
+    required=True,
+    help="Full name of the contact",
+)
+@click.option(
+    "--email",
+    type=str,
+    prompt="Email",
+    callback=validate_email,
+    required=True,
+    help="Email address of the contact",
+)
+@click.option(
+    "--phone-number",
+    type=str,
+    prompt="Phone number",
+    callback=validate_phone_number,
+    required=True,
+    help="Phone number of the contact",
+)
+@click.option(
+    "--company-name",
+    type=str,
+    prompt="Company name",
+    required=True,
+    help="Company name of the contact",
+)
+def create_client(full_name, email, phone_number, company_name):
+    """Create client"""
+    create_client_controller(full_name, email, phone_number, company_name)
+
+
+# List clients
+@click.command()
+@click.option("--mine", is_flag=True, help="only your clients")
+def list_clients(mine):
+    """List clients"""
+    filters = []
+    if mine:
+        filters.append("mine")
+    list_clients_controller(filters=filters)
+
+
+@click.command()
+@click.option(
+    "--client_id",
+    type=int,
+    prompt="id client",
+    required=True,
+    callback=validate_client_by_sales,
+    help="the id client to delete",
+)
+# Delete client
+def delete_client(client_id):
+    """Delete client"""
+    delete_client_controller(client_id)
+
+
+# Update client
+@click.command()
+@click.option(
+    "--id",
+    type=int,
+    prompt="id-client",
+    callback=validate_client_by_sales,
+    required=True,
+    help="Id client",
+)
+@click.option(
+    "--full-name",
+    type=str,
+    prompt="Full-name",
+    required=True,
+    help="Full name of the contact",
+)
+@click.option(
+    "--email",
+    type=str,
+    prompt="Email",
+    callback=validate_email,
+    required=True,
+    help="Email address of the contact",
+)
+@click.option(
+    "--phone-number",
+    type=str,
+    prompt="Phone number",
+    callback=validate_phone_number,
+    required=True,
+    help="Phone number of the contact",
+)
+@click.option(
+    "--company-name",
+    type=str,
+    prompt="Company name",
+    required=True,
+    help="Company name of the contact",
+)
+@click.option(
+    "--commercial-collaborator-id",
+    type=str,
+    prompt="commercial collaborator id",
+    callback=validate_commercial,
+    required=True,
+    help="Id for the commercial collaborator responsible for the client",
+)
+def update_client(id, full_name, email, phone_number, company_name,
+                  commercial_collaborator_id):
+    """Update client"""
+    update_client_controller(
+        id, full_name, email, phone_number, company_name, commercial_collaborator_id
+    )
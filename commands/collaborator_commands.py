@@ -0,0 +1,128 @@
+import click
+from pydantic import EmailStr
+
+from controllers.collaborator_controller import (
+    create_collaborator_controller,
+    delete_collaborator_controller,
+    import_collaborators_controller,
+    list_collaborators_controller,
+    update_collaborator_controller,
+)
+from validators.click_validator import (
+    validate_email_exist,
+    validate_employee_number,
+    validate_employee_number_exist,
+    validate_role,
+)
+
+
+# Create collaborator
+@click.command()
+@click.option(
+    "--employee-number",
+    prompt="Employee Number",
+    callback=validate_employee_number_exist,
+    help="The employee number of the collaborator.",
+)
+@click.option(
+    "--name", type=str, prompt="Name", help="The name of the collaborator."
+)
+@click.option(
+    "--email",
+    type=EmailStr,
+    callback=validate_email_exist,
+    prompt="Email",
+    help="The email of the collaborator.",
+)
+@click.option(
+    "--role-id",
+    type=int,
+    callback=validate_role,
+    prompt="Role ID",
+    help="The role ID of the collaborator.",
+)
+@click.option(
+    "--password",
+    prompt=True,
+    hide_input=True,
+    confirmation_prompt=True,
+    help="The password of the collaborator.",
+)
+def create_collaborator(employee_number, name, email, role_id, password):
+    """Create collaborator"""
+    create_collaborator_controller(employee_number, name, email, role_id, password)
+
+
+# Import collaborators
+@click.command()
+@click.argument("file", type=click.File("r"))
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Processes hashing the passwords, one per CPU by default.",
+)
+@click.pass_context
+def import_collaborators(ctx, file, workers):
+    """Create the collaborators of a CSV or JSONL file"""
+    if import_collaborators_controller(file, workers) is None:
+        ctx.exit(1)
+
+
+# List_collaborators
+@click.command()
+def list_collaborators():
+    """List collaborators"""
+    list_collaborators_controller()
+
+
+# Delete collaborators
+@click.command()
+@click.option(
+    "--employee-number",
+    type=int,
+    prompt="Employee Number",
+    callback=validate_employee_number,
+    help="The employee number of the collaborator.",
+)
+def delete_collaborator(employee_number):
+    """Delete collaborator"""
+    delete_collaborator_controller(employee_number)
+
+
+# Update collaborators
+@click.command()
+@click.option(
+    "--employee-number",
+    prompt="Employee Number",
+    type=int,
+    callback=validate_employee_number,
+    help="The employee number of the collaborator.",
+)
+@click.option(
+    "--name", type=str, prompt="Name", help="The name of the collaborator."
+)
+@click.option(
+    "--email",
+    type=str,
+    prompt="Email",
+    callback=validate_email_exist,
+    help="The email of the collaborator.",
+)
+@click.option(
+    "--role-id",
+    type=int,
+    callback=validate_role,
+    prompt="Role ID",
+    help="The role ID of the collaborator.",
+)
+@click.option(
+    "--password",
+    prompt=True,
+    hide_input=True,
+    confirmation_prompt=True,
+    help="The password of the collaborator.",
+)
+def update_collaborator(employee_number, name, email, role_id, password):
+    """Update collaborator"""
+    update_collaborator_controller(employee_number, name, email, role_id, password)
@@ -0,0 +1,156 @@
+import click
+
+from commands.types import DECIMAL
+from controllers.contract_controller import (
+    create_contract_controller,
+    delete_contract_controller,
+    list_contracts_controller,
+    update_contract_controller,
+)
+from validators.click_validator import (
+    validate_amount,
+    validate_boolean,
+    validate_client,
+    validate_contract_by_collaborator,
+    validate_contract_is_not_assigned_to_event,
+)
+
+
+# Create contract
+@click.command()
+@click.option(
+    "--client_id",
+    prompt="client id",
+    callback=validate_client,
+    type=int,
+    required=True,
+    help="Client ID",
+)
+@click.option(
+    "--total_amount",
+    prompt="total_amout",
+    type=DECIMAL,
+    required=True,
+    help="Total Amount",
+)
+@click.option(
+    "--amount_due",
+    prompt="amount_due",
+    callback=validate_amount,
+    type=DECIMAL,
+    required=True,
+    help="Amount Due",
+)
+@click.option(
+    "--status",
+    prompt="is signed",
+    type=bool,
+    callback=validate_boolean,
+    required=True,
+    help="Status signed or not",
+)
+def create_contract(
+    client_id, total_amount, amount_due, status
+):
+    """Create contract"""
+    create_contract_controller(
+        client_id, total_amount, amount_due, status
+    )
+
+
+# List contracts
+@click.option(
+    "--unpaid",
+    is_flag=True,
+    help="unpaid contract",
+)
+@click.option(
+    "--unsigned",
+    is_flag=True,
+    help="unsigned contract",
+)
+@click.option(
+    "--mine",
+    is_flag=True,
+    help="only your contracts",
+)
+@click.command()
+def list_contracts(unpaid, unsigned, mine):
+    """List contracts"""
+    filters = []
+    if mine:
+        filters.append("mine")
+    if unpaid:
+        filters.append("unpaid")
+    if unsigned:
+        filters.append("unsigned")
+    list_contracts_controller(filters=filters)
+
+
+# Delete contracts
+@click.command()
+@click.option(
+    "--contract-id",
+    prompt="contract id",
+    callback=validate_contract_by_collaborator,
+    type=int,
+    required=True,
+    help="Contract ID",
+)
+def delete_contract(contract_id):
+    """Delete contract"""
+    delete_contract_controller(contract_id)
+
+
+# Update contract
+@click.command()
+@click.option(
+    "--id",
+    prompt="contract id",
+    type=int,
+    callback=validate_contract_by_collaborator,
+    required=True,
+    help="Contract ID",
+)
+@click.option(
+    "--client_id",
+    prompt="client id",
+    type=int,
+    callback=validate_client,
+    required=True,
+    help="Client ID",
+)
+@click.option(
+    "--total_amount",
+    prompt="total_amout",
+    type=DECIMAL,
+    required=True,
+    help="Total Amount",
+)
+@click.option(
+    "--amount_due",
+    prompt="amount_due",
+    callback=validate_amount,
+    type=DECIMAL,
+    required=True,
+    help="Amount Due",
+)
+@click.option(
+    "--status",
+    prompt="is signed",
+    callback=validate_contract_is_not_assigned_to_event,
+    type=bool,
+    required=True,
+    help="Status"
+)
+def update_contract(
+    id, client_id, total_amount, amount_due, status
+):
+    """Update contract"""
+    update_contract_controller(
+        id,
+        client_id,
+        total_amount,
+        amount_due,
+        status,
+    )
@@ -0,0 +1,25 @@
+import click
+
+from controllers.daemon_controller import pool_stats_controller, serve_controller
+
+
+# Serve
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=str,
+    required=False,
+    help="Path of the Unix socket (defaults to EPIC_EVENTS_SOCKET).",
+)
+@click.pass_context
+def serve(ctx, socket_path):
+    """Serve commands over a Unix socket"""
+    serve_controller(ctx.find_root().command, ctx, socket_path)
+
+
+# Pool stats
+@click.command()
+def pool_stats():
+    """Print the metrics of the connection pool"""
+    pool_stats_controller()
@@ -0,0 +1,248 @@
+import click
+
+from controllers.event_controller import (
+    create_event_controller,
+    delete_event_controller,
+    list_events_controller,
+    update_event_controller,
+)
+from validators.click_validator import (
+    validate_attendees,
+    validate_contract_for_event,
+    validate_contract_id_existing_is_signed,
+    validate_date,
+    validate_end_date,
+    validate_event_assigned_to_support_id,
+    validate_event_id,
+    validate_support,
+)
+
+
+# Create event
+@click.command()
+@click.option(
+    "--contract_id",
+    prompt="Contract ID",
+    callback=validate_contract_for_event,
+    type=int,
+    required=True,
+    help="Contract ID",
+)
+@click.option(
+    "--description",
+    prompt="Description",
+    type=str,
+    required=True,
+    help="Description of the event",
+)
+@click.option(
+    "--date_start",
+    prompt="Start Date (YYYY-MM-DD HH:MM)",
+    type=str,
+    callback=validate_date,
+    required=True,
+    help="Start date and time",
+)
+@click.option(
+    "--date_end",
+    prompt="End Date (YYYY-MM-DD HH:MM)",
+    type=str,
+    callback=validate_end_date,
+    required=True,
+    help="End date and time",
+)
+@click.option(
+    "--location",
+    prompt="Location",
+    type=str,
+    required=True,
+    help="Location of the event",
+)
+@click.option(
+    "--attendees",
+    prompt="Number of Attendees",
+    type=int,
+    required=True,
+    callback=validate_attendees,
+    help="Number of attendees",
+)
+@click.option(
+    "--notes",
+    prompt="Notes",
+    type=str,
+    required=False,
+    help="Additional notes",
+)
+def create_event(
+    contract_id,
+    description,
+    date_start,
+    date_end,
+    location,
+    attendees,
+    notes,
+):
+    """Create an event"""
+    event_data = {
+        "contract_id": contract_id,
+        "description": description,
+        "date_start": date_start,
+        "date_end": date_end,
+        "location": location,
+        "attendees": attendees,
+        "notes": notes,
+    }
+    create_event_controller(**event_data)
+
+
+# Update event management
+@click.command()
+@click.option(
+    "--id",
+    prompt="Event ID",
+    type=int,
+    callback=validate_event_id,
+    required=True,
+    help="Event ID",
+)
+@click.option(
+    "--collaborator_support_id",
+    type=int,
+    prompt="support contact id",
+    callback=validate_support,
+    required=True,
+    help="support id",
+)
+def update_event_management(id, collaborator_support_id):
+    """Update event for manager role"""
+    update_data = {
+        "id": id,
+        "collaborator_support_id": collaborator_support_id,
+    }
+    update_event_controller(**update_data)
+
+
+# Update event support
+@click.command()
+@click.option(
+    "--id",
+    prompt="Event ID",
+    type=int,
+    callback=validate_event_assigned_to_support_id,
+    required=True,
+    help="Event ID",
+)
+@click.option(
+    "--contract_id",
+    prompt="Contract ID",
+    callback=validate_contract_id_existing_is_signed,
+    type=int,
+    required=False,
+    help="Contract ID",
+)
+@click.option(
+    "--description",
+    prompt="Description",
+    type=str,
+    required=False,
+    help="Description of the event",
+)
+@click.option(
+    "--date_start",
+    type=str,
+    prompt="Date start",
+    callback=validate_date,
+    required=False,
+    help="Start date and time (YYYY-MM-DD HH:MM:SS)",
+)
+@click.option(
+    "--date_end",
+    type=str,
+    prompt="Date end",
+    callback=validate_end_date,
+    required=False,
+    help="End date and time (YYYY-MM-DD HH:MM:SS)",
+)
+@click.option(
+    "--collaborator_support_id",
+    type=int,
+    prompt="Support contact id",
+    callback=validate_support,
+    required=False,
+    help="Support id",
+)
+@click.option(
+    "--location",
+    type=str,
+    prompt="Location",
+    required=False,
+    help="Location of the event",
+)
+@click.option(
+    "--attendees",
+    type=int,
+    callback=validate_attendees,
+    prompt="Attendees",
+    required=False,
+    help="Number of attendees",
+)
+@click.option(
+    "--notes",
+    type=str,
+    prompt="Notes",
+    required=False,
+    help="Additional notes",
+)
+def update_event_support(
+    id,
+    contract_id,
+    description,
+    date_start,
+    date_end,
+    collaborator_support_id,
+    location,
+    attendees,
+    notes,
+):
+    """Update event for support role"""
+    update_data = {
+        "id": id,
+        "contract_id": contract_id,
+        "description": description,
+        "date_start": date_start,
+        "date_end": date_end,
+        "collaborator_support_id": collaborator_support_id,
+        "location": location,
+        "attendees": attendees,
+        "notes": notes,
+    }
+    update_data = {k: v for k, v in update_data.items() if v is not None}
+    update_event_controller(**update_data)
+
+
+# Delete event
+@click.command()
+@click.option("--id", prompt="Event ID", type=int, required=True, help="Event ID")
+def delete_event(id):
+    """Delete an event"""
+    delete_event_controller(id)
+
+
+# List events
+@click.command()
+@click.option("--with_no_support", is_flag=True, help="is it linked to a support")
+@click.option("--assigned_to_me", is_flag=True, help="is it assigned to you")
+def list_events(with_no_support, assigned_to_me):
+    """List events"""
+    filters = []
+    if with_no_support and assigned_to_me:
+        raise click.BadParameter(
+            "Can't use both with_no_support and assigned_to_me together"
+        )
+    if with_no_support:
+        filters.append("with_no_support")
+    elif assigned_to_me:
+        filters.append("assigned_to_me")
+    list_events_controller(
+        filters,
+    )
@@ -0,0 +1,30 @@
+import click
+
+from controllers.permission_controller import (
+    cache_stats_controller,
+    sync_permissions_controller,
+)
+
+
+# Sync permissions
+@click.command()
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show the changes without applying them.",
+)
+def sync_permissions(dry_run):
+    """Sync the roles and permissions tables with config/permissions.py"""
+    sync_permissions_controller(dry_run=dry_run)
+
+
+# Reference cache stats
+@click.command()
+@click.option(
+    "--clear",
+    is_flag=True,
+    help="Drop the cached roles, permissions and collaborators first.",
+)
+def cache_stats(clear):
+    """Print the counters of the reference cache"""
+    cache_stats_controller(clear=clear)
@@ -0,0 +1,11 @@
+import click
+
+from controllers.shell_controller import shell_controller
+
+
+# Shell
+@click.command()
+@click.pass_context
+def shell(ctx):
+    """Start an interactive shell"""
+    shell_controller(ctx.find_root().command)
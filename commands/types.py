@@ -0,0 +1,38 @@
+from decimal import Decimal, InvalidOperation
+import click
+
+
+# Custom Click parameter type for validating non-negative decimal inputs.
+class DecimalType(click.ParamType):
+    """
+    Custom parameter type for handling decimal values.
+    """
+
+    name = "decimal"
+
+    def convert(self, value, param, ctx):
+        """
+        Converts the input value to a Decimal object.
+
+        Args:
+            value (str): The input value to be converted.
+            param (click.Parameter): The parameter object.
+            ctx (click.Context): The click context object.
+
+        Returns:
+            Decimal: The converted Decimal object.
+
+        Raises:
+            click.BadParameter: If the value is not a non-negative decimal or not
+            a valid decimal.
+        """
+        try:
+            dec_value = Decimal(value)
+            if dec_value < 0:
+                self.fail(f"{value} is not a non-negative decimal", param, ctx)
+            return dec_value
+        except InvalidOperation:
+            self.fail(f"{value} is not a valid decimal", param, ctx)
+
+
+DECIMAL = DecimalType()
@@ -0,0 +1,114 @@
+import os
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from config import database
+
+# asyncio drivers of the synchronous URLs; ASYNC_DATABASE_URL overrides the
+# URL derived from DATABASE_URL.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+# Built by get_async_engine() on first use, released by dispose_async().
+_async_engine = None
+
+
+def get_async_url(url=None):
+    """
+    Returns the URL of the asyncio engine: ASYNC_DATABASE_URL, else
+    DATABASE_URL with its driver replaced by asyncpg or aiosqlite.
+
+    Args:
+        url (str, optional): A synchronous URL, DATABASE_URL by default.
+
+    Returns:
+        str: The asyncio URL.
+
+    Raises:
+        ValueError: If no database URL is set.
+    """
+    if url is None:
+        url = os.getenv("ASYNC_DATABASE_URL") or database.DATABASE_URL
+    if url is None:
+        raise ValueError("DATABASE_URL environment variable not set")
+    scheme, separator, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + separator + rest
+
+
+def get_async_engine():
+    """
+    Returns the asyncio engine, creating it on first use. It serves a
+    long-lived process, so its pool follows the "server" profile unless
+    DB_POOL_PROFILE says otherwise or the database is in memory.
+
+    Returns:
+        AsyncEngine: The asyncio engine.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = get_async_url()
+        profile = database.get_pool_profile(url, process_profile="server")
+        options, capacity = database.get_pool_options(profile, asynchronous=True)
+        engine = create_async_engine(url, **options)
+        database.instrument_engine(engine.sync_engine)
+        if database._engine is None:
+            database.pool_metrics.reset(profile, capacity)
+        elif database.pool_metrics.capacity is not None and capacity is not None:
+            database.pool_metrics.capacity += capacity
+        _async_engine = engine
+    return _async_engine
+
+
+async def dispose_async():
+    """
+    Closes the pooled connections of the asyncio engine and drops it.
+    """
+    global _async_engine
+    engine, _async_engine = _async_engine, None
+    if engine is not None:
+        await engine.dispose()
+
+
+# Synchronous side of the AsyncSessions, bound to the asyncio engine on its
+# first query rather than on creation.
+class LazyAsyncBindSession(Session):
+    """
+    Session run by an AsyncSession, bound to the asyncio engine when it
+    first needs a connection, unless it was given a bind.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.bind is None:
+            return get_async_engine().sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+# Objects stay loaded after a commit: reloading an expired attribute would
+# be implicit IO, which an AsyncSession can't do.
+AsyncSessionLocal = async_sessionmaker(sync_session_class=LazyAsyncBindSession,
+                                       expire_on_commit=False, autoflush=False)
+
+
+@asynccontextmanager
+async def async_session_scope(factory=None):
+    """
+    Provides a new AsyncSession, closed when the block exits.
+
+    Args:
+        factory (callable, optional): Creates the session, AsyncSessionLocal
+        by default.
+
+    Yields:
+        AsyncSession: The session to use.
+    """
+    session = (factory or AsyncSessionLocal)()
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -1,14 +1,34 @@
 import os
+import uuid
+import click
 from dotenv import load_dotenv
 import jwt
 from datetime import datetime, timedelta, timezone
 
-from models.collaborator import Collaborator
+from config.permissions import (
+    PERMISSIONS_VERSION,
+    ROLE_PERMISSION_MASKS,
+    decode_permissions,
+    encode_permissions,
+    role_permissions,
+)
+from config.database import SessionLocal, session_scope
+from config.revocation import is_revoked, revoke_tokens
+from models.collaborator import Collaborator, Role
 load_dotenv()
 # Load environment variables
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+# Days a refresh token stays valid without being used.
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+# Days after the password login past which no token is renewed.
+REFRESH_TOKEN_MAX_DAYS = int(os.getenv("REFRESH_TOKEN_MAX_DAYS", "30"))
+# Minutes before its expiration an access token is renewed.
+TOKEN_RENEWAL_MINUTES = int(os.getenv("TOKEN_RENEWAL_MINUTES", "5"))
+# "matrix": permissions from the token claims and the compiled matrix.
+# "database": every check is one query on the roles and permissions tables.
+AUTHORIZATION_BACKEND = os.getenv("AUTHORIZATION_BACKEND", "matrix")
 
 
 # Create token and save it in ~/.config/epic_events/access_token.txt
@@ -17,7 +37,7 @@ def create_access_token(data: dict):
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     home_directory = os.path.expanduser("~")
@@ -27,21 +47,255 @@ def create_access_token(data: dict):
     token_path = os.path.join(token_dir_path, os.getenv("TOKEN_FILENAME"))
     with open(token_path, "w") as file:
         file.write(encoded_jwt)
+    token_store.clear()
     return encoded_jwt
 
 
+# Path of the refresh token, next to the access token.
+def get_refresh_token_path():
+    home_directory = os.path.expanduser("~")
+    return os.path.join(home_directory, os.getenv("TOKEN_DIR_PATH"),
+                        f"{os.getenv('TOKEN_FILENAME')}.refresh")
+
+
+# Create a refresh token and save it next to the access token
+def create_refresh_token(data: dict):
+    """
+    Creates the long-lived token that renews the access token without a
+    password check, and saves it next to the access token, readable by its
+    owner only. It expires REFRESH_TOKEN_EXPIRE_DAYS from now, and at most
+    REFRESH_TOKEN_MAX_DAYS after the "auth_time" claim of the password login.
+
+    Args:
+        data (dict): The claims of the access tokens it renews.
+
+    Returns:
+        str: The refresh token.
+    """
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    if "auth_time" in data:
+        expire = min(expire, datetime.fromtimestamp(data["auth_time"], timezone.utc)
+                     + timedelta(days=REFRESH_TOKEN_MAX_DAYS))
+    to_encode.update({"exp": expire, "typ": "refresh", "jti": uuid.uuid4().hex})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+    refresh_token_path = get_refresh_token_path()
+    os.makedirs(os.path.dirname(refresh_token_path), exist_ok=True)
+    fd = os.open(refresh_token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as file:
+        file.write(encoded_jwt)
+    return encoded_jwt
+
+
+def get_login_claims(collaborator, auth_time=None):
+    """
+    Returns the claims of the tokens of a collaborator, built from the
+    database.
+
+    Args:
+        collaborator (Collaborator): The collaborator, with its role loaded.
+        auth_time (int, optional): The timestamp of the password login, now
+        by default.
+
+    Returns:
+        dict: The claims.
+    """
+    if auth_time is None:
+        auth_time = int(datetime.now(timezone.utc).timestamp())
+    return {
+        "sub": collaborator.email,
+        "role_id": collaborator.role_id,
+        "auth_time": auth_time,
+        **get_permission_claims(collaborator),
+    }
+
+
+def renew_access_token():
+    """
+    Replaces an access token that expires within TOKEN_RENEWAL_MINUTES, or
+    has expired, without a password check. The refresh token must be valid
+    and not revoked, and its collaborator must still exist: the new tokens
+    carry the role and permissions read from the database. The refresh
+    token is rotated, the old one revoked, and renewals stop
+    REFRESH_TOKEN_MAX_DAYS after the password login. In the shell, the
+    login session is renewed with the token.
+
+    Returns:
+        bool: True if the access token was renewed.
+    """
+    login_session = get_login_session()
+    now = datetime.now(timezone.utc).timestamp()
+    if login_session is not None:
+        expires_at = login_session.expires_at
+    else:
+        try:
+            claims = token_store.decode(get_token_from_file(), SECRET_KEY,
+                                        ALGORITHM)
+            expires_at = claims.get("exp", 0)
+        except (FileNotFoundError, jwt.InvalidTokenError):
+            expires_at = 0
+    if expires_at - now > TOKEN_RENEWAL_MINUTES * 60:
+        return False
+    try:
+        with open(get_refresh_token_path(), "r") as file:
+            refresh_claims = jwt.decode(
+                file.read().strip(), SECRET_KEY, algorithms=[ALGORITHM]
+            )
+    except (FileNotFoundError, jwt.InvalidTokenError):
+        return False
+    if refresh_claims.get("typ") != "refresh" or not refresh_claims.get("sub"):
+        return False
+    if not refresh_claims.get("jti") or is_revoked(refresh_claims["jti"]):
+        return False
+    # Refresh tokens made before "auth_time" existed are not extended.
+    auth_time = refresh_claims.get("auth_time", refresh_claims["exp"]
+                                   - REFRESH_TOKEN_MAX_DAYS * 86400)
+    with session_scope(SessionLocal) as session:
+        collaborator = Collaborator.get_with_role_by_email(
+            refresh_claims["sub"], session
+        )
+        if collaborator is None:
+            return False
+        data = get_login_claims(collaborator, auth_time)
+        revoke_tokens([refresh_claims])
+        create_access_token(data)
+        create_refresh_token(data)
+        if login_session is not None:
+            login_session.reload(session)
+    return True
+
+
+# Authorization claims embedded in the access token
+def get_permission_claims(collaborator):
+    """
+    Returns the claims that let has_permission decide without the database:
+    the role name, the permission bitmask and the version of the matrix the
+    bitmask was built from.
+
+    Args:
+        collaborator (Collaborator): The collaborator, with its role loaded.
+
+    Returns:
+        dict: The claims, empty if the collaborator has no role.
+    """
+    if collaborator.role is None:
+        return {}
+    role = str(collaborator.role)
+    mask = ROLE_PERMISSION_MASKS.get(role)
+    if mask is None:
+        mask = encode_permissions(Role.get_permission_names(collaborator.role))
+    return {"role": role, "perms": mask, "pv": PERMISSIONS_VERSION}
+
+
+# Token file read and decoded once per version of the file.
+class TokenStore:
+    """
+    Caches the access token of the token file and its decoded claims. The
+    file is read again only when its mtime or size changes, so the checks of
+    a long-lived process (the shell, a batch, the daemon) cost one stat.
+
+    The claims are cached without their expiration checked: the callers
+    compare "exp" with the current time on every use.
+    """
+
+    def __init__(self):
+        # (path, mtime_ns, size) of the file the token was read from
+        self._file = None
+        self._token = None
+        # (token, secret_key, algorithm) -> claims, for the current token
+        self._claims = {}
+
+    def clear(self):
+        self._file = None
+        self._token = None
+        self._claims = {}
+
+    def read(self, token_path):
+        """
+        Returns the token of ``token_path``, reading the file only if it
+        changed since the last call.
+
+        Args:
+            token_path (str): The path of the token file.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            FileNotFoundError: If there is no token file.
+        """
+        try:
+            stat = os.stat(token_path)
+        except FileNotFoundError:
+            self.clear()
+            raise FileNotFoundError("Token file not found")
+        key = (token_path, stat.st_mtime_ns, stat.st_size)
+        if key != self._file:
+            with open(token_path, "r") as file:
+                token = file.read().strip()
+            self._claims = {}
+            self._token = token
+            self._file = key
+        return self._token
+
+    def decode(self, token, secret_key, algorithm, verify_signature=True):
+        """
+        Decodes the token, without checking its expiration. The claims of
+        the token read from the file are decoded once.
+
+        Args:
+            token (str): The access token.
+            secret_key (str): The key the signature is verified with.
+            algorithm (str): The signing algorithm.
+            verify_signature (bool): Whether to verify the signature.
+
+        Returns:
+            dict: The claims.
+
+        Raises:
+            jwt.InvalidTokenError: If the token can't be decoded or verified.
+        """
+        key = (secret_key, algorithm)
+        claims = self._claims.get(key) if token == self._token else None
+        if claims is not None:
+            return claims
+        if not verify_signature and token == self._token and self._claims:
+            # Claims verified with any key hold the same payload.
+            return next(iter(self._claims.values()))
+        claims = jwt.decode(
+            token,
+            secret_key,
+            algorithms=[algorithm],
+            options={"verify_signature": verify_signature, "verify_exp": False},
+        )
+        if verify_signature and token == self._token:
+            self._claims[key] = claims
+        return claims
+
+
+token_store = TokenStore()
+
+
+def is_expired_claims(claims):
+    exp = claims.get("exp")
+    return exp is not None and datetime.now(timezone.utc).timestamp() > exp
+
+
 # Return email from token
 def get_email_from_access_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        if email is None:
-            raise ValueError("Email not found in token")
-        return email
-    except jwt.ExpiredSignatureError:
-        raise ValueError("Token has expired")
+        payload = token_store.decode(token, SECRET_KEY, ALGORITHM)
     except jwt.InvalidTokenError:
         raise ValueError("Invalid token")
+    if is_expired_claims(payload):
+        raise ValueError("Token has expired")
+    if payload.get("typ") == "refresh":
+        raise ValueError("Invalid token")
+    email = payload.get("sub")
+    if email is None:
+        raise ValueError("Email not found in token")
+    return email
 
 
 # Get token from folder
@@ -49,25 +303,20 @@ def get_token_from_file():
     home_directory = os.path.expanduser("~")
     token_path = os.path.join(home_directory, os.getenv("TOKEN_DIR_PATH"),
                               os.getenv("TOKEN_FILENAME"))
-    if os.path.exists(token_path):
-        with open(token_path, "r") as file:
-            token = file.read().strip()
-        return token
-    else:
-        raise FileNotFoundError("Token file not found")
+    return token_store.read(token_path)
 
 
 # Check if token expired
 def is_token_expired(token, secret_key):
     try:
-        # Decode the token without verifying the signature
-        # to access the payload
-        payload = jwt.decode(
-            token,
-            secret_key,
-            algorithms=["HS256"],
-            options={"verify_signature": False},
-        )
+        # Verify the signature when it can be, so that the claims are cached
+        # for the other checks; else read the payload without verifying it.
+        try:
+            payload = token_store.decode(token, secret_key, ALGORITHM)
+        except (jwt.InvalidSignatureError, jwt.InvalidAlgorithmError):
+            payload = token_store.decode(
+                token, secret_key, ALGORITHM, verify_signature=False
+            )
 
         # Get the expiration time from the payload
         exp = payload.get("exp")
@@ -92,9 +341,162 @@ def is_token_expired(token, secret_key):
         raise ValueError(f"Invalid token: {e}")
 
 
+# Login identity resolved once and shared through the click context: for the
+# whole life of a long-lived process such as the interactive shell (ctx.obj),
+# or for a single command (ctx.meta).
+class LoginSession:
+    """
+    Holds the login collaborator, resolved from the token file once.
+
+    Attributes:
+        token (str): The access token read from the token file.
+        expires_at (float): The expiration timestamp of the token.
+        collaborator (Collaborator): The login collaborator, with its role and
+        the role permissions loaded.
+        permissions (frozenset): The names of the permissions of the role.
+    """
+
+    def __init__(self, token, expires_at, collaborator, permissions):
+        self.token = token
+        self.expires_at = expires_at
+        self.collaborator = collaborator
+        self.permissions = permissions
+
+    @property
+    def collaborator_id(self):
+        return self.collaborator.id
+
+    @property
+    def role(self):
+        return str(self.collaborator.role)
+
+    @classmethod
+    def open(cls, session):
+        """
+        Reads and verifies the token, then loads the collaborator and its role
+        in one query so that they stay usable once the session is closed. The
+        permissions come from the compiled permission matrix.
+
+        Args:
+            session (Session): The database session.
+
+        Returns:
+            LoginSession: The login state of the current token.
+
+        Raises:
+            FileNotFoundError: If there is no token file.
+            ValueError: If the token is invalid or expired, or its collaborator
+            no longer exists.
+        """
+        token = get_token_from_file()
+        email = get_email_from_access_token(token)
+        payload = token_store.decode(token, SECRET_KEY, ALGORITHM)
+        collaborator = Collaborator.get_with_role_by_email(
+            email=email, session=session
+        )
+        if collaborator is None:
+            raise ValueError("Collaborator not found")
+        permissions = role_permissions(collaborator.role)
+        if permissions is None:
+            permissions = frozenset(Role.get_permission_names(collaborator.role))
+        return cls(token, payload["exp"], collaborator, permissions)
+
+    def reload(self, session):
+        # Takes the token, collaborator and permissions of a renewed token.
+        renewed = LoginSession.open(session)
+        self.token = renewed.token
+        self.expires_at = renewed.expires_at
+        self.collaborator = renewed.collaborator
+        self.permissions = renewed.permissions
+
+    def is_expired(self):
+        return datetime.now(timezone.utc).timestamp() > self.expires_at
+
+
+# Key of the identity of the running command in the click context meta.
+IDENTITY_KEY = "epic_events.identity"
+
+
+# Returns the login session shared through the current click context, if any.
+def get_login_session():
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+    login_session = ctx.find_object(LoginSession)
+    if login_session is None:
+        login_session = ctx.meta.get(IDENTITY_KEY)
+    return login_session
+
+
+def get_identity(session):
+    """
+    Returns the identity of the running command, resolving it on first use
+    and keeping it on the click context for the rest of the command.
+
+    Args:
+        session (Session): The database session used to resolve it.
+
+    Returns:
+        LoginSession: The login identity.
+    """
+    login_session = get_login_session()
+    if login_session is None:
+        login_session = LoginSession.open(session)
+        ctx = click.get_current_context(silent=True)
+        if ctx is not None:
+            ctx.meta[IDENTITY_KEY] = login_session
+    return login_session
+
+
+# Key of the verified token claims of the running command in ctx.meta.
+CLAIMS_KEY = "epic_events.claims"
+
+
+def get_token_claims():
+    """
+    Returns the verified claims of the access token, decoded once per
+    command.
+
+    Returns:
+        dict: The claims, or None if the token is missing or invalid.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and CLAIMS_KEY in ctx.meta:
+        return ctx.meta[CLAIMS_KEY]
+    try:
+        claims = token_store.decode(get_token_from_file(), SECRET_KEY, ALGORITHM)
+    except (FileNotFoundError, jwt.InvalidTokenError):
+        claims = None
+    if claims is not None and is_expired_claims(claims):
+        claims = None
+    if ctx is not None:
+        ctx.meta[CLAIMS_KEY] = claims
+    return claims
+
+
+def get_token_permissions():
+    """
+    Returns the permissions carried by the access token, when they were
+    built from the current permission matrix.
+
+    Returns:
+        frozenset: The permission names, or None if the token has no usable
+        permission claims.
+    """
+    claims = get_token_claims()
+    if not claims or claims.get("pv") != PERMISSIONS_VERSION:
+        return None
+    if not isinstance(claims.get("perms"), int):
+        return None
+    return decode_permissions(claims["perms"])
+
+
 # Retrieves the currently logged-in collaborator from the database using the email
 # extracted from the JWT token.
 def get_login_collaborator(session):
+    if click.get_current_context(silent=True) is not None:
+        # Attach the collaborator of the identity without a query.
+        return session.merge(get_identity(session).collaborator, load=False)
     token = get_token_from_file()
     email = get_email_from_access_token(token)
     collaborator = Collaborator.get_by_email(email=email, session=session)
@@ -103,25 +505,97 @@ def get_login_collaborator(session):
 
 # Checks if the current JWT token is present and valid
 def is_authenticated():
-    try:
-        token = get_token_from_file()
-    except FileNotFoundError:
-        print("Token file not found.")
-        return False
+    login_session = get_login_session()
+    if login_session is not None:
+        # The shell's token can be revoked by a logout elsewhere.
+        if login_session.is_expired():
+            print("Token has expired.")
+            return False
+        token = login_session.token
+    else:
+        try:
+            token = get_token_from_file()
+        except FileNotFoundError:
+            print("Token file not found.")
+            return False
 
-    if is_token_expired(token, SECRET_KEY):
-        print("Token has expired.")
+        if is_token_expired(token, SECRET_KEY):
+            print("Token has expired.")
+            return False
+    if is_token_revoked(token):
+        print("Token has been revoked.")
         return False
     return True
 
 
+def is_token_revoked(token):
+    """
+    Checks the jti of the token against the revocation filter. Tokens that
+    can't be verified or have no jti are left to the other checks.
+
+    Args:
+        token (str): The access token.
+
+    Returns:
+        bool: True if the token was revoked.
+    """
+    try:
+        claims = token_store.decode(token, SECRET_KEY, ALGORITHM)
+    except jwt.InvalidTokenError:
+        return False
+    return bool(claims.get("jti")) and is_revoked(claims["jti"])
+
+
+def revoke_login_tokens():
+    """
+    Revokes the access and refresh tokens of the token files, so that copies
+    of them are rejected until they expire.
+    """
+    claims_list = []
+    try:
+        claims_list.append(
+            token_store.decode(get_token_from_file(), SECRET_KEY, ALGORITHM)
+        )
+    except (FileNotFoundError, jwt.InvalidTokenError):
+        pass
+    try:
+        with open(get_refresh_token_path(), "r") as file:
+            claims_list.append(jwt.decode(
+                file.read().strip(), SECRET_KEY, algorithms=[ALGORITHM],
+                options={"verify_exp": False},
+            ))
+    except (FileNotFoundError, jwt.InvalidTokenError):
+        pass
+    revoke_tokens(claims_list)
+
+
+# Returns the email of the logged-in collaborator.
+def get_login_email():
+    login_session = get_login_session()
+    if login_session is not None:
+        return login_session.collaborator.email
+    claims = get_token_claims()
+    if claims and claims.get("sub"):
+        return claims["sub"]
+    return get_email_from_access_token(get_token_from_file())
+
+
 # Verifies if the currently logged-in collaborator has permission to execute the
 # specified command based on their assigned role and permissions in the system.
 def has_permission(command, session):
+    if AUTHORIZATION_BACKEND == "database":
+        return Collaborator.has_permission(get_login_email(), command, session)
+    if click.get_current_context(silent=True) is not None:
+        login_session = get_login_session()
+        if login_session is None:
+            # Decided offline from the token, unless its claims are stale.
+            permissions = get_token_permissions()
+            if permissions is not None:
+                return command in permissions
+        return command in get_identity(session).permissions
     collaborator = get_login_collaborator(session=session)
-    role = collaborator.role
-    permissions = role.permissions
-    permissions_names = [str(permission) for permission in permissions]
-    if command in permissions_names:
-        return True
-    return False
+    permissions = role_permissions(collaborator.role)
+    if permissions is None:
+        # A role missing from the compiled matrix is read from the database.
+        permissions = Role.get_permission_names(collaborator.role)
+    return command in permissions
@@ -0,0 +1,255 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config.logger import get_logger
+
+# Seconds a value is served before it is read again from the database, and
+# the number of values a process keeps.
+REFERENCE_CACHE_TTL_SECONDS = int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "60"))
+REFERENCE_CACHE_SIZE = int(os.getenv("REFERENCE_CACHE_SIZE", "1024"))
+
+# Namespaces of the reference data, invalidated as a whole when it changes.
+ROLES = "roles"
+PERMISSIONS = "permissions"
+COLLABORATORS = "collaborators"
+
+COUNTERS = ("hits", "shared_hits", "misses", "evictions", "invalidations")
+
+_cache = None
+
+
+def get_reference_cache_path():
+    """
+    Returns the path of the store shared by the processes of the host:
+    REFERENCE_CACHE_PATH, or None to keep the cache in process. With a
+    store, a short-lived command reuses the values loaded by the previous
+    ones.
+    """
+    return os.getenv("REFERENCE_CACHE_PATH") or None
+
+
+# Second-level cache of the reference data: roles, permissions and the role
+# of each collaborator.
+class ReferenceCache:
+    """
+    TTL and LRU cache of small JSON values (names, lists of names) by
+    namespace and key. Values are kept in process and, when ``path`` is set,
+    in a SQLite database in WAL mode shared by the processes of the host.
+    Writes go through invalidate(), which drops a whole namespace from both;
+    the in-process copies of other long-lived processes expire after ``ttl``.
+
+    Args:
+        path (str, optional): The path of the shared store, None for none.
+        maxsize (int): The number of values kept in process.
+        ttl (int): The seconds a value is served.
+    """
+
+    def __init__(self, path=None, maxsize=REFERENCE_CACHE_SIZE,
+                 ttl=REFERENCE_CACHE_TTL_SECONDS):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        # Counted since the last flush to the shared store.
+        self._pending = dict.fromkeys(COUNTERS, 0)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def connect(self):
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reference_cache "
+                "(namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reference_counters "
+                "(name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._connection = connection
+            atexit.register(self.flush)
+        return self._connection
+
+    def count(self, name):
+        self.counters[name] += 1
+        self._pending[name] += 1
+
+    def read_shared(self, namespace, key):
+        """
+        Reads a value from the shared store.
+
+        Returns:
+            tuple: The value and the seconds it is still valid, or None.
+        """
+        if self.path is None:
+            return None
+        try:
+            row = self.connect().execute(
+                "SELECT value, expires_at FROM reference_cache "
+                "WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time()),
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            get_logger().error(f"Reference cache store unavailable: {e}")
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1] - time.time()
+
+    def write_shared(self, namespace, key, value):
+        if self.path is None:
+            return
+        try:
+            self.connect().execute(
+                "INSERT OR REPLACE INTO reference_cache "
+                "(namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), time.time() + self.ttl),
+            )
+        except (OSError, sqlite3.Error) as e:
+            get_logger().error(f"Reference cache store unavailable: {e}")
+
+    def put(self, namespace, key, value, ttl):
+        with self._lock:
+            self._entries[namespace, key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.count("evictions")
+
+    def get(self, namespace, key, loader):
+        """
+        Returns a value, loading it on a miss. None is never cached, so that
+        a row created later is found at once.
+
+        Args:
+            namespace (str): The namespace of the value.
+            key: The key of the value in the namespace.
+            loader (callable): Loads the value from the database.
+
+        Returns:
+            The value, or None if the loader found nothing.
+        """
+        key = str(key)
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end((namespace, key))
+                self.count("hits")
+                return entry[1]
+        shared = self.read_shared(namespace, key)
+        if shared is not None:
+            value, ttl = shared
+            self.count("shared_hits")
+        else:
+            self.count("misses")
+            value = loader()
+            if value is None:
+                return None
+            ttl = self.ttl
+            self.write_shared(namespace, key, value)
+        self.put(namespace, key, value, ttl)
+        return value
+
+    def invalidate(self, *namespaces):
+        """
+        Drops the values of the namespaces, all of them if none is given.
+
+        Args:
+            namespaces (str): The namespaces to drop.
+        """
+        with self._lock:
+            for namespace, key in list(self._entries):
+                if not namespaces or namespace in namespaces:
+                    del self._entries[namespace, key]
+            self.count("invalidations")
+        if self.path is None:
+            return
+        try:
+            if namespaces:
+                self.connect().execute(
+                    "DELETE FROM reference_cache WHERE namespace IN "
+                    f"({', '.join('?' * len(namespaces))})",
+                    namespaces,
+                )
+            else:
+                self.connect().execute("DELETE FROM reference_cache")
+        except (OSError, sqlite3.Error) as e:
+            get_logger().error(f"Reference cache store unavailable: {e}")
+
+    def flush(self):
+        """
+        Adds the counters of the process to the ones of the shared store.
+        """
+        if self._connection is None or not any(self._pending.values()):
+            return
+        try:
+            self._connection.executemany(
+                "INSERT INTO reference_counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                list(self._pending.items()),
+            )
+        except sqlite3.Error as e:
+            get_logger().error(f"Reference cache store unavailable: {e}")
+            return
+        self._pending = dict.fromkeys(COUNTERS, 0)
+
+    def stats(self):
+        """
+        Returns the counters of the cache, for monitoring.
+
+        Returns:
+            dict: The counters, size and settings of the process, and under
+            "shared" the counters of all the processes of the store.
+        """
+        lookups = sum(self.counters[name] for name in ("hits", "shared_hits",
+                                                       "misses"))
+        stats = dict(self.counters)
+        stats.update(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            ttl_seconds=self.ttl,
+            hit_ratio=round((lookups - self.counters["misses"]) / lookups, 3)
+            if lookups else 0.0,
+        )
+        if self.path is not None:
+            self.flush()
+            try:
+                shared = dict.fromkeys(COUNTERS, 0)
+                shared.update(self.connect().execute(
+                    "SELECT name, value FROM reference_counters"
+                ))
+                shared["entries"] = self.connect().execute(
+                    "SELECT COUNT(*) FROM reference_cache WHERE expires_at > ?",
+                    (time.time(),),
+                ).fetchone()[0]
+                stats["shared"] = shared
+            except (OSError, sqlite3.Error) as e:
+                get_logger().error(f"Reference cache store unavailable: {e}")
+        return stats
+
+
+# Reference cache of the process, created on first use.
+def get_reference_cache():
+    global _cache
+    if _cache is None:
+        _cache = ReferenceCache(get_reference_cache_path())
+    return _cache
+
+
+def cached(namespace, key, loader):
+    return get_reference_cache().get(namespace, key, loader)
+
+
+def invalidate(*namespaces):
+    get_reference_cache().invalidate(*namespaces)
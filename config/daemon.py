@@ -0,0 +1,405 @@
+import contextlib
+import getpass
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+
+# Kept free of database and click imports: the thin client runs this module on
+# every call before deciding whether to fall back to an in-process run.
+
+BUFFER_SIZE = 65536
+
+# Settings read once when the modules are imported: a client configured
+# otherwise runs its command in-process instead of in the daemon.
+DAEMON_SETTINGS = ("SECRET_KEY", "ALGORITHM", "AUTHORIZATION_BACKEND",
+                   "BCRYPT_ROUNDS")
+DAEMON_SETTING_PREFIXES = ("DATABASE_", "DB_", "ACCESS_TOKEN_", "REFRESH_TOKEN_",
+                           "TOKEN_", "LOGIN_", "REVOCATION_", "REFERENCE_CACHE_",
+                           "LOG_", "SENTRY_")
+
+
+def get_socket_path():
+    """
+    Returns the path of the Unix socket the daemon listens on.
+
+    Returns:
+        str: The value of EPIC_EVENTS_SOCKET, or ~/.epic_events.sock.
+    """
+    default_path = os.path.join(os.path.expanduser("~"), ".epic_events.sock")
+    return os.getenv("EPIC_EVENTS_SOCKET", default_path)
+
+
+# Writes the output of a command back to the client as it is produced.
+class SocketWriter(io.TextIOBase):
+    """
+    File-like object that forwards every write to the client as a JSON line
+    tagged with the name of the stream.
+    """
+
+    def __init__(self, connection, stream):
+        super().__init__()
+        self.connection = connection
+        self.stream = stream
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    def write(self, data):
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        if data:
+            message = json.dumps({self.stream: data}) + "\n"
+            self.connection.sendall(message.encode("utf-8"))
+        return len(data)
+
+
+def invoke_cli(cli, argv, stderr=None, obj=None):
+    """
+    Runs the click group in-process the same way the standalone CLI does,
+    without letting SystemExit or click exceptions escape.
+
+    Args:
+        cli (click.Group): The root command group.
+        argv (list): The arguments, without the program name.
+        stderr (file, optional): Where the errors go.
+        obj (object, optional): The ``ctx.obj`` shared by the commands.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    import click
+
+    stderr = stderr or sys.stderr
+    try:
+        rv = cli.main(args=argv, prog_name="epic_events.py",
+                      standalone_mode=False, obj=obj)
+        # Without standalone mode, click returns the code of ctx.exit().
+        return rv if isinstance(rv, int) else 0
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show(file=stderr)
+        return e.exit_code
+    except click.Abort:
+        stderr.write("Aborted!\n")
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except Exception:
+        traceback.print_exc(file=stderr)
+        return 1
+
+
+def run_command(cli, argv, stdin="", stdout=None, stderr=None, obj=None,
+                prompt=None):
+    """
+    Runs the click group in-process with its input and output redirected.
+
+    Args:
+        cli (click.Group): The root command group.
+        argv (list): The arguments, without the program name.
+        stdin (str): The data prompts read from.
+        stdout (file): Where the command output goes.
+        stderr (file): Where the errors go.
+        obj (object, optional): The ``ctx.obj`` shared by the commands.
+        prompt (callable, optional): Answers the prompts instead of stdin,
+        called with the prompt text and whether the input is hidden.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    import click.termui
+
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    stdin_stream = io.StringIO(stdin)
+
+    def prompt_func(text, hidden=False):
+        if prompt is not None:
+            return prompt(text, hidden)
+        stdout.write(text)
+        line = stdin_stream.readline()
+        if not line:
+            raise EOFError()
+        return line.rstrip("\r\n")
+
+    saved_prompts = (click.termui.visible_prompt_func, click.termui.hidden_prompt_func)
+    click.termui.visible_prompt_func = prompt_func
+    click.termui.hidden_prompt_func = lambda text: prompt_func(text, hidden=True)
+    saved_stdin, sys.stdin = sys.stdin, stdin_stream
+    try:
+        with contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(stderr):
+            return invoke_cli(cli, argv, stderr=stderr, obj=obj)
+    finally:
+        sys.stdin = saved_stdin
+        click.termui.visible_prompt_func, click.termui.hidden_prompt_func = \
+            saved_prompts
+
+
+def read_message(connection):
+    """
+    Reads one JSON line from the connection.
+
+    Args:
+        connection (socket.socket): The connected socket.
+
+    Returns:
+        dict: The decoded message, or None if the peer closed the connection.
+    """
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = connection.recv(BUFFER_SIZE)
+        if not chunk:
+            return None
+        data += chunk
+    return json.loads(data)
+
+
+def send_message(connection, message):
+    connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def is_daemon_setting(name):
+    return name in DAEMON_SETTINGS or name.startswith(DAEMON_SETTING_PREFIXES)
+
+
+def same_settings(env):
+    """
+    Checks whether a client environment has the settings of the daemon.
+
+    Args:
+        env (dict): The environment of the client.
+
+    Returns:
+        bool: True if every setting read at import has the same value.
+    """
+    names = {name for name in (*env, *os.environ) if is_daemon_setting(name)}
+    return all(env.get(name) == os.environ.get(name) for name in names)
+
+
+@contextlib.contextmanager
+def client_context(cwd, env):
+    """
+    Runs the block in the working directory and environment of the client,
+    so that relative paths, the home directory and the other variables read
+    at run time are the client's.
+
+    Args:
+        cwd (str): The working directory of the client.
+        env (dict): The environment of the client.
+    """
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+
+# Handles a single client: runs its argv and streams the output back.
+def handle_connection(cli, connection):
+    """
+    Runs the command requested by the client, in its working directory and
+    environment, and streams its output and log records. When the client
+    reads from a terminal, prompts are sent to it and answered one by one.
+
+    Args:
+        cli (click.Group): The root command group.
+        connection (socket.socket): The connected client socket.
+    """
+    from config.logger import log_to
+
+    request = read_message(connection)
+    if request is None:
+        return
+    argv = request.get("argv", [])
+    if argv[:1] in (["serve"], ["shell"]):
+        SocketWriter(connection, "stderr").write(
+            f"Error: '{argv[0]}' can't run inside the daemon.\n"
+        )
+        send_message(connection, {"exit": 1})
+        return
+    env = request.get("env", dict(os.environ))
+    if not same_settings(env):
+        send_message(connection, {"fallback": True})
+        return
+
+    def prompt(text, hidden):
+        send_message(connection, {"prompt": text, "hidden": hidden})
+        reply = read_message(connection)
+        if reply is None or "input" not in reply:
+            raise EOFError()
+        return reply["input"]
+
+    stderr = SocketWriter(connection, "stderr")
+    with client_context(request.get("cwd", os.getcwd()), env), log_to(stderr):
+        exit_code = run_command(
+            cli,
+            argv,
+            stdin=request.get("stdin", ""),
+            stdout=SocketWriter(connection, "stdout"),
+            stderr=stderr,
+            prompt=prompt if request.get("tty") else None,
+        )
+    send_message(connection, {"exit": exit_code})
+
+
+def bind_socket(socket_path):
+    """
+    Binds the listening socket, replacing a stale socket file left behind by
+    a daemon that did not shut down cleanly.
+
+    Args:
+        socket_path (str): The path of the Unix socket.
+
+    Returns:
+        socket.socket: The listening socket, readable by the owner only.
+
+    Raises:
+        RuntimeError: If another daemon is already listening on the path.
+    """
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+        else:
+            raise RuntimeError(f"A daemon is already listening on {socket_path}")
+        finally:
+            probe.close()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous_umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(previous_umask)
+    server.listen()
+    return server
+
+
+def serve(cli, server, socket_path):
+    """
+    Serves commands over a Unix socket until interrupted.
+
+    Requests are handled one at a time: the commands print to the process-wide
+    stdout, which is redirected to the client for the duration of each call.
+
+    Args:
+        cli (click.Group): The root command group.
+        server (socket.socket): The listening socket from bind_socket.
+        socket_path (str): The path of the Unix socket, removed on exit.
+    """
+    try:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                try:
+                    handle_connection(cli, connection)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def read_piped_stdin():
+    """
+    Reads the answers to prompts piped into the client. The pipe is read to
+    its end, as the writer may not have written yet; a terminal is left to
+    the prompts relayed by the daemon.
+
+    Returns:
+        str: The piped data, or an empty string.
+    """
+    if sys.stdin is None or sys.stdin.isatty():
+        return ""
+    try:
+        return sys.stdin.read()
+    except (OSError, ValueError):
+        return ""
+
+
+def answer_prompt(message):
+    """
+    Asks the user the prompt of a command running in the daemon.
+
+    Args:
+        message (dict): The prompt message of the daemon.
+
+    Returns:
+        dict: The answer, or an end of input.
+    """
+    try:
+        if message.get("hidden"):
+            return {"input": getpass.getpass(message["prompt"])}
+        return {"input": input(message["prompt"])}
+    except (EOFError, KeyboardInterrupt):
+        print()
+        return {"eof": True}
+
+
+def forward_to_daemon(argv, socket_path=None):
+    """
+    Sends argv, with the working directory, the environment and the piped
+    stdin, to a running daemon and copies its output to this process.
+    Prompts are answered from the terminal.
+
+    Args:
+        argv (list): The arguments, without the program name.
+        socket_path (str, optional): The path of the Unix socket.
+
+    Returns:
+        int or None: The exit code of the command, or None if no daemon is
+        reachable or it runs with other settings, and the command must run
+        in-process.
+    """
+    if argv[:1] in (["serve"], ["shell"]) or os.getenv("EPIC_EVENTS_NO_DAEMON"):
+        return None
+    socket_path = socket_path or get_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+    tty = sys.stdin is not None and sys.stdin.isatty()
+    with connection:
+        send_message(connection, {
+            "argv": argv,
+            "stdin": "" if tty else read_piped_stdin(),
+            "tty": tty,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        })
+        with connection.makefile("r", encoding="utf-8") as responses:
+            for line in responses:
+                message = json.loads(line)
+                if "exit" in message:
+                    return message["exit"]
+                if "fallback" in message:
+                    return None
+                if "prompt" in message:
+                    send_message(connection, answer_prompt(message))
+                    continue
+                stream = sys.stdout if "stdout" in message else sys.stderr
+                stream.write(message.get("stdout", message.get("stderr")))
+                stream.flush()
+    return 1
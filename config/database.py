@@ -1,16 +1,681 @@
+import heapq
+import json
 import os
+import threading
+import time
+from contextlib import contextmanager
+
+import click
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool, StaticPool
 
 load_dotenv()
 
 # Get the database URL from the environment variable
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if DATABASE_URL is None:
-    raise ValueError("DATABASE_URL environment variable not set")
-engine = create_engine(DATABASE_URL)
+# Optional read replica, used by the read-only commands and their validators
+# while it lags less than DATABASE_REPLICA_MAX_LAG_SECONDS behind the primary.
+# The lag is checked at most every DATABASE_REPLICA_CHECK_SECONDS.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+DATABASE_REPLICA_MAX_LAG_SECONDS = float(
+    os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "5")
+)
+DATABASE_REPLICA_CHECK_SECONDS = float(
+    os.getenv("DATABASE_REPLICA_CHECK_SECONDS", "10")
+)
+
+# Pool profile of the engine: "cli", "server", "memory", or "auto" to pick
+# one from the URL and the kind of process.
+DB_POOL_PROFILE = os.getenv("DB_POOL_PROFILE", "auto")
+# Settings of the "server" profile.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Checkouts slower than this are logged as warnings.
+DB_POOL_SLOW_CHECKOUT_MS = float(os.getenv("DB_POOL_SLOW_CHECKOUT_MS", "100"))
+
+POOL_PROFILES = ("cli", "server", "memory")
+
 Base = declarative_base()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Built by get_engine() on first use, released by dispose().
+_engine = None
+_replica_engine = None
+# (checked_at, usable) of the last replica lag check.
+_replica_state = (None, False)
+# SQL profile of the running command, set by start_sql_profile().
+_sql_profile = None
+# Profile used by "auto" for a database on disk; serve and shell, which
+# outlive a single command, switch it to "server".
+_process_profile = "cli"
+
+
+# Counters of the connection checkouts of the engine's pool.
+class PoolMetrics:
+    """
+    Counts the checkouts of the pool, the time spent waiting for them and
+    how many connections are in use, so that an exhausted pool shows up as
+    slow checkouts and timeouts rather than as a hang.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, profile=None, capacity=None):
+        with self.lock:
+            self.profile = profile
+            self.capacity = capacity
+            self.checkouts = 0
+            self.timeouts = 0
+            self.slow_checkouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.checked_out = 0
+            self.peak_checked_out = 0
+
+    def record_checkout(self, seconds, timed_out=False):
+        with self.lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            if seconds * 1000 >= DB_POOL_SLOW_CHECKOUT_MS:
+                self.slow_checkouts += 1
+                return True
+        return False
+
+    def record_in_use(self, delta):
+        with self.lock:
+            self.checked_out += delta
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def snapshot(self):
+        """
+        Returns the metrics of the pool.
+
+        Returns:
+            dict: The profile, the checkouts and timeouts, the average and
+            maximum checkout wait in milliseconds, the connections in use and
+            their peak, and the saturation (peak over capacity) when the pool
+            is bounded.
+        """
+        with self.lock:
+            attempts = self.checkouts + self.timeouts
+            saturation = None
+            if self.capacity:
+                saturation = round(self.peak_checked_out / self.capacity, 3)
+            return {
+                "profile": self.profile,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "wait_avg_ms": round(self.wait_total / attempts * 1000, 3)
+                if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "capacity": self.capacity,
+                "saturation": saturation,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+# Pool that times its checkouts into pool_metrics.
+class MeteredPool:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_metrics.record_checkout(time.perf_counter() - start, True)
+            from config.logger import get_logger
+
+            get_logger().error(f"Connection pool exhausted: {pool_metrics.snapshot()}")
+            raise
+        elapsed = time.perf_counter() - start
+        if pool_metrics.record_checkout(elapsed):
+            from config.logger import get_logger
+
+            get_logger().warning(
+                f"Slow connection checkout ({elapsed * 1000:.0f} ms): "
+                f"{pool_metrics.snapshot()}"
+            )
+        return connection
+
+
+class MeteredNullPool(MeteredPool, NullPool):
+    pass
+
+
+class MeteredQueuePool(MeteredPool, QueuePool):
+    pass
+
+
+class MeteredStaticPool(MeteredPool, StaticPool):
+    pass
+
+
+class MeteredAsyncQueuePool(MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+
+# Statements, database time and rows returned of one command.
+class SqlProfile:
+    """
+    Records the statements executed while a command runs: how many, the time
+    spent in the database, the rows returned to the sessions and the ORM
+    objects loaded. The statements run most often point to N+1 lazy loads, and the
+    time outside the database to Python work and printing.
+
+    Args:
+        top (int): The number of slowest and most repeated statements kept.
+    """
+
+    def __init__(self, top=5):
+        self.top = top
+        self.started_at = time.perf_counter()
+        self.elapsed = None
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.objects_loaded = 0
+        self.slowest = []
+        # statement -> [count, seconds]
+        self.by_statement = {}
+
+    def record(self, statement, seconds):
+        statement = " ".join(statement.split())
+        self.statements += 1
+        self.db_time += seconds
+        totals = self.by_statement.setdefault(statement, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        entry = (seconds, self.statements, statement)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def to_dict(self):
+        """
+        Returns the profile as a JSON-serializable dict.
+
+        Returns:
+            dict: The statement count, the database, total and remaining
+            time in milliseconds, the rows returned and objects loaded, the
+            slowest statements and the statements run more than once.
+        """
+        elapsed = self.elapsed
+        if elapsed is None:
+            elapsed = time.perf_counter() - self.started_at
+        repeated = sorted(
+            ((count, seconds, statement)
+             for statement, (count, seconds) in self.by_statement.items()
+             if count > 1),
+            reverse=True,
+        )[:self.top]
+        return {
+            "statements": self.statements,
+            "db_ms": round(self.db_time * 1000, 3),
+            "total_ms": round(elapsed * 1000, 3),
+            "other_ms": round(max(elapsed - self.db_time, 0) * 1000, 3),
+            "rows": self.rows,
+            "objects_loaded": self.objects_loaded,
+            "slowest": [
+                {"ms": round(seconds * 1000, 3), "statement": statement}
+                for seconds, _, statement in sorted(self.slowest, reverse=True)
+            ],
+            "repeated": [
+                {"count": count, "ms": round(seconds * 1000, 3),
+                 "statement": statement}
+                for count, seconds, statement in repeated
+            ],
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def start_sql_profile(top=5):
+    """
+    Starts recording the statements of the engine, until stop_sql_profile().
+
+    Returns:
+        SqlProfile: The profile being recorded.
+    """
+    global _sql_profile
+    _sql_profile = SqlProfile(top)
+    return _sql_profile
+
+
+def stop_sql_profile():
+    """
+    Stops recording the statements.
+
+    Returns:
+        SqlProfile: The recorded profile, or None if none was started.
+    """
+    global _sql_profile
+    profile, _sql_profile = _sql_profile, None
+    if profile is not None:
+        profile.stop()
+    return profile
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    if _sql_profile is not None:
+        conn.info.setdefault("epic_events.query_start", []).append(
+            time.perf_counter()
+        )
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context,
+                         executemany):
+    starts = conn.info.get("epic_events.query_start")
+    if _sql_profile is not None and starts:
+        _sql_profile.record(statement, time.perf_counter() - starts.pop())
+
+
+@event.listens_for(Session, "do_orm_execute")
+def count_returned_rows(orm_execute_state):
+    # The driver's rowcount is -1 for a SELECT on SQLite: the rows are
+    # counted once fetched, which buffers them while a profile records.
+    if _sql_profile is None:
+        return None
+    result = orm_execute_state.invoke_statement()
+    # Only the results of DML statements can have no rows.
+    if not getattr(result, "returns_rows", True):
+        return result
+    frozen = result.freeze()
+    _sql_profile.rows += len(frozen.data)
+    return frozen()
+
+
+@event.listens_for(Base, "load", propagate=True)
+def count_loaded_object(target, context):
+    if _sql_profile is not None:
+        _sql_profile.objects_loaded += 1
+
+
+def is_memory_database(url):
+    scheme, _, path = url.partition("://")
+    return scheme.split("+")[0] == "sqlite" and (
+        not path.strip("/") or ":memory:" in path or "mode=memory" in path
+    )
+
+
+def set_process_pool_profile(profile):
+    """
+    Sets the profile "auto" uses for a database on disk in this process,
+    dropping an engine built with another one.
+
+    Args:
+        profile (str): "cli" or "server".
+    """
+    global _process_profile
+    if profile != _process_profile:
+        _process_profile = profile
+        dispose()
+
+
+def get_pool_profile(url=None, process_profile=None):
+    """
+    Returns the pool profile of the engine: DB_POOL_PROFILE when it is set,
+    else "memory" for an in-memory SQLite database, "server" for the
+    long-lived serve and shell processes and "cli" for a one-shot command.
+
+    Args:
+        url (str, optional): The database URL, DATABASE_URL by default.
+        process_profile (str, optional): The profile of a database on disk,
+        the one of set_process_pool_profile() by default.
+
+    Raises:
+        ValueError: If DB_POOL_PROFILE is not a known profile.
+    """
+    if DB_POOL_PROFILE != "auto":
+        if DB_POOL_PROFILE not in POOL_PROFILES:
+            raise ValueError(f"Unknown DB_POOL_PROFILE: {DB_POOL_PROFILE}")
+        return DB_POOL_PROFILE
+    if is_memory_database(url or DATABASE_URL or ""):
+        return "memory"
+    return process_profile or _process_profile
+
+
+def get_pool_options(profile, asynchronous=False):
+    """
+    Returns the create_engine arguments of a pool profile and the number of
+    connections the pool can hand out.
+
+    - cli: no pooling; a one-shot command closes its connection when done.
+    - server: a bounded QueuePool, with connections checked before use and
+      recycled before the server drops them.
+    - memory: a single connection shared by every session, the only way to
+      see the same in-memory SQLite database from all of them.
+
+    Args:
+        profile (str): The name of the profile.
+        asynchronous (bool, optional): For create_async_engine, which needs
+        the asyncio version of QueuePool.
+
+    Returns:
+        tuple: The keyword arguments and the capacity (None if unbounded).
+    """
+    if profile == "server":
+        return {
+            "poolclass": MeteredAsyncQueuePool if asynchronous
+            else MeteredQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }, DB_POOL_SIZE + max(DB_MAX_OVERFLOW, 0)
+    if profile == "memory":
+        return {
+            "poolclass": MeteredStaticPool,
+            "connect_args": {"check_same_thread": False},
+        }, 1
+    return {"poolclass": MeteredNullPool}, None
+
+
+def get_pool_stats():
+    """
+    Returns the metrics of the engine's connection pool.
+
+    Returns:
+        dict: See PoolMetrics.snapshot; all zero until the engine is built.
+    """
+    stats = pool_metrics.snapshot()
+    if stats["profile"] is None:
+        stats["profile"] = get_pool_profile()
+    return stats
+
+
+def build_engine(url):
+    """
+    Creates an engine with the pool of get_pool_profile(), its checkouts
+    counted in pool_metrics and its statements in the SQL profile.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        tuple: The engine, its pool profile and capacity.
+    """
+    from sqlalchemy import create_engine
+
+    profile = get_pool_profile(url)
+    options, capacity = get_pool_options(profile)
+    engine = create_engine(url, **options)
+    instrument_engine(engine)
+    return engine, profile, capacity
+
+
+def instrument_engine(engine):
+    """
+    Counts the connections in use of the engine in pool_metrics and records
+    its statements in the SQL profile.
+
+    Args:
+        engine (Engine): A synchronous engine, or the sync_engine of an
+        AsyncEngine.
+    """
+    event.listen(engine, "checkout", lambda *args: pool_metrics.record_in_use(1))
+    event.listen(engine, "checkin", lambda *args: pool_metrics.record_in_use(-1))
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def get_engine():
+    """
+    Returns the engine of DATABASE_URL, creating it on first use so that
+    commands which never query the database don't load the dialect. Its pool
+    follows the profile of get_pool_profile().
+
+    Returns:
+        Engine: The application engine.
+
+    Raises:
+        ValueError: If DATABASE_URL is not set, or DB_POOL_PROFILE unknown.
+    """
+    global _engine
+    if _engine is None:
+        if DATABASE_URL is None:
+            raise ValueError("DATABASE_URL environment variable not set")
+        engine, profile, capacity = build_engine(DATABASE_URL)
+        pool_metrics.reset(profile, capacity)
+        _engine = engine
+    return _engine
+
+
+def get_replication_lag(connection):
+    """
+    Returns how far the replica is behind its primary, for the dialects
+    that report it. Other databases are taken as up to date.
+
+    Args:
+        connection (Connection): A connection to the replica.
+
+    Returns:
+        float: The lag in seconds.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        lag = connection.execute(text(
+            "SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+        )).scalar()
+    elif dialect in ("mysql", "mariadb"):
+        row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        lag = row and (row.get("Seconds_Behind_Source")
+                       if "Seconds_Behind_Source" in row
+                       else row.get("Seconds_Behind_Master"))
+    else:
+        lag = 0
+    return float(lag or 0)
+
+
+def get_replica_engine():
+    """
+    Returns the engine of DATABASE_REPLICA_URL while the replica can serve
+    reads: it is reachable and lags less than DATABASE_REPLICA_MAX_LAG_SECONDS
+    behind the primary. Otherwise the reads fall back to the primary.
+
+    Returns:
+        Engine or None: The replica engine, or None to use the primary.
+    """
+    global _replica_engine, _replica_state
+    if not DATABASE_REPLICA_URL:
+        return None
+    checked_at, usable = _replica_state
+    now = time.monotonic()
+    if checked_at is not None and now - checked_at < DATABASE_REPLICA_CHECK_SECONDS:
+        return _replica_engine if usable else None
+    if _replica_engine is None:
+        _replica_engine, _, capacity = build_engine(DATABASE_REPLICA_URL)
+        if pool_metrics.capacity is not None and capacity is not None:
+            pool_metrics.capacity += capacity
+    try:
+        with _replica_engine.connect() as connection:
+            lag = get_replication_lag(connection)
+        usable = lag <= DATABASE_REPLICA_MAX_LAG_SECONDS
+        message = f"Replica {lag:.1f}s behind the primary, reads use the primary"
+    except SQLAlchemyError as e:
+        usable = False
+        message = f"Replica unavailable, reads use the primary: {e}"
+    if not usable:
+        from config.logger import get_logger
+
+        get_logger().warning(message)
+    _replica_state = (now, usable)
+    return _replica_engine if usable else None
+
+
+def dispose():
+    """
+    Closes the pooled connections and drops the engines. The next query
+    builds new ones.
+    """
+    global _engine, _replica_engine, _replica_state
+    engines = (_engine, _replica_engine)
+    _engine = _replica_engine = None
+    _replica_state = (None, False)
+    for engine in engines:
+        if engine is not None:
+            engine.dispose()
+
+
+def __getattr__(name):
+    # `from config.database import engine` keeps working for the scripts.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Key of the session info flag sending the reads to the replica.
+REPLICA_KEY = "epic_events.replica"
+
+
+def is_replica_read(clause):
+    return (clause is not None and getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None)
+
+
+# Session bound to the engine on its first query rather than on creation.
+class LazySession(Session):
+    """
+    Session that binds to the application engine when it first needs a
+    connection, unless it was given a bind. While ``info[REPLICA_KEY]`` is
+    set, its SELECTs go to the replica when there is a usable one; flushes
+    and every other statement go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.bind is not None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if (self.info.get(REPLICA_KEY) and not self._flushing
+                and is_replica_read(clause)):
+            replica = get_replica_engine()
+            if replica is not None:
+                return replica
+        return get_engine()
+
+
+SessionLocal = sessionmaker(class_=LazySession, autocommit=False, autoflush=False)
+
+
+@contextmanager
+def sessions_bound_to(connection):
+    """
+    Makes the sessions created by SessionLocal join the transaction of
+    ``connection``. Their commits are not propagated to it, so the caller
+    decides when the work is committed or rolled back.
+
+    Args:
+        connection (Connection): A connection with a transaction begun.
+    """
+    saved_kw = dict(SessionLocal.kw)
+    SessionLocal.configure(bind=connection, join_transaction_mode="rollback_only")
+    try:
+        yield
+    finally:
+        SessionLocal.kw = saved_kw
+
+
+# Key of the command-scoped session in the click context meta.
+COMMAND_SESSION_KEY = "epic_events.session"
+
+
+@contextmanager
+def session_scope(factory=None, replica=False):
+    """
+    Provides the session of the running command, so that AuthGroup, the
+    click validators and the controller of one call share a single session
+    and its identity map. The session is created on first use and closed
+    when the command's context closes.
+
+    Outside of a click command, a new session is created and closed when
+    the block exits.
+
+    Args:
+        factory (callable, optional): Creates the session, SessionLocal by
+        default.
+        replica (bool, optional): Send the reads of the block to the read
+        replica, for the code that only reads.
+
+    Yields:
+        Session: The session to use.
+    """
+    factory = factory or SessionLocal
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        session = factory()
+        try:
+            with replica_reads(session, replica):
+                yield session
+        finally:
+            session.close()
+        return
+    session = command_session(ctx, factory)
+    with replica_reads(session, replica):
+        yield session
+
+
+@contextmanager
+def replica_reads(session, enabled=True):
+    """
+    Sends the reads of ``session`` to the replica within the block, unless
+    they already go there. The objects loaded are expired when the block
+    exits, so that code writing with the session afterwards reloads them
+    from the primary rather than reusing what the replica returned.
+
+    Args:
+        session (Session): The session.
+        enabled (bool, optional): False leaves the session as it is.
+    """
+    if not enabled or session.info.get(REPLICA_KEY):
+        yield
+        return
+    session.info[REPLICA_KEY] = True
+    try:
+        yield
+    finally:
+        session.info.pop(REPLICA_KEY, None)
+        session.expire_all()
+
+
+def command_session(ctx, factory=None):
+    """
+    Returns the session of the command running in ``ctx``, creating it on
+    first use. It is closed when the root context closes.
+
+    Args:
+        ctx (click.Context): The context of the command.
+        factory (callable, optional): Creates the session, SessionLocal by
+        default.
+
+    Returns:
+        Session: The command-scoped session.
+    """
+    session = ctx.meta.get(COMMAND_SESSION_KEY)
+    if session is None:
+        session = (factory or SessionLocal)()
+        ctx.meta[COMMAND_SESSION_KEY] = session
+        ctx.find_root().call_on_close(session.close)
+    return session
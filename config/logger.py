@@ -1,38 +1,179 @@
+import atexit
+import contextlib
 import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from os import getenv
-from sentry_sdk.integrations.logging import LoggingIntegration
-import sentry_sdk
+
+LOGGER_NAME = 'epic_events_logger'
+LOG_FORMAT = ('%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d'
+              ' - %(message)s')
+
+# Records waiting for the background thread; extra records are dropped.
+LOG_QUEUE_SIZE = int(getenv("LOG_QUEUE_SIZE", "1000"))
+# Seconds the process waits at exit for the queued records and Sentry events.
+LOG_FLUSH_TIMEOUT = float(getenv("LOG_FLUSH_TIMEOUT", "2"))
+
+_listener = None
+# Set once the listener was stopped, at exit.
+_stopped = False
+
+
+# Never blocks the caller: a full queue drops the record.
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops the records it can't enqueue right away and
+    counts them.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Starts the Sentry SDK on the first record it has to send.
+class LazySentryHandler(logging.Handler):
+    """
+    Logging handler that sends its records to Sentry, initializing the SDK
+    on the first one so that commands which log no error never load it.
+
+    Args:
+        dsn (str): The Sentry DSN.
+        level (int): The minimum level of the records sent as events.
+    """
+
+    def __init__(self, dsn, level=logging.ERROR):
+        super().__init__(level=level)
+        self.dsn = dsn
+        self.event_handler = None
+
+    def init_sentry(self):
+        import sentry_sdk
+        from sentry_sdk.integrations.logging import EventHandler, LoggingIntegration
+
+        sentry_sdk.init(
+            dsn=self.dsn,
+            sample_rate=float(getenv("SENTRY_SAMPLE_RATE", "1.0")),
+            traces_sample_rate=float(getenv("SENTRY_TRACES_SAMPLE_RATE", "0.0")),
+            profiles_sample_rate=float(getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.0")),
+            shutdown_timeout=LOG_FLUSH_TIMEOUT,
+            # The records come from this handler, not from the integration.
+            integrations=[LoggingIntegration(level=None, event_level=None)],
+        )
+        self.event_handler = EventHandler(level=self.level)
+
+    def emit(self, record):
+        if self.event_handler is None:
+            self.init_sentry()
+        self.event_handler.handle(record)
+
+
+def stop_listener(timeout=LOG_FLUSH_TIMEOUT):
+    """
+    Flushes the queued records, waiting at most ``timeout`` seconds. Only
+    the first call stops the listener.
+
+    Args:
+        timeout (float): The maximum wait, in seconds.
+    """
+    global _stopped
+    if _listener is None or _stopped:
+        return
+    _stopped = True
+    # QueueListener.stop() waits for the records without a limit: it runs in
+    # a thread that the exit of the process doesn't wait for.
+    stopper = threading.Thread(target=stop_quietly, args=(_listener,), daemon=True)
+    stopper.start()
+    stopper.join(timeout)
+
+
+def stop_quietly(listener):
+    try:
+        listener.stop()
+    except queue.Full:
+        # No room for the end marker: the records are lost at exit.
+        pass
 
 
 def get_logger():
     # Check if the logger already exists
-    logger = logging.getLogger('epic_events_logger')
-    if logger.hasHandlers():
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is not None:
         # Logger already exists, return the existing instance
         return logger
+    return setup_logger(logger)
+
+
+def setup_logger(logger):
+    """
+    Sends the records of the logger through a bounded queue to a background
+    thread that writes them to the console and, for errors, to Sentry.
 
-    # Initialize Sentry
-    sentry_logging = LoggingIntegration(
-        level=logging.INFO,        # Capture info and above as breadcrumbs
-        event_level=logging.INFO   # Send info and above as events
-    )
+    Args:
+        logger (logging.Logger): The application logger.
 
-    sentry_sdk.init(
-        dsn=getenv("SENTRY_DSN"),
-        traces_sample_rate=1.0,
-        profiles_sample_rate=1.0,
-        integrations=[sentry_logging]
-    )
+    Returns:
+        logging.Logger: The configured logger.
+    """
+    global _listener, _stopped
 
     # Set the minimum logging level
     logger.setLevel(logging.DEBUG)
+    for handler in list(logger.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            logger.removeHandler(handler)
 
     # Create and set up the console handler
     console_handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-    )
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    # Records sent elsewhere by log_to() are not written to the console.
+    console_handler.addFilter(lambda record: not getattr(record, "redirected", False))
+    handlers = [console_handler]
 
+    # Sentry is only loaded when a DSN is configured and an error is logged
+    dsn = getenv("SENTRY_DSN")
+    if dsn:
+        event_level = getenv("SENTRY_EVENT_LEVEL", "ERROR").upper()
+        handlers.append(LazySentryHandler(dsn, level=event_level))
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _stopped = False
+    atexit.register(stop_listener)
     return logger
+
+
+def mark_redirected(record):
+    record.redirected = True
+    return True
+
+
+@contextlib.contextmanager
+def log_to(stream):
+    """
+    Writes the records logged within the block to ``stream`` instead of the
+    console, as they are logged; Sentry still gets them. The daemon uses it
+    to send the logs of a call to its client.
+
+    Args:
+        stream (file): Where the records go.
+    """
+    logger = get_logger()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addFilter(mark_redirected)
+    logger.addHandler(handler)
+    try:
+        yield
+    finally:
+        logger.removeHandler(handler)
+        logger.removeFilter(mark_redirected)
@@ -1,4 +1,8 @@
 # Description: This file contains the permissions for each role in the system.
+import hashlib
+import json
+from types import MappingProxyType
+
 ROLES_PERMISSIONS = {
     "sales": [
         "create-client",
@@ -23,6 +27,7 @@ ROLES_PERMISSIONS = {
     "management": [
         "create-contract",
         "create-collaborator",
+        "import-collaborators",
         "delete-collaborator",
         "list-collaborators",
         "update-collaborator",
@@ -33,5 +38,78 @@ ROLES_PERMISSIONS = {
         "update-contract",
         "delete-contract",
         "update-event",
+        "sync-permissions",
+        "login-stats",
+        "pool-stats",
+        "cache-stats",
     ],
 }
+
+# Bit positions of the permissions in the access token claims.
+PERMISSION_NAMES = tuple(
+    sorted({name for names in ROLES_PERMISSIONS.values() for name in names})
+)
+
+# Changes whenever the permission matrix changes, so that tokens carrying a
+# bitmask built from an older matrix are not trusted.
+PERMISSIONS_VERSION = hashlib.sha256(
+    json.dumps(
+        {role: sorted(set(names)) for role, names in ROLES_PERMISSIONS.items()},
+        sort_keys=True,
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+
+def encode_permissions(names):
+    """
+    Packs permission names into a bitmask. Names outside PERMISSION_NAMES
+    are ignored.
+
+    Args:
+        names (iterable): The permission names.
+
+    Returns:
+        int: The bitmask.
+    """
+    names = set(names)
+    return sum(1 << bit for bit, name in enumerate(PERMISSION_NAMES) if name in names)
+
+
+def decode_permissions(mask):
+    """
+    Unpacks a bitmask built by encode_permissions.
+
+    Args:
+        mask (int): The bitmask.
+
+    Returns:
+        frozenset: The permission names.
+    """
+    return frozenset(
+        name for bit, name in enumerate(PERMISSION_NAMES) if mask & (1 << bit)
+    )
+
+
+# Compiled once: role name -> permission names, for O(1) lookups.
+ROLE_PERMISSIONS = MappingProxyType(
+    {role: frozenset(names) for role, names in ROLES_PERMISSIONS.items()}
+)
+
+# Compiled once: role name -> permission bitmask, as carried by the tokens.
+ROLE_PERMISSION_MASKS = MappingProxyType(
+    {role: encode_permissions(names) for role, names in ROLE_PERMISSIONS.items()}
+)
+
+
+def role_permissions(role):
+    """
+    Returns the permissions of a role from the compiled matrix.
+
+    Args:
+        role (str): The role name.
+
+    Returns:
+        frozenset: The permission names, or None if the role is not in the
+        matrix.
+    """
+    return ROLE_PERMISSIONS.get(str(role))
@@ -0,0 +1,215 @@
+import hashlib
+import math
+import os
+import struct
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.database import SessionLocal, session_scope
+from config.logger import get_logger
+from models.collaborator import RevokedToken
+
+# Revoked tokens the filter holds at REVOCATION_ERROR_RATE false positives;
+# past it, the filter is rebuilt twice as large.
+REVOCATION_CAPACITY = int(os.getenv("REVOCATION_CAPACITY", "200000"))
+REVOCATION_ERROR_RATE = float(os.getenv("REVOCATION_ERROR_RATE", "0.001"))
+# Seconds between two fetches of the new revocations.
+REVOCATION_REFRESH_SECONDS = int(os.getenv("REVOCATION_REFRESH_SECONDS", "60"))
+
+# Header of the cache file: capacity, hash count, last id, item count.
+HEADER = struct.Struct("<QIQQ")
+
+# (path, mtime_ns, filter) of the last filter read, for long-lived processes
+_cache = None
+
+
+# Set membership with false positives but no false negatives.
+class BloomFilter:
+    """
+    Bloom filter of the revoked token ids, sized for ``capacity`` items at
+    ``error_rate`` false positives. Its size doesn't depend on the number of
+    items, so checking it costs the same with 10 or 100k revocations.
+
+    Args:
+        capacity (int): The number of items the error rate holds for.
+        error_rate (float): The probability of a false positive.
+        hash_count (int, optional): The number of bit positions per item.
+        bits (bytearray, optional): The bits of an existing filter.
+    """
+
+    def __init__(self, capacity=REVOCATION_CAPACITY,
+                 error_rate=REVOCATION_ERROR_RATE, hash_count=None, bits=None):
+        if bits is None:
+            size = -capacity * math.log(error_rate) / math.log(2) ** 2
+            bits = bytearray(math.ceil(size / 8))
+        self.capacity = capacity
+        self.bits = bits
+        self.size = len(bits) * 8
+        self.hash_count = hash_count or max(1, round(self.size / capacity
+                                                     * math.log(2)))
+        self.count = 0
+        self.last_id = 0
+
+    def positions(self, item):
+        # Double hashing: the k positions come from two 64-bit hashes.
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self.positions(item))
+
+    def is_full(self):
+        return self.count >= self.capacity
+
+    def to_bytes(self):
+        return HEADER.pack(self.capacity, self.hash_count, self.last_id,
+                           self.count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        capacity, hash_count, last_id, count = HEADER.unpack_from(data)
+        bloom = cls(capacity, hash_count=hash_count,
+                    bits=bytearray(data[HEADER.size:]))
+        bloom.last_id = last_id
+        bloom.count = count
+        return bloom
+
+
+def get_cache_path():
+    path = os.getenv("REVOCATION_CACHE_PATH")
+    if path:
+        return path
+    return os.path.join(os.path.expanduser("~"), os.getenv("TOKEN_DIR_PATH"),
+                        "revoked_tokens.bloom")
+
+
+def read_filter(path):
+    """
+    Reads the cached filter, reusing the one already in memory while the
+    file is unchanged.
+
+    Returns:
+        tuple: The filter, or None if there is no valid cache, and the mtime
+        of the file in seconds.
+    """
+    global _cache
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None, 0
+    if _cache is not None and _cache[:2] == (path, stat.st_mtime_ns):
+        return _cache[2], stat.st_mtime
+    try:
+        with open(path, "rb") as file:
+            bloom = BloomFilter.from_bytes(file.read())
+    except (OSError, struct.error, ValueError):
+        return None, 0
+    _cache = (path, stat.st_mtime_ns, bloom)
+    return bloom, stat.st_mtime
+
+
+def write_filter(path, bloom):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(bloom.to_bytes())
+    os.replace(temporary_path, path)
+
+
+def refresh_filter(session, bloom=None):
+    """
+    Adds the revocations made since the filter was last refreshed. A filter
+    past its capacity is rebuilt twice as large, without the expired tokens.
+
+    Args:
+        session (Session): The database session.
+        bloom (BloomFilter, optional): The cached filter, None to build one.
+
+    Returns:
+        BloomFilter: The refreshed filter.
+    """
+    if bloom is None:
+        bloom = BloomFilter()
+    for row_id, jti in RevokedToken.get_since(session, bloom.last_id):
+        if bloom.is_full():
+            return refresh_filter(session, BloomFilter(bloom.capacity * 2))
+        bloom.add(jti)
+        bloom.last_id = row_id
+    return bloom
+
+
+def get_revocation_filter():
+    """
+    Returns the filter of the revoked tokens, from the local cache while it
+    is younger than REVOCATION_REFRESH_SECONDS, else refreshed with the new
+    revocations. When the database can't be reached, the cached filter is
+    used as it is.
+
+    Returns:
+        BloomFilter: The filter of the revoked token ids.
+    """
+    path = get_cache_path()
+    bloom, refreshed_at = read_filter(path)
+    if bloom is not None and time.time() - refreshed_at < REVOCATION_REFRESH_SECONDS:
+        return bloom
+    try:
+        with session_scope(SessionLocal) as session:
+            bloom = refresh_filter(session, bloom)
+        write_filter(path, bloom)
+    except (SQLAlchemyError, OSError) as e:
+        get_logger().error(f"Revocation list not refreshed: {e}")
+    return bloom or BloomFilter()
+
+
+def is_revoked(jti):
+    """
+    Checks whether the token with this jti was revoked. Only a filter hit,
+    revoked or a false positive, is confirmed with a database query.
+
+    Args:
+        jti (str): The jti claim of the token.
+
+    Returns:
+        bool: True if the token was revoked.
+    """
+    if jti not in get_revocation_filter():
+        return False
+    try:
+        with session_scope(SessionLocal) as session:
+            return RevokedToken.is_revoked(session, jti)
+    except SQLAlchemyError as e:
+        get_logger().error(f"Revocation not confirmed: {e}")
+        return True
+
+
+def revoke_tokens(claims_list):
+    """
+    Revokes tokens by their claims and adds them to the local filter right
+    away.
+
+    Args:
+        claims_list (list): The decoded claims of the tokens.
+    """
+    claims_list = [claims for claims in claims_list if claims.get("jti")]
+    if not claims_list:
+        return
+    with session_scope(SessionLocal) as session:
+        for claims in claims_list:
+            expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc)
+            RevokedToken.revoke(session, claims["jti"],
+                                expires_at.replace(tzinfo=None))
+    path = get_cache_path()
+    bloom, _ = read_filter(path)
+    if bloom is not None:
+        for claims in claims_list:
+            bloom.add(claims["jti"])
+        write_filter(path, bloom)
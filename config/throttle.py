@@ -0,0 +1,170 @@
+import os
+import pwd
+from datetime import datetime, timedelta
+
+from config.database import SessionLocal, session_scope
+from models.collaborator import LoginAttempt, LoginCounter
+
+# Failed logins allowed per email, and per OS user for all emails, within
+# LOGIN_WINDOW_SECONDS.
+LOGIN_MAX_ATTEMPTS = int(os.getenv("LOGIN_MAX_ATTEMPTS", "5"))
+LOGIN_MAX_ATTEMPTS_PER_USER = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_USER", "20"))
+LOGIN_WINDOW_SECONDS = int(os.getenv("LOGIN_WINDOW_SECONDS", "300"))
+
+COUNTERS = ("allowed", "rejected", "failed", "succeeded")
+
+_throttle = None
+
+
+def get_os_user():
+    """
+    Returns the name of the OS user running the process, from its uid:
+    unlike USER or LOGNAME, the user can't choose it.
+    """
+    uid = os.getuid()
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+# Sliding-window limiter of the failed logins, checked before any bcrypt work.
+class LoginThrottle:
+    """
+    Counts the failed logins of the last ``window`` seconds per email and
+    per OS user in the application database, which the users of the CLI
+    can't edit or point elsewhere, so that every host shares the limits.
+
+    Args:
+        factory (callable): Creates the database sessions.
+        max_attempts (int): The failures allowed per email.
+        max_user_attempts (int): The failures allowed per OS user.
+        window (int): The length of the sliding window, in seconds.
+    """
+
+    def __init__(self, factory=SessionLocal, max_attempts=LOGIN_MAX_ATTEMPTS,
+                 max_user_attempts=LOGIN_MAX_ATTEMPTS_PER_USER,
+                 window=LOGIN_WINDOW_SECONDS):
+        self.factory = factory
+        self.limits = {"email": max_attempts, "user": max_user_attempts}
+        self.window = timedelta(seconds=window)
+        # Ids of the attempts reserved by check(), by email.
+        self._reservations = {}
+
+    def keys(self, email):
+        return {"email": email.lower(), "user": get_os_user()}
+
+    def check(self, email):
+        """
+        Checks whether a login of ``email`` may be attempted. An allowed
+        login reserves its attempt in the same transaction, counted as a
+        failure until record_success() releases it, so that concurrent
+        logins can't all pass the check before any of them fails.
+
+        Args:
+            email (str): The email of the login.
+
+        Returns:
+            float: 0 if the login is allowed, else the seconds until it is.
+        """
+        now = datetime.utcnow()
+        wait = 0.0
+        with session_scope(self.factory) as session:
+            # The delete takes the write lock of SQLite and the row locks
+            # of the counters serialize the checks on other databases.
+            LoginAttempt.prune(session, now - self.window)
+            LoginCounter.lock(session)
+            keys = self.keys(email)
+            for kind, key in keys.items():
+                count, oldest = LoginAttempt.count_since(
+                    session, kind, key, now - self.window
+                )
+                if count >= self.limits[kind]:
+                    wait = max(wait,
+                               (oldest + self.window - now).total_seconds())
+            reservation = []
+            if not wait:
+                reservation = [LoginAttempt(kind=kind, key=key, attempted_at=now)
+                               for kind, key in keys.items()]
+                session.add_all(reservation)
+            LoginCounter.increment(session, "rejected" if wait else "allowed")
+            session.commit()
+            if reservation:
+                self._reservations[email.lower()] = [
+                    attempt.id for attempt in reservation
+                ]
+        return wait
+
+    def record_failure(self, email):
+        now = datetime.utcnow()
+        with session_scope(self.factory) as session:
+            # A checked login already counts as a failure.
+            if self._reservations.pop(email.lower(), None) is None:
+                session.add_all([
+                    LoginAttempt(kind=kind, key=key, attempted_at=now)
+                    for kind, key in self.keys(email).items()
+                ])
+            LoginCounter.increment(session, "failed")
+            session.commit()
+
+    def record_success(self, email):
+        with session_scope(self.factory) as session:
+            LoginAttempt.delete(session,
+                                self._reservations.pop(email.lower(), []))
+            LoginAttempt.clear(session, "email", email.lower())
+            LoginCounter.increment(session, "succeeded")
+            session.commit()
+
+    def counters(self):
+        """
+        Returns the counters of the throttle, for monitoring.
+
+        Returns:
+            dict: The number of allowed, rejected, failed and succeeded logins,
+            and the number of failures in the current window, logins in
+            progress included.
+        """
+        with session_scope(self.factory) as session:
+            values = dict.fromkeys(COUNTERS, 0)
+            values.update(LoginCounter.get_all(session))
+            values["window_failures"] = (
+                session.query(LoginAttempt)
+                .filter(LoginAttempt.kind == "email",
+                        LoginAttempt.attempted_at
+                        > datetime.utcnow() - self.window)
+                .count()
+            )
+        return values
+
+
+# Login throttle of the process, created on first use.
+def get_login_throttle():
+    global _throttle
+    if _throttle is None:
+        _throttle = LoginThrottle()
+    return _throttle
+
+
+def check_login(email):
+    """
+    Checks the throttle before a login. It fails closed: a database error
+    is raised, and the login refused, rather than letting it through
+    unthrottled.
+
+    Args:
+        email (str): The email of the login.
+
+    Returns:
+        float: 0 if the login is allowed, else the seconds until it is.
+
+    Raises:
+        SQLAlchemyError: If the attempts can't be read.
+    """
+    return get_login_throttle().check(email)
+
+
+def record_login(email, succeeded):
+    if succeeded:
+        get_login_throttle().record_success(email)
+    else:
+        get_login_throttle().record_failure(email)
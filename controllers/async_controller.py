@@ -0,0 +1,439 @@
+"""
+Asyncio versions of the controllers, for a long-lived front end serving
+many users over a small pool of connections (see config/async_database.py).
+
+They take the same inputs as the CLI controllers, validate them with the
+same pydantic models and run the same queries through an AsyncSession. As
+the caller renders the result, they return the objects instead of printing
+views, and raise pydantic.ValidationError on invalid input. Authentication,
+permissions and ownership checks stay with the caller, as the CLI does them
+in AuthGroup and the click validators; the login collaborator is passed
+explicitly since there is no token file.
+"""
+from config.async_database import AsyncSessionLocal, async_session_scope
+from models.client import Client
+from models.collaborator import Collaborator
+from models.contract import Contract
+from models.event import Event
+from validators.client_validator import (
+    ClientDeleteInput,
+    ClientInput,
+    ClientInputUpdate,
+)
+from validators.collaborator_validator import (
+    CollaboratorInput,
+    DeleteCollaboratorInput,
+)
+from validators.contract_validator import (
+    ContractDeleteInput,
+    ContractInput,
+    ContractUpdateInput,
+)
+from validators.event_validator import (
+    EventDeleteInput,
+    EventInput,
+    EventInputUpdate,
+)
+
+
+async def create_client_controller(collaborator_id, full_name, email,
+                                   phone_number, company_name):
+    """
+    Create a new client followed by the login collaborator.
+
+    Args:
+        collaborator_id (int): The ID of the login collaborator.
+        full_name (str): The full name of the client.
+        email (str): The email address of the client.
+        phone_number (str): The phone number of the client.
+        company_name (str): The name of the client's company.
+
+    Returns:
+        Client: The new client, or None if the collaborator doesn't exist.
+    """
+    validated_data = ClientInput(
+        full_name=full_name,
+        email=email,
+        phone_number=phone_number,
+        company_name=company_name,
+        commercial_collaborator_id=str(collaborator_id),
+    )
+    async with async_session_scope(AsyncSessionLocal) as session:
+        if await Collaborator.get_by_id_async(collaborator_id, session) is None:
+            return None
+        data = validated_data.dict()
+        data["commercial_collaborator_id"] = collaborator_id
+        client = Client(**data)
+        await client.save_async(session)
+        return client
+
+
+async def update_client_controller(id, full_name, email, phone_number,
+                                   company_name, commercial_collaborator_id):
+    """
+    Update a client's information in the database.
+
+    Args:
+        id (int): The ID of the client.
+        full_name (str): The full name of the client.
+        email (str): The email address of the client.
+        phone_number (str): The phone number of the client.
+        company_name (str): The name of the client's company.
+        commercial_collaborator_id (int): The ID of the collaborator responsible
+
+    Returns:
+        Client: The updated client, or None if not found.
+    """
+    validated_data = ClientInputUpdate(
+        id=id,
+        full_name=full_name,
+        email=email,
+        phone_number=phone_number,
+        company_name=company_name,
+        commercial_collaborator_id=str(commercial_collaborator_id),
+    )
+    async with async_session_scope(AsyncSessionLocal) as session:
+        client = await Client.get_by_id_async(id, session)
+        if client is None:
+            return None
+        data = validated_data.dict()
+        data["commercial_collaborator_id"] = int(commercial_collaborator_id)
+        await client.update_async(session, **data)
+        return client
+
+
+async def delete_client_controller(client_id):
+    """
+    Deletes a client from the database.
+
+    Args:
+        client_id (int): The ID of the client to be deleted.
+
+    Returns:
+        bool: True if the client was deleted, False if not found.
+    """
+    ClientDeleteInput(client_id=client_id)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        client = await Client.get_by_id_async(client_id, session)
+        if client is None:
+            return False
+        await client.delete_async(session)
+        return True
+
+
+async def list_clients_controller(filters=(), collaborator_id=None):
+    """
+    Retrieves the clients.
+
+    Args:
+        filters (list): The filters to apply, "mine" for the clients of the
+        collaborator.
+        collaborator_id (int, optional): The ID of the login collaborator.
+
+    Returns:
+        list: The clients.
+    """
+    async with async_session_scope(AsyncSessionLocal) as session:
+        return await Client.get_all_async(session, filters, collaborator_id)
+
+
+async def create_contract_controller(client_id, total_amount, amount_due, status):
+    """
+    Create a new contract, followed by the commercial of the client.
+
+    Args:
+        client_id (int): The ID of the client.
+        total_amount (float): The total amount of the contract.
+        amount_due (float): The amount due for the contract.
+        status (bool): The status of the contract.
+
+    Returns:
+        Contract: The new contract, or None if the client doesn't exist.
+    """
+    validated_data = ContractInput(client_id=client_id, total_amount=total_amount,
+                                   amount_due=amount_due, status=status)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        client = await Client.get_by_id_async(client_id, session)
+        if client is None:
+            return None
+        contract = Contract(
+            commercial_collaborator_id=client.commercial_collaborator_id,
+            **validated_data.dict(),
+        )
+        await contract.save_async(session)
+        return contract
+
+
+async def update_contract_controller(id, client_id, total_amount, amount_due,
+                                     status):
+    """
+    Update a contract with the provided data.
+
+    Args:
+        id (int): The ID of the contract to be updated.
+        client_id (int): The ID of the client associated with the contract.
+        total_amount (float): The total amount of the contract.
+        amount_due (float): The amount due for the contract.
+        status (bool): The status of the contract.
+
+    Returns:
+        Contract: The updated contract, or None if the contract or the client
+        doesn't exist.
+    """
+    validated_data = ContractUpdateInput(id=id, client_id=client_id,
+                                         total_amount=total_amount,
+                                         amount_due=amount_due, status=status)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        contract = await Contract.get_by_id_async(id, session)
+        client = await Client.get_by_id_async(client_id, session)
+        if contract is None or client is None:
+            return None
+        await contract.update_async(session, **validated_data.dict())
+        return contract
+
+
+async def delete_contract_controller(contract_id):
+    """
+    Deletes a contract based on the given contract ID.
+
+    Args:
+        contract_id (int): The ID of the contract to be deleted.
+
+    Returns:
+        bool: True if the contract was deleted, False if not found.
+    """
+    ContractDeleteInput(id=contract_id)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        contract = await Contract.get_by_id_async(contract_id, session)
+        if contract is None:
+            return False
+        await contract.delete_async(session)
+        return True
+
+
+async def list_contracts_controller(filters, collaborator_id=None):
+    """
+    Retrieve a list of contracts based on the provided filters.
+
+    Args:
+        filters (list): The filters to apply: "mine", "unpaid", "unsigned".
+        collaborator_id (int, optional): The ID of the login collaborator.
+
+    Returns:
+        list: The contracts, with their commercial collaborator.
+    """
+    async with async_session_scope(AsyncSessionLocal) as session:
+        return await Contract.get_all_async(session, filters, collaborator_id)
+
+
+async def create_event_controller(contract_id, description, date_start, date_end,
+                                  location, attendees, notes):
+    """
+    Create a new event for a signed contract.
+
+    Args:
+        contract_id (int): The ID of the contract associated with the event.
+        description (str): The description of the event.
+        date_start (datetime): The start date and time of the event.
+        date_end (datetime): The end date and time of the event.
+        location (str): The location of the event.
+        attendees (int): The number of attendees of the event.
+        notes (str): Additional notes for the event.
+
+    Returns:
+        Event: The new event, or None if the contract doesn't exist or is
+        not signed.
+    """
+    async with async_session_scope(AsyncSessionLocal) as session:
+        contract = await Contract.get_by_id_async(contract_id, session)
+        if contract is None:
+            return None
+        validated_data = EventInput(
+            client_id=contract.client_id,
+            contract_id=contract_id,
+            description=description,
+            date_start=date_start,
+            date_end=date_end,
+            location=location,
+            attendees=attendees,
+            notes=notes,
+        )
+        if not contract.status:
+            return None
+        event = Event(**validated_data.dict())
+        await event.save_async(session)
+        return event
+
+
+async def update_event_controller(id, contract_id=None, description=None,
+                                  date_start=None, date_end=None,
+                                  collaborator_support_id=None, location=None,
+                                  attendees=None, notes=None):
+    """
+    Update an event with the given parameters; the ones left to None keep
+    their value.
+
+    Args:
+        id (int): The ID of the event to be updated.
+        contract_id (int, optional): The ID of the contract
+        associated with the event.
+        description (str, optional): The updated description of the event.
+        date_start (datetime, optional): The updated start
+        date and time of the event.
+        date_end (datetime, optional): The updated end date and time of the event.
+        collaborator_support_id (int, optional): The ID of the collaborator
+        providing support for the event.
+        location (str, optional): The updated location of the event.
+        attendees (int, optional): The updated number of attendees.
+        notes (str, optional): The updated notes for the event.
+
+    Returns:
+        Event: The updated event, or None if it or one of the given contract
+        and support collaborator doesn't exist.
+    """
+    async with async_session_scope(AsyncSessionLocal) as session:
+        contract = None
+        if contract_id:
+            contract = await Contract.get_by_id_async(contract_id, session)
+            if contract is None:
+                return None
+        if collaborator_support_id and await Collaborator.get_by_id_async(
+            collaborator_support_id, session
+        ) is None:
+            return None
+        validated_data = EventInputUpdate(
+            id=id,
+            client_id=contract.client_id if contract else None,
+            contract_id=contract_id,
+            description=description,
+            date_start=date_start,
+            date_end=date_end,
+            collaborator_support_id=collaborator_support_id,
+            location=location,
+            attendees=attendees,
+            notes=notes,
+        )
+        event = await Event.get_by_id_async(id, session)
+        if event is None:
+            return None
+        await event.update_async(session, **validated_data.dict())
+        return event
+
+
+async def delete_event_controller(id):
+    """
+    Deletes an event with the given ID.
+
+    Args:
+        id (int): The ID of the event to be deleted.
+
+    Returns:
+        bool: True if the event was deleted, False if not found.
+    """
+    EventDeleteInput(id=id)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        event = await Event.get_by_id_async(id, session)
+        if event is None:
+            return False
+        await event.delete_async(session)
+        return True
+
+
+async def list_events_controller(filters, collaborator_id=None):
+    """
+    Retrieve a list of events based on the provided filters.
+
+    Args:
+        filters (list): The filters to apply: "with_no_support",
+        "assigned_to_me".
+        collaborator_id (int, optional): The ID of the login collaborator.
+
+    Returns:
+        list: The events.
+    """
+    async with async_session_scope(AsyncSessionLocal) as session:
+        return await Event.get_all_async(session, filters, collaborator_id)
+
+
+async def create_collaborator_controller(employee_number, name, email, role_id,
+                                         password):
+    """
+    Create a new collaborator. The password is hashed in a worker thread.
+
+    Args:
+        employee_number (int): The employee number of the collaborator.
+        name (str): The name of the collaborator.
+        email (str): The email address of the collaborator.
+        role_id (int): The role ID of the collaborator.
+        password (str): The password of the collaborator.
+
+    Returns:
+        Collaborator: The new collaborator.
+    """
+    validated_data = CollaboratorInput(employee_number=employee_number, name=name,
+                                       email=email, role_id=role_id,
+                                       password=password)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        collaborator = Collaborator(**validated_data.dict())
+        await collaborator.save_async(session)
+        return collaborator
+
+
+async def update_collaborator_controller(employee_number, name, email, role_id,
+                                         password):
+    """
+    Update the collaborator with this employee number.
+
+    Args:
+        employee_number (int): The employee number of the collaborator.
+        name (str): The name of the collaborator.
+        email (str): The email address of the collaborator.
+        role_id (int): The role ID of the collaborator.
+        password (str): The new password of the collaborator.
+
+    Returns:
+        Collaborator: The updated collaborator, or None if not found.
+    """
+    validated_data = CollaboratorInput(employee_number=employee_number, name=name,
+                                       email=email, role_id=role_id,
+                                       password=password)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        collaborator = await Collaborator.get_by_employee_number_async(
+            employee_number, session
+        )
+        if collaborator is None:
+            return None
+        await collaborator.update_async(session, **validated_data.dict())
+        return collaborator
+
+
+async def delete_collaborator_controller(employee_number):
+    """
+    Delete the collaborator with this employee number.
+
+    Args:
+        employee_number (int): The employee number of the collaborator.
+
+    Returns:
+        bool: True if the collaborator was deleted, False if not found.
+    """
+    DeleteCollaboratorInput(employee_number=employee_number)
+    async with async_session_scope(AsyncSessionLocal) as session:
+        collaborator = await Collaborator.get_by_employee_number_async(
+            employee_number, session
+        )
+        if collaborator is None:
+            return False
+        await collaborator.delete_async(session)
+        return True
+
+
+async def list_collaborators_controller():
+    """
+    Retrieves the collaborators, with their role.
+
+    Returns:
+        list: The collaborators.
+    """
+    async with async_session_scope(AsyncSessionLocal) as session:
+        return await Collaborator.get_all_async(session)
@@ -0,0 +1,198 @@
+import io
+import json
+import logging
+
+from config.auth import LoginSession, is_authenticated
+from config.daemon import run_command
+from config.database import SessionLocal, get_engine, sessions_bound_to
+from config.logger import get_logger
+from views.base_view import authentication_required_view
+from views.batch_view import batch_result_view, batch_summary_view
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Commands that dispatch other commands and can't run inside a batch.
+NOT_BATCHABLE = ("run-batch", "shell", "serve", "login", "logout")
+
+
+# Collects the errors the views log while an operation runs.
+class ErrorCollector(logging.Handler):
+    """
+    Logging handler that keeps the messages of the error records.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def resolve_command(cli, ctx, name, login_session):
+    """
+    Returns the click command an operation runs, following the role based
+    routing AuthGroup applies to update-event.
+
+    Args:
+        cli (click.Group): The root command group.
+        ctx (click.Context): The current click context.
+        name (str): The command name of the operation.
+        login_session (LoginSession): The login state of the batch.
+
+    Returns:
+        click.Command: The command, or None if it does not exist.
+    """
+    if name == "update-event":
+        name = f"update-event-{login_session.collaborator.role}"
+    return cli.get_command(ctx, name)
+
+
+def build_argv(command, name, args):
+    """
+    Turns the arguments of an operation into command line options.
+
+    Args:
+        command (click.Command): The command the operation runs.
+        name (str): The command name of the operation.
+        args (dict): The option values, keyed by parameter name.
+
+    Returns:
+        list: The arguments to pass to the root command group.
+
+    Raises:
+        ValueError: If an argument is not an option of the command.
+    """
+    options = {param.name: param for param in command.params}
+    argv = [name]
+    for key, value in args.items():
+        option = options.get(key.replace("-", "_")) or options.get(key)
+        if option is None:
+            raise ValueError(f"Unknown option '{key}' for {name}")
+        if option.is_flag:
+            if value:
+                argv.append(option.opts[0])
+        elif value is not None:
+            argv.extend([option.opts[0], str(value)])
+    return argv
+
+
+def read_operations(file):
+    """
+    Yields the operations of a newline-delimited JSON file.
+
+    Args:
+        file (file): The batch file.
+
+    Yields:
+        tuple: The line number, and the operation dict or the parse error.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            operation = json.loads(line)
+            if not isinstance(operation, dict) or "cmd" not in operation:
+                raise ValueError("An operation needs a 'cmd' key")
+            yield line_number, operation
+        except ValueError as e:
+            yield line_number, e
+
+
+def run_operation(cli, ctx, operation, login_session, errors):
+    """
+    Runs one operation through the command group, with its output captured.
+
+    Args:
+        cli (click.Group): The root command group.
+        ctx (click.Context): The current click context.
+        operation (dict): The operation, with its "cmd" and "args".
+        login_session (LoginSession): The login state of the batch.
+        errors (ErrorCollector): The handler collecting the logged errors.
+
+    Returns:
+        tuple: Whether the operation succeeded, and its output.
+    """
+    name = operation["cmd"]
+    if name in NOT_BATCHABLE:
+        return False, f"'{name}' can't run in a batch"
+    command = resolve_command(cli, ctx, name, login_session)
+    if command is None:
+        return False, f"Command '{name}' is not a valid command."
+    try:
+        argv = build_argv(command, name, operation.get("args", {}))
+    except ValueError as e:
+        return False, str(e)
+    output = io.StringIO()
+    errors.messages.clear()
+    exit_code = run_command(
+        cli, argv, stdout=output, stderr=output, obj=login_session
+    )
+    succeeded = exit_code == 0 and not errors.messages
+    return succeeded, output.getvalue().strip()
+
+
+def run_batch_controller(cli, ctx, file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Runs the operations of a JSONL file in this process and in one database
+    transaction, committed every ``chunk_size`` successful operations.
+
+    Each operation goes through the same command, click validators, pydantic
+    inputs and controller as on the command line, inside its own savepoint,
+    so a failing line is rolled back alone.
+
+    Args:
+        cli (click.Group): The root command group.
+        ctx (click.Context): The current click context.
+        file (file): The batch file.
+        chunk_size (int): The number of operations per commit, 0 to commit
+        once at the end.
+
+    Returns:
+        tuple: The number of succeeded and failed operations, or None if
+        the user is not authenticated.
+    """
+    if not is_authenticated():
+        authentication_required_view()
+        return None
+    session = SessionLocal()
+    try:
+        login_session = LoginSession.open(session)
+    finally:
+        session.close()
+
+    logger = get_logger()
+    errors = ErrorCollector()
+    logger.addHandler(errors)
+    succeeded = failed = pending = 0
+    try:
+        with get_engine().connect() as connection, \
+                sessions_bound_to(connection):
+            transaction = connection.begin()
+            for line_number, operation in read_operations(file):
+                if isinstance(operation, Exception):
+                    batch_result_view(line_number, None, False, str(operation))
+                    failed += 1
+                    continue
+                savepoint = connection.begin_nested()
+                ok, output = run_operation(
+                    cli, ctx, operation, login_session, errors
+                )
+                if ok:
+                    savepoint.commit()
+                    succeeded += 1
+                    pending += 1
+                else:
+                    if savepoint.is_active:
+                        savepoint.rollback()
+                    failed += 1
+                batch_result_view(line_number, operation["cmd"], ok, output)
+                if chunk_size and pending >= chunk_size:
+                    transaction.commit()
+                    transaction = connection.begin()
+                    pending = 0
+            transaction.commit()
+    finally:
+        logger.removeHandler(errors)
+    batch_summary_view(succeeded, failed)
+    return succeeded, failed
@@ -1,6 +1,6 @@
 from config.auth import get_login_collaborator
 from models import Client, Collaborator
-from config.database import SessionLocal
+from config.database import SessionLocal, session_scope
 from validators.client_validator import (
     validate_create_client,
     validate_delete_client_input,
@@ -28,19 +28,18 @@ def create_client_controller(full_name, email, phone_number, company_name):
     Returns:
         None
     """
-    session = SessionLocal()
-    collaborator = get_login_collaborator(session=session)
-    commercial_collaborator_id = collaborator.id
-    client_data = {
-        "full_name": full_name,
-        "email": email,
-        "phone_number": phone_number,
-        "company_name": company_name,
-        "commercial_collaborator_id": commercial_collaborator_id,
-    }
-    validated_data = validate_create_client(**client_data)
-    if validated_data:
-        try:
+    with session_scope(SessionLocal) as session:
+        collaborator = get_login_collaborator(session=session)
+        commercial_collaborator_id = collaborator.id
+        client_data = {
+            "full_name": full_name,
+            "email": email,
+            "phone_number": phone_number,
+            "company_name": company_name,
+            "commercial_collaborator_id": commercial_collaborator_id,
+        }
+        validated_data = validate_create_client(**client_data)
+        if validated_data:
             found_commercial = Collaborator.get_by_id(
                 commercial_collaborator_id, session
             )
@@ -50,8 +49,6 @@ def create_client_controller(full_name, email, phone_number, company_name):
                 success_create_client_view()
             else:
                 error_commercial_not_found_view(commercial_collaborator_id)
-        finally:
-            session.close()
 
 
 def update_client_controller(id, full_name, email, phone_number,
@@ -70,7 +67,6 @@ def update_client_controller(id, full_name, email, phone_number,
     Returns:
         None
     """
-    session = SessionLocal()
     client_data = {
         "id": id,
         "full_name": full_name,
@@ -81,12 +77,10 @@ def update_client_controller(id, full_name, email, phone_number,
     }
     validated_data = validate_update_client(**client_data)
     if validated_data:
-        try:
+        with session_scope(SessionLocal) as session:
             client = Client.get_by_id(id, session)
             client.update(session, **validated_data.dict())
             success_update_client_view()
-        finally:
-            session.close()
 
 
 def delete_client_controller(client_id):
@@ -101,28 +95,28 @@ def delete_client_controller(client_id):
     """
     data = {"client_id": client_id}
     validated_data = validate_delete_client_input(**data)
-    session = SessionLocal()
     if validated_data:
-        try:
-            session = SessionLocal()
+        with session_scope(SessionLocal) as session:
             client = Client.get_by_id(client_id, session)
             client.delete(session)
             success_delete_client_view()
-        finally:
-            session.close()
 
 
-def list_clients_controller():
+def list_clients_controller(filters=()):
     """
     Retrieves a list of clients from the database and returns the view for
     displaying the list.
 
+    Args:
+        filters (list): The filters to apply, "mine" for the clients of the
+        login collaborator.
+
     Returns:
         list: The view for displaying the list of clients.
     """
-    session = SessionLocal()
-    try:
-        clients = Client.get_all(session)
+    with session_scope(SessionLocal) as session:
+        collaborator_id = None
+        if "mine" in filters:
+            collaborator_id = get_login_collaborator(session).id
+        clients = Client.get_all(session, filters, collaborator_id)
         return list_client_view(clients)
-    finally:
-        session.close()
@@ -1,11 +1,26 @@
+import csv
+import json
 import os
-from config.auth import create_access_token, get_login_collaborator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from config.auth import (
+    create_access_token,
+    create_refresh_token,
+    get_login_collaborator,
+    get_login_claims,
+    get_refresh_token_path,
+    revoke_login_tokens,
+)
 from validators.collaborator_validator import (
+    CollaboratorInput,
     validate_collaborator_input,
     validate_delete_collaborator_input,
     validate_login_input,
 )
-from models.collaborator import Collaborator
+from models.collaborator import BCRYPT_ROUNDS, Collaborator, Role, hash_password
 from views.collaborator_view import (
     display_user_infos,
     error_collaborator_not_found_view,
@@ -13,11 +28,18 @@ from views.collaborator_view import (
     success_login_view,
     success_create_collaborator_view,
     error_invalid_email_password_view,
+    error_too_many_login_attempts_view,
+    error_login_unavailable_view,
+    error_tokens_not_revoked_view,
+    import_collaborators_error_view,
+    import_collaborators_summary_view,
+    login_stats_view,
     success_logout_view,
     success_update_collaborator_view,
     list_collaborators_view,
 )
-from config.database import SessionLocal
+from config.database import SessionLocal, session_scope
+from config.throttle import check_login, get_login_throttle, record_login
 
 
 def create_collaborator_controller(employee_number, name, email, role_id, password):
@@ -43,13 +65,157 @@ def create_collaborator_controller(employee_number, name, email, role_id, passwo
     }
     validated_data = validate_collaborator_input(**collaborator_data)
     if validated_data:
-        session = SessionLocal()
-        try:
+        with session_scope(SessionLocal) as session:
             new_collaborator = Collaborator(**validated_data.dict())
             new_collaborator.save(session)
             success_create_collaborator_view(new_collaborator)
-        finally:
-            session.close()
+
+
+def read_collaborator_rows(file):
+    """
+    Yields the collaborators of a CSV file with a header row, or of a JSONL
+    file with one object per line.
+
+    Args:
+        file (file): The import file.
+
+    Yields:
+        tuple: The line number, the dict of the collaborator fields and None,
+        or for a line that can't be parsed None and the error.
+    """
+    if file.name.endswith(".jsonl"):
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            yield line_number, row, None
+    else:
+        # The header is line 1.
+        for line_number, row in enumerate(csv.DictReader(file), start=2):
+            yield line_number, row, None
+
+
+def check_import_row(row):
+    """
+    Checks the shape of an import row before its values are validated.
+
+    Args:
+        row: The row read from the import file.
+
+    Returns:
+        str or None: The error of the row, None if it has only known fields.
+    """
+    if not isinstance(row, dict):
+        return "Expected an object with the collaborator fields"
+    if None in row:
+        # Values past the header, collected by csv.DictReader under None.
+        return f"{len(row[None])} more values than columns in the header"
+    unknown = set(row) - set(CollaboratorInput.model_fields)
+    if unknown:
+        return f"Unknown fields: {', '.join(sorted(unknown))}"
+    return None
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hashes the passwords with bcrypt across a pool of processes.
+
+    Args:
+        passwords (list): The passwords.
+        workers (int, optional): The number of processes, one per CPU by
+        default.
+
+    Returns:
+        list: The hashes, in the order of the passwords.
+    """
+    if workers == 1 or len(passwords) < 2:
+        return [hash_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(hash_password, passwords,
+                                 repeat(BCRYPT_ROUNDS), chunksize=4))
+
+
+def import_collaborators_controller(file, workers=None):
+    """
+    Creates the collaborators of a CSV or JSONL file in one transaction.
+    Every row is validated, unknown fields included, and the uniqueness of
+    the employee numbers and emails checked in one query, before the
+    passwords are hashed in parallel; on any error nothing is created.
+
+    Args:
+        file (file): The import file, with the employee_number, name, email,
+        role_id and password of each collaborator.
+        workers (int, optional): The number of hashing processes.
+
+    Returns:
+        int: The number of created collaborators, or None on errors.
+    """
+    inputs = []
+    errors = []
+    seen = {"employee_number": {}, "email": {}}
+    try:
+        for line_number, row, error in read_collaborator_rows(file):
+            error = error or check_import_row(row)
+            if error:
+                errors.append((line_number, error))
+                continue
+            try:
+                collaborator_input = CollaboratorInput(**row)
+            except ValidationError as e:
+                errors.append((line_number, str(e)))
+                continue
+            for field, values in seen.items():
+                value = getattr(collaborator_input, field)
+                if value in values:
+                    errors.append((line_number, f"Duplicate {field} {value}, "
+                                                f"see line {values[value]}"))
+                values.setdefault(value, line_number)
+            inputs.append((line_number, collaborator_input))
+    except (ValueError, csv.Error) as e:
+        errors.append((None, str(e)))
+
+    with session_scope(SessionLocal) as session:
+        existing = Collaborator.get_existing(
+            seen["employee_number"], seen["email"], session
+        )
+        for values in existing:
+            for (field, lines), value in zip(seen.items(), values):
+                if value in lines:
+                    errors.append((lines[value], f"{field} {value} already exists"))
+        role_ids = {role_id for role_id, in session.query(Role.id)}
+        for line_number, collaborator_input in inputs:
+            if collaborator_input.role_id not in role_ids:
+                errors.append((line_number,
+                               f"Role {collaborator_input.role_id} not found"))
+        if errors:
+            for line_number, message in sorted(errors, key=lambda e: e[0] or 0):
+                import_collaborators_error_view(line_number, message)
+            return None
+
+        hashes = hash_passwords(
+            [collaborator_input.password for _, collaborator_input in inputs],
+            workers,
+        )
+        session.add_all(
+            Collaborator(**collaborator_input.dict(exclude={"password"}),
+                         password=password_hash)
+            for (_, collaborator_input), password_hash in zip(inputs, hashes)
+        )
+        try:
+            session.commit()
+        except IntegrityError as e:
+            # Taken by another import or creation since the check above.
+            session.rollback()
+            import_collaborators_error_view(
+                None, f"Nothing imported, a row conflicts with the database: {e.orig}"
+            )
+            return None
+    import_collaborators_summary_view(len(inputs))
+    return len(inputs)
 
 
 def update_collaborator_controller(employee_number, name, email, role_id, password):
@@ -75,8 +241,7 @@ def update_collaborator_controller(employee_number, name, email, role_id, passwo
     }
     validated_data = validate_collaborator_input(**collaborator_data)
     if validated_data:
-        session = SessionLocal()
-        try:
+        with session_scope(SessionLocal) as session:
             collaborator = Collaborator.get_by_employee_number(
                 employee_number=employee_number, session=session
             )
@@ -86,9 +251,6 @@ def update_collaborator_controller(employee_number, name, email, role_id, passwo
             else:
                 error_collaborator_not_found_view(employee_number=employee_number)
 
-        finally:
-            session.close()
-
 
 def delete_collaborator_controller(employee_number):
     """
@@ -103,8 +265,7 @@ def delete_collaborator_controller(employee_number):
     data = {"employee_number": employee_number}
     validated_data = validate_delete_collaborator_input(**data)
     if validated_data:
-        session = SessionLocal()
-        try:
+        with session_scope(SessionLocal) as session:
             collaborator = Collaborator.get_by_employee_number(
                 employee_number, session
             )
@@ -114,8 +275,6 @@ def delete_collaborator_controller(employee_number):
                 success_delete_collaborator_view(collaborator_infos)
             else:
                 error_collaborator_not_found_view(employee_number=employee_number)
-        finally:
-            session.close()
 
 
 def list_collaborators_controller():
@@ -126,75 +285,111 @@ def list_collaborators_controller():
     Returns:
         list: The view for displaying the list of collaborators.
     """
-    session = SessionLocal()
-    try:
+    with session_scope(SessionLocal) as session:
         collaborators = Collaborator.get_all(session)
         return list_collaborators_view(collaborators)
-    finally:
-        session.close()
 
 
 # Controller to check collaborator email and create token if True
 def authentication(email, password):
     """
     Authenticates a collaborator using the provided email and password.
+    Once an email or the OS user has too many recent failures, the login is
+    rejected before the password is checked: each login counts as a failure
+    from the check until it succeeds, so that concurrent logins run at most
+    as many bcrypt checks as the limit. A login whose attempt can't be
+    counted is refused.
+    A password hashed with another work factor than BCRYPT_ROUNDS is hashed
+    again once verified.
 
     Args:
         email (str): The email of the collaborator.
         password (str): The password of the collaborator.
 
     Returns:
-        dict or None: A dictionary containing the access token and token type
-        if the authentication is successful,
+        dict or None: A dictionary containing the access token, the refresh
+        token and token type if the authentication is successful,
         None otherwise.
     """
 
     login_data = {"email": email, "password": password}
     validated_login_data = validate_login_input(**login_data)
     if validated_login_data:
-        session = SessionLocal()
+        # Rejected before the query and the bcrypt check.
         try:
-            collaborator = Collaborator.get_by_email(email, session)
-            if collaborator and collaborator.verify_password(password):
-                access_token = create_access_token(
-                    data={
-                        "sub": collaborator.email,
-                        "role_id": collaborator.role_id,
-                    }
-                )
+            wait = check_login(email)
+        except SQLAlchemyError as e:
+            error_login_unavailable_view(e)
+            return None
+        if wait:
+            error_too_many_login_attempts_view(email, wait)
+            return None
+        with session_scope(SessionLocal) as session:
+            collaborator = Collaborator.get_with_role_by_email(
+                email, session
+            )
+            succeeded = bool(collaborator and collaborator.verify_password(password))
+            try:
+                record_login(email, succeeded)
+            except SQLAlchemyError as e:
+                # An attempt that can't be counted is refused.
+                session.rollback()
+                error_login_unavailable_view(e)
+                return None
+            if succeeded:
+                if collaborator.password_needs_rehash():
+                    # Moves the stored hash to the configured work factor.
+                    collaborator.set_password(password)
+                    session.commit()
+                data = get_login_claims(collaborator)
+                access_token = create_access_token(data=data)
+                refresh_token = create_refresh_token(data=data)
                 success_login_view()
-                return {"access_token": access_token, "token_type": "bearer"}
+                return {
+                    "access_token": access_token,
+                    "refresh_token": refresh_token,
+                    "token_type": "bearer",
+                }
             else:
                 error_invalid_email_password_view(email)
                 return None
-        finally:
-            session.close()
 
 
 # Logout
 def logout_controller():
     """
-    Logs out the user by deleting the access token file.
+    Logs out the user by revoking the access and refresh tokens, then
+    deleting their files.
     """
+    try:
+        revoke_login_tokens()
+    except SQLAlchemyError as e:
+        error_tokens_not_revoked_view(e)
     home_directory = os.path.expanduser("~")
     token_path = os.path.join(home_directory, os.getenv("TOKEN_DIR_PATH"),
                               os.getenv("TOKEN_FILENAME"))
-    # Check if the file exists
-    if os.path.exists(token_path):
-        # Delete the token file
-        os.remove(token_path)
+    for path in (token_path, get_refresh_token_path()):
+        # Check if the file exists
+        if os.path.exists(path):
+            # Delete the token file
+            os.remove(path)
     success_logout_view()
 
 
+def login_stats_controller():
+    """
+    Displays the counters of the login throttle.
+    """
+    login_stats_view(get_login_throttle().counters())
+
+
 def whoami_controller():
     """
     Retrieves the name of the currently logged in collaborator.
     """
     try:
-        session = SessionLocal()
-        user = get_login_collaborator(session)
-        display_user_infos(user)
+        with session_scope(SessionLocal) as session:
+            user = get_login_collaborator(session)
+            display_user_infos(user)
     except FileNotFoundError:
         return None
-    finally:
-        session.close()
@@ -1,4 +1,5 @@
-from config.database import SessionLocal
+from config.auth import get_login_collaborator
+from config.database import SessionLocal, session_scope
 from validators.contract_validator import (
     validate_create_contract_input,
     validate_delete_contract_input,
@@ -40,16 +41,13 @@ def create_contract_controller(
     }
     validate_data = validate_create_contract_input(**contract_data)
     if validate_data:
-        session = SessionLocal()
-        try:
-            client = Client.get_by_id(client_id, SessionLocal())
+        with session_scope(SessionLocal) as session:
+            client = Client.get_by_id(client_id, session)
             contract_data["commercial_collaborator_id"] = \
                 client.commercial_collaborator_id
             contract = Contract(**contract_data)
             contract.save(session)
             success_create_contract_view()
-        finally:
-            session.close()
 
 
 def list_contracts_controller(filters):
@@ -62,12 +60,12 @@ def list_contracts_controller(filters):
     Returns:
         list: A list of contracts matching the provided filters.
     """
-    session = SessionLocal()
-    try:
-        contracts = Contract.get_all(session, filters)
+    with session_scope(SessionLocal) as session:
+        collaborator_id = None
+        if "mine" in filters:
+            collaborator_id = get_login_collaborator(session).id
+        contracts = Contract.get_all(session, filters, collaborator_id)
         return list_contracts_view(contracts)
-    finally:
-        session.close()
 
 
 def delete_contract_controller(contract_id):
@@ -83,16 +81,13 @@ def delete_contract_controller(contract_id):
     data = {"id": contract_id}
     validated_data = validate_delete_contract_input(**data)
     if validated_data:
-        session = SessionLocal()
-        try:
+        with session_scope(SessionLocal) as session:
             contract = Contract.get_by_id(contract_id, session)
             if contract:
                 contract.delete(session)
                 success_delete_contract_view()
             else:
                 error_contract_not_found_view(contract_id)
-        finally:
-            session.close()
 
 
 def update_contract_controller(
@@ -121,8 +116,7 @@ def update_contract_controller(
     }
     validated_data = validate_update_contract_input(**contract_data)
     if validated_data:
-        session = SessionLocal()
-        try:
+        with session_scope(SessionLocal) as session:
             contract = Contract.get_by_id(id, session=session)
             if contract:
                 found_client = Client.get_by_id(client_id, session)
@@ -140,5 +134,3 @@ def update_contract_controller(
                         )
             else:
                 error_contract_not_found_view(id)
-        finally:
-            session.close()
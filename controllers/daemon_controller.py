@@ -0,0 +1,65 @@
+import signal
+import sys
+
+from config.daemon import bind_socket, get_socket_path, serve
+from config.database import dispose, get_pool_stats, set_process_pool_profile
+from views.daemon_view import (
+    daemon_already_running_view,
+    daemon_listening_view,
+    pool_stats_view,
+)
+
+
+def warm_up(cli, ctx):
+    """
+    Imports every subcommand and opens the first database connection, so that
+    the first client call does not pay for them.
+
+    Args:
+        cli (click.Group): The root command group.
+        ctx (click.Context): The current click context.
+    """
+    from config.database import get_engine
+
+    for name in cli.list_commands(ctx):
+        cli.get_command(ctx, name)
+    with get_engine().connect():
+        pass
+
+
+def serve_controller(cli, ctx, socket_path=None):
+    """
+    Runs the resident daemon that executes CLI calls sent over a Unix socket.
+
+    Args:
+        cli (click.Group): The root command group.
+        ctx (click.Context): The current click context.
+        socket_path (str, optional): The path of the Unix socket.
+
+    Returns:
+        None
+    """
+    socket_path = socket_path or get_socket_path()
+    try:
+        server = bind_socket(socket_path)
+    except RuntimeError as e:
+        daemon_already_running_view(e)
+        return
+    # The daemon serves many calls: keep a pool of checked connections.
+    set_process_pool_profile("server")
+    warm_up(cli, ctx)
+    # Turn SIGTERM into a clean exit so that the socket file is removed.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    daemon_listening_view(socket_path)
+    try:
+        serve(cli, server, socket_path)
+    finally:
+        dispose()
+
+
+def pool_stats_controller():
+    """
+    Displays the metrics of the connection pool of this process, which is
+    the daemon's when the call is forwarded to it.
+    """
+    pool_stats_view(get_pool_stats())
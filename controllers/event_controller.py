@@ -1,6 +1,6 @@
 from config.auth import get_login_collaborator
 from models import Collaborator
-from config.database import SessionLocal
+from config.database import SessionLocal, session_scope
 from validators.event_validator import (
     validate_create_event,
     validate_delete_event_input,
@@ -46,23 +46,22 @@ def create_event_controller(
     Returns:
         None
     """
-    session = SessionLocal()
-    client_id = (
-        Contract.get_by_id(contract_id, session).client_id if contract_id else None
-    )
-    event_data = {
-        "client_id": client_id,
-        "contract_id": contract_id,
-        "description": description,
-        "date_start": date_start,
-        "date_end": date_end,
-        "location": location,
-        "attendees": attendees,
-        "notes": notes,
-    }
-    validated_data = validate_create_event(**event_data)
-    if validated_data:
-        try:
+    with session_scope(SessionLocal) as session:
+        client_id = (
+            Contract.get_by_id(contract_id, session).client_id if contract_id else None
+        )
+        event_data = {
+            "client_id": client_id,
+            "contract_id": contract_id,
+            "description": description,
+            "date_start": date_start,
+            "date_end": date_end,
+            "location": location,
+            "attendees": attendees,
+            "notes": notes,
+        }
+        validated_data = validate_create_event(**event_data)
+        if validated_data:
             found_contract = Contract.get_by_id(contract_id, session)
             if found_contract:
                 if found_contract.status:
@@ -71,8 +70,6 @@ def create_event_controller(
                     success_create_event_view()
             else:
                 error_contract_not_found_view(contract_id)
-        finally:
-            session.close()
 
 
 def update_event_controller(
@@ -106,34 +103,36 @@ def update_event_controller(
     Returns:
         None
     """
-    session = SessionLocal()
-    # client = Contract.get_by_id(contract_id, session)
-    client_id = (
-        Contract.get_by_id(contract_id, session).client_id if contract_id else None
-    )
-    event_data = {
-        "id": id,
-        "client_id": client_id,
-        "contract_id": contract_id,
-        "description": description,
-        "date_start": date_start,
-        "date_end": date_end,
-        "collaborator_support_id": collaborator_support_id,
-        "location": location,
-        "attendees": attendees,
-        "notes": notes,
-    }
-    validated_data = validate_update_event(**event_data)
-    if validated_data:
-        try:
+    with session_scope(SessionLocal) as session:
+        # client = Contract.get_by_id(contract_id, session)
+        client_id = (
+            Contract.get_by_id(contract_id, session).client_id if contract_id else None
+        )
+        event_data = {
+            "id": id,
+            "client_id": client_id,
+            "contract_id": contract_id,
+            "description": description,
+            "date_start": date_start,
+            "date_end": date_end,
+            "collaborator_support_id": collaborator_support_id,
+            "location": location,
+            "attendees": attendees,
+            "notes": notes,
+        }
+        validated_data = validate_update_event(**event_data)
+        if validated_data:
             event = Event.get_by_id(id, session)
             if event:
                 if client_id and contract_id:
-                    collaborator = Collaborator.get_by_id(
-                        collaborator_support_id, session=session
-                    )
-                    if not collaborator:
-                        error_collaborator_not_found_view(collaborator_support_id)
+                    if collaborator_support_id is not None:
+                        collaborator = Collaborator.get_by_id(
+                            collaborator_support_id, session=session
+                        )
+                        if not collaborator:
+                            error_collaborator_not_found_view(
+                                collaborator_id=collaborator_support_id
+                            )
                     client = Client.get_by_id(client_id, session)
                     if not client:
                         error_client_not_found_view(client_id)
@@ -147,8 +146,6 @@ def update_event_controller(
                     success_update_event_view()
             else:
                 error_event_not_found_view(id)
-        finally:
-            session.close()
 
 
 def delete_event_controller(id):
@@ -164,16 +161,13 @@ def delete_event_controller(id):
     data = {"id": id}
     validated_data = validate_delete_event_input(**data)
     if validated_data:
-        try:
-            session = SessionLocal()
+        with session_scope(SessionLocal) as session:
             event = Event.get_by_id(id, session)
             if event:
                 event.delete(session)
                 success_delete_event_view()
             else:
                 error_event_not_found_view(id)
-        finally:
-            session.close()
 
 
 def list_events_controller(filters):
@@ -186,10 +180,7 @@ def list_events_controller(filters):
     Returns:
         list: A list of events that match the provided filters.
     """
-    session = SessionLocal()
-    login_collaborator = get_login_collaborator(session)
-    try:
+    with session_scope(SessionLocal) as session:
+        login_collaborator = get_login_collaborator(session)
         events = Event.get_all(session, filters, login_collaborator)
         return list_event_view(events)
-    finally:
-        session.close()
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+from sqlalchemy.orm import selectinload
+
+from config.cache import PERMISSIONS, ROLES, get_reference_cache, invalidate
+from config.database import SessionLocal, session_scope
+from config.permissions import PERMISSION_NAMES, PERMISSIONS_VERSION, ROLE_PERMISSIONS
+from models.collaborator import Permission, PermissionsVersion, Role
+from views.permission_view import cache_stats_view, sync_permissions_view
+
+
+def sync_permissions(session, dry_run=False):
+    """
+    Brings the roles, permissions and role_permissions tables in line with the
+    compiled permission matrix, applying only the differences, and stamps
+    PERMISSIONS_VERSION. Everything is committed in one transaction.
+
+    Args:
+        session (Session): The database session.
+        dry_run (bool): Computes the differences and rolls them back.
+
+    Returns:
+        dict: The changes, as lists under "roles", "permissions_added",
+        "permissions_removed", "granted", "revoked" and "version".
+    """
+    changes = {
+        "roles": [],
+        "permissions_added": [],
+        "permissions_removed": [],
+        "granted": [],
+        "revoked": [],
+        "version": [],
+    }
+    roles = {
+        str(role): role
+        for role in session.query(Role).options(selectinload(Role.permissions))
+    }
+    permissions = {
+        permission.name: permission for permission in session.query(Permission)
+    }
+
+    for name in sorted(set(PERMISSION_NAMES) - set(permissions)):
+        permissions[name] = Permission(name=name)
+        session.add(permissions[name])
+        changes["permissions_added"].append(name)
+
+    for role_name, names in ROLE_PERMISSIONS.items():
+        role = roles.get(role_name)
+        if role is None:
+            role = Role(name=role_name)
+            session.add(role)
+            changes["roles"].append(role_name)
+        current = {permission.name for permission in role.permissions}
+        for name in sorted(names - current):
+            role.permissions.append(permissions[name])
+            changes["granted"].append(f"{role_name}:{name}")
+        for permission in [p for p in role.permissions if p.name not in names]:
+            role.permissions.remove(permission)
+            changes["revoked"].append(f"{role_name}:{permission.name}")
+
+    for name in sorted(set(permissions) - set(PERMISSION_NAMES)):
+        session.delete(permissions[name])
+        changes["permissions_removed"].append(name)
+
+    stamp = PermissionsVersion.get_current(session)
+    if stamp is None or stamp.version != PERMISSIONS_VERSION:
+        changes["version"].append(PERMISSIONS_VERSION)
+        if stamp is None:
+            stamp = PermissionsVersion(id=1, version=PERMISSIONS_VERSION)
+            session.add(stamp)
+        stamp.version = PERMISSIONS_VERSION
+        stamp.synced_at = datetime.utcnow()
+
+    if dry_run:
+        session.rollback()
+    else:
+        session.commit()
+        invalidate(ROLES, PERMISSIONS)
+    return changes
+
+
+def sync_permissions_controller(dry_run=False):
+    """
+    Syncs the permission tables with config.permissions and displays the
+    changes.
+
+    Args:
+        dry_run (bool): Only displays the changes.
+
+    Returns:
+        dict: The changes.
+    """
+    with session_scope(SessionLocal) as session:
+        changes = sync_permissions(session, dry_run=dry_run)
+    sync_permissions_view(changes, PERMISSIONS_VERSION, dry_run)
+    return changes
+
+
+def cache_stats_controller(clear=False):
+    """
+    Displays the counters of the reference cache.
+
+    Args:
+        clear (bool): Drops the cached values first, after the tables were
+        changed outside of the application.
+    """
+    if clear:
+        invalidate()
+    cache_stats_view(get_reference_cache().stats(), clear)
@@ -0,0 +1,90 @@
+import shlex
+
+from config.auth import LoginSession, is_authenticated
+from config.daemon import invoke_cli
+from config.database import SessionLocal, set_process_pool_profile
+from views.base_view import authentication_required_view
+from views.shell_view import (
+    shell_error_view,
+    shell_nested_command_view,
+    shell_welcome_view,
+)
+
+SHELL_PROMPT = "epic_events> "
+
+
+def open_login_session():
+    """
+    Resolves the login collaborator, its role and its permissions once.
+
+    Returns:
+        LoginSession: The login state shared by the commands of the shell.
+    """
+    session = SessionLocal()
+    try:
+        return LoginSession.open(session)
+    finally:
+        session.close()
+
+
+def read_command():
+    """
+    Reads and splits the next command line.
+
+    Returns:
+        list or None: The arguments of the command, or None at end of input.
+    """
+    while True:
+        try:
+            line = input(SHELL_PROMPT)
+        except EOFError:
+            print()
+            return None
+        except KeyboardInterrupt:
+            print()
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            shell_error_view(e)
+            continue
+        if argv:
+            return argv
+
+
+def shell_controller(cli):
+    """
+    Runs the interactive shell: authenticates once, then dispatches the CLI
+    commands in this process with the same login session.
+
+    Args:
+        cli (click.Group): The root command group.
+
+    Returns:
+        None
+    """
+    # The shell runs many commands: keep a pool of checked connections.
+    set_process_pool_profile("server")
+    if not is_authenticated():
+        authentication_required_view()
+        return
+    login_session = open_login_session()
+    shell_welcome_view(login_session.collaborator)
+    while True:
+        argv = read_command()
+        if argv is None or argv[0] in ("exit", "quit"):
+            return
+        if argv[0] == "help":
+            argv = ["--help"]
+        if argv[0] in ("shell", "serve"):
+            shell_nested_command_view(argv[0])
+            continue
+        try:
+            invoke_cli(cli, argv, obj=login_session)
+        except KeyboardInterrupt:
+            print()
+            continue
+        if argv[0] == "logout":
+            return
+        if argv[0] == "login":
+            login_session = open_login_session()
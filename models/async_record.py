@@ -0,0 +1,35 @@
+class AsyncRecordMixin:
+    """
+    Asyncio versions of the Active Record helpers, for an AsyncSession. The
+    attributes to update are set by ``set_fields``, shared with the
+    synchronous ``update``.
+
+    Relationships are not loaded on access with an AsyncSession: the queries
+    that return objects whose ``__str__`` reads one load it eagerly.
+    """
+
+    async def save_async(self, session):
+        session.add(self)
+        await session.commit()
+
+    async def update_async(self, session, **kwargs):
+        self.set_fields(**kwargs)
+        await session.commit()
+
+    async def delete_async(self, session):
+        await session.delete(self)
+        await session.commit()
+
+    @classmethod
+    async def get_by_id_async(cls, row_id, session):
+        """
+        Retrieves a row by its ID, from the identity map when it is loaded.
+
+        Args:
+            row_id (int): The ID of the row.
+            session (AsyncSession): The database session.
+
+        Returns:
+            The object, or None if not found.
+        """
+        return await session.get(cls, row_id)
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, select
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from config.database import Base
+from models.async_record import AsyncRecordMixin
+from models.ownership import OwnedMixin
 
 
-class Client(Base):
+class Client(OwnedMixin, AsyncRecordMixin, Base):
     """
     Represents a client in the system.
 
@@ -25,6 +27,8 @@ class Client(Base):
     """
 
     __tablename__ = "clients"
+    __owner_column__ = "commercial_collaborator_id"
+    __owner_roles__ = ("sales",)
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String)
@@ -36,7 +40,8 @@ class Client(Base):
     commercial_collaborator_id = Column(Integer,
                                         ForeignKey("collaborators.id",
                                                    ondelete="SET NULL"),
-                                        nullable=True)
+                                        nullable=True,
+                                        index=True)
 
     # Define a relationship to the Commercial model
     collaborator = relationship("Collaborator", back_populates="clients")
@@ -53,10 +58,13 @@ class Client(Base):
         session.add(self)
         session.commit()
 
-    def update(self, session, **kwargs):
+    def set_fields(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
         self.last_contact = datetime.utcnow()  # Update the last_contact time
+
+    def update(self, session, **kwargs):
+        self.set_fields(**kwargs)
         session.merge(self)
         session.commit()
 
@@ -66,11 +74,27 @@ class Client(Base):
 
     @staticmethod
     def get_by_id(client_id, session):
-        return session.query(Client).filter(Client.id == client_id).first()
+        # Identity map first, then a primary key SELECT compiled once.
+        if client_id is None:
+            return None
+        return session.get(Client, client_id)
+
+    @staticmethod
+    def apply_filters(clients, filters=(), collaborator_id=None):
+        # Works on a Query as on a select().
+        if "mine" in filters:
+            clients = Client.mine(clients, collaborator_id)
+        return clients
+
+    @staticmethod
+    def get_all(session, filters=(), collaborator_id=None):
+        return Client.apply_filters(session.query(Client), filters,
+                                    collaborator_id).all()
 
     @staticmethod
-    def get_all(session):
-        return session.query(Client).all()
+    async def get_all_async(session, filters=(), collaborator_id=None):
+        clients = Client.apply_filters(select(Client), filters, collaborator_id)
+        return (await session.scalars(clients)).all()
 
     def __str__(self):
         return (
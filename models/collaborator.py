@@ -1,16 +1,48 @@
+import asyncio
 import enum
+import os
+from functools import cache
+from datetime import datetime
+
 import bcrypt
 from sqlalchemy import (
     Column,
+    DateTime,
+    Index,
     Integer,
     String,
     ForeignKey,
     Table,
     Enum as SqlEnum,
+    bindparam,
+    func,
+    or_,
+    select,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import joinedload, relationship, selectinload
 from sqlalchemy.exc import IntegrityError
+from config.cache import COLLABORATORS, PERMISSIONS, ROLES, cached, invalidate
 from config.database import Base
+from models.async_record import AsyncRecordMixin
+
+# Work factor of the password hashes: each step doubles the hashing time.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+# Module-level so that process pools can hash passwords in parallel.
+def hash_password(password, rounds=None):
+    """
+    Hashes a password with bcrypt.
+
+    Args:
+        password (str): The password.
+        rounds (int, optional): The work factor, BCRYPT_ROUNDS by default.
+
+    Returns:
+        str: The bcrypt hash.
+    """
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
 class RoleEnum(enum.Enum):
@@ -34,6 +66,8 @@ role_permissions = Table(
     Base.metadata,
     Column("role_id", Integer, ForeignKey("roles.id")),
     Column("permission_id", Integer, ForeignKey("permissions.id")),
+    # Serves the joins from roles to their permissions.
+    Index("ix_role_permissions_role_id_permission_id", "role_id", "permission_id"),
 )
 
 
@@ -68,6 +102,39 @@ class Role(Base):
     def get_by_id(id, session):
         return session.query(Role).filter(Role.id == id).first()
 
+    @staticmethod
+    def get_name(id, session):
+        """
+        Returns the name of a role, from the reference cache.
+
+        Args:
+            id (int): The ID of the role.
+            session (Session): The database session, used on a miss.
+
+        Returns:
+            str: The name of the role, or None if not found.
+        """
+        def load():
+            role = Role.get_by_id(id, session)
+            return str(role) if role else None
+
+        return cached(ROLES, id, load)
+
+    @staticmethod
+    def get_permission_names(role):
+        """
+        Returns the permission names of a loaded role, from the reference
+        cache.
+
+        Args:
+            role (Role): The role.
+
+        Returns:
+            list: The sorted permission names.
+        """
+        return cached(PERMISSIONS, str(role),
+                      lambda: sorted(str(permission) for permission in role.permissions))
+
     @classmethod
     def get_or_create(cls, session, name):
         instance = session.query(cls).filter_by(name=name).first()
@@ -138,7 +205,177 @@ class Permission(Base):
         return self.name
 
 
-class Collaborator(Base):
+class PermissionsVersion(Base):
+    """
+    Records the version of the permission matrix (config.permissions) the
+    roles, permissions and role_permissions tables were last synced to.
+
+    Attributes:
+        id (int): The primary key, a single row is kept.
+        version (str): The PERMISSIONS_VERSION of the last sync.
+        synced_at (datetime): When the last sync ran.
+    """
+
+    __tablename__ = "permissions_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(String, nullable=False)
+    synced_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @staticmethod
+    def get_current(session):
+        return session.query(PermissionsVersion).first()
+
+    def __str__(self) -> str:
+        return self.version
+
+
+class RevokedToken(Base):
+    """
+    Records a token revoked before its expiration, by its "jti" claim.
+
+    Attributes:
+        id (int): The primary key, increasing so that caches can fetch the
+        revocations they haven't seen yet.
+        jti (str): The unique identifier of the token.
+        revoked_at (datetime): When the token was revoked.
+        expires_at (datetime): When the token expires, after which the row is
+        no longer needed.
+    """
+
+    __tablename__ = "revoked_tokens"
+    id = Column(Integer, primary_key=True)
+    jti = Column(String, unique=True, nullable=False)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    @staticmethod
+    def revoke(session, jti, expires_at):
+        if RevokedToken.is_revoked(session, jti):
+            return
+        session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        session.commit()
+
+    @staticmethod
+    def is_revoked(session, jti):
+        return session.query(
+            session.query(RevokedToken.id).filter_by(jti=jti).exists()
+        ).scalar()
+
+    @staticmethod
+    def get_since(session, last_id, now=None):
+        """
+        Returns the ids and jtis of the tokens revoked after ``last_id`` that
+        have not expired yet, in revocation order.
+
+        Args:
+            session (Session): The database session.
+            last_id (int): The last id already seen, 0 for all.
+            now (datetime, optional): The current UTC time.
+
+        Returns:
+            list: (id, jti) tuples.
+        """
+        return (
+            session.query(RevokedToken.id, RevokedToken.jti)
+            .filter(RevokedToken.id > last_id,
+                    RevokedToken.expires_at > (now or datetime.utcnow()))
+            .order_by(RevokedToken.id)
+            .all()
+        )
+
+
+class LoginAttempt(Base):
+    """
+    Records a failed login, counted by the login throttle (config.throttle)
+    against the email of the login and against the OS user running it.
+
+    Attributes:
+        id (int): The primary key.
+        kind (str): "email" or "user".
+        key (str): The lowercased email, or the OS user name.
+        attempted_at (datetime): When the login failed.
+    """
+
+    __tablename__ = "login_attempts"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(10), nullable=False)
+    key = Column(String, nullable=False)
+    attempted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_login_attempts_kind_key", "kind", "key", "attempted_at"),
+    )
+
+    @staticmethod
+    def count_since(session, kind, key, since):
+        """
+        Returns the number of failures of ``key`` after ``since``.
+
+        Returns:
+            tuple: The count, and when the oldest of them happened (None if
+            there is none).
+        """
+        return (
+            session.query(func.count(LoginAttempt.id),
+                          func.min(LoginAttempt.attempted_at))
+            .filter(LoginAttempt.kind == kind, LoginAttempt.key == key,
+                    LoginAttempt.attempted_at > since)
+            .one()
+        )
+
+    @staticmethod
+    def prune(session, before):
+        session.query(LoginAttempt).filter(
+            LoginAttempt.attempted_at <= before
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def delete(session, ids):
+        if ids:
+            session.query(LoginAttempt).filter(LoginAttempt.id.in_(ids)).delete(
+                synchronize_session=False
+            )
+
+    @staticmethod
+    def clear(session, kind, key):
+        session.query(LoginAttempt).filter_by(kind=kind, key=key).delete(
+            synchronize_session=False
+        )
+
+
+class LoginCounter(Base):
+    """
+    Counts the logins seen by the login throttle, for monitoring.
+
+    Attributes:
+        name (str): "allowed", "rejected", "failed" or "succeeded".
+        value (int): The number of logins.
+    """
+
+    __tablename__ = "login_counters"
+    name = Column(String(20), primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
+
+    @staticmethod
+    def increment(session, name):
+        updated = session.query(LoginCounter).filter_by(name=name).update(
+            {LoginCounter.value: LoginCounter.value + 1},
+            synchronize_session=False,
+        )
+        if not updated:
+            session.add(LoginCounter(name=name, value=1))
+
+    @staticmethod
+    def lock(session):
+        # Row locks until the end of the transaction, where supported.
+        session.query(LoginCounter.name).with_for_update().all()
+
+    @staticmethod
+    def get_all(session):
+        return dict(session.query(LoginCounter.name, LoginCounter.value))
+
+
+class Collaborator(AsyncRecordMixin, Base):
     """
     Represents a collaborator (employee) in the system.
 
@@ -172,9 +409,19 @@ class Collaborator(Base):
     role = relationship("Role", back_populates="collaborators")
 
     def set_password(self, password):
-        self.password = bcrypt.hashpw(
-            password.encode("utf-8"), bcrypt.gensalt()
-        ).decode("utf-8")
+        self.password = hash_password(password)
+
+    def password_needs_rehash(self):
+        """
+        Checks whether the password hash was made with another work factor
+        than BCRYPT_ROUNDS.
+
+        Returns:
+            bool: True if the password should be hashed again.
+        """
+        # A bcrypt hash reads "$2b$<rounds>$<salt and digest>".
+        parts = self.password.split("$")
+        return len(parts) < 4 or parts[2] != f"{BCRYPT_ROUNDS:02d}"
 
     def verify_password(self, password):
         return bcrypt.checkpw(
@@ -186,7 +433,7 @@ class Collaborator(Base):
         session.add(self)
         session.commit()
 
-    def update(self, session, **kwargs):
+    def set_fields(self, **kwargs):
         if "password" in kwargs:
             self.set_password(kwargs["password"])  # Hash the new password
             kwargs.pop("password")
@@ -194,12 +441,39 @@ class Collaborator(Base):
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    def update(self, session, **kwargs):
+        self.set_fields(**kwargs)
         session.merge(self)
         session.commit()
+        invalidate(COLLABORATORS)
+
+    # bcrypt runs in a thread so that it doesn't block the event loop.
+    async def save_async(self, session):
+        self.password = await asyncio.to_thread(hash_password, self.password)
+        await super().save_async(session)
+
+    async def update_async(self, session, **kwargs):
+        if "password" in kwargs:
+            self.password = await asyncio.to_thread(hash_password,
+                                                    kwargs.pop("password"))
+        await super().update_async(session, **kwargs)
+        invalidate(COLLABORATORS)
+
+    async def delete_async(self, session):
+        await super().delete_async(session)
+        invalidate(COLLABORATORS)
 
     def delete(self, session):
         session.delete(self)
         session.commit()
+        invalidate(COLLABORATORS)
+
+    def role_name(self):
+        # A role loaded with the collaborator is used as it is; otherwise its
+        # name comes from the reference cache instead of a lazy load.
+        if self.role_id is None or "role" in self.__dict__:
+            return str(self.role)
+        return cached(ROLES, self.role_id, lambda: str(self.role))
 
     def __str__(self):
         return (
@@ -207,27 +481,154 @@ class Collaborator(Base):
             f"employee_number={self.employee_number}, "
             f"name={self.name}, "
             f"email={self.email}, "
-            f"role={str(self.role)}  \n"
+            f"role={self.role_name()}  \n"
         )
 
     @staticmethod
     def get_by_id(id, session):
-        return session.query(Collaborator).filter(Collaborator.id == id).first()
+        # Identity map first, then a primary key SELECT compiled once.
+        if id is None:
+            return None
+        return session.get(Collaborator, id)
+
+    @staticmethod
+    def get_role_name(id, session):
+        """
+        Returns the role name of a collaborator, from the reference cache.
+
+        Args:
+            id (int): The ID of the collaborator.
+            session (Session): The database session, used on a miss.
+
+        Returns:
+            str: The name of the role, or None if the collaborator is not
+            found.
+        """
+        def load():
+            collaborator = Collaborator.get_by_id(id, session)
+            return str(collaborator.role) if collaborator else None
+
+        return cached(COLLABORATORS, f"id:{id}", load)
 
     @staticmethod
     def get_by_employee_number(employee_number, session):
-        return (
-            session.query(Collaborator)
-            .filter(Collaborator.employee_number == employee_number)
-            .first()
-        )
+        return session.scalars(collaborator_lookup("employee_number"),
+                               {"value": employee_number}).first()
+
+    @staticmethod
+    def get_existing(employee_numbers, emails, session, chunk_size=500):
+        """
+        Returns the collaborators that already use one of the employee
+        numbers or emails, with one query per ``chunk_size`` values.
+
+        Args:
+            employee_numbers (list): The employee numbers to look for.
+            emails (list): The emails to look for.
+            session (Session): The database session.
+            chunk_size (int): The maximum number of values per query.
+
+        Returns:
+            list: The (employee_number, email) tuples of the collaborators.
+        """
+        employee_numbers = list(employee_numbers)
+        emails = list(emails)
+        existing = set()
+        for start in range(0, max(len(employee_numbers), len(emails)), chunk_size):
+            existing.update(
+                session.query(Collaborator.employee_number, Collaborator.email)
+                .filter(or_(
+                    Collaborator.employee_number.in_(
+                        employee_numbers[start:start + chunk_size]
+                    ),
+                    Collaborator.email.in_(emails[start:start + chunk_size]),
+                ))
+                .all()
+            )
+        return sorted(existing)
 
     @staticmethod
     def get_by_email(email, session):
-        return (
-            session.query(Collaborator).filter(Collaborator.email == email).first()
+        return session.scalars(collaborator_lookup("email"),
+                               {"value": email}).first()
+
+    @staticmethod
+    def get_with_role_by_email(email, session):
+        """
+        Retrieves a collaborator with its role, in a single query.
+
+        Args:
+            email (str): The email of the collaborator.
+            session (Session): The database session.
+
+        Returns:
+            Collaborator: The collaborator, or None if not found.
+        """
+        return session.scalars(collaborator_lookup("email", with_role=True),
+                               {"value": email}).first()
+
+    @staticmethod
+    def has_permission(email, permission_name, session):
+        """
+        Checks in a single EXISTS query whether the role of the collaborator
+        with this email grants the permission. Never cached: this is the
+        check of the "database" authorization backend, decided by the
+        database at the time of the call.
+
+        Args:
+            email (str): The email of the collaborator.
+            permission_name (str): The name of the permission.
+            session (Session): The database session.
+
+        Returns:
+            bool: True if the permission is granted.
+        """
+        granted = (
+            session.query(Collaborator.id)
+            .join(Role, Role.id == Collaborator.role_id)
+            .join(role_permissions, role_permissions.c.role_id == Role.id)
+            .join(Permission, Permission.id == role_permissions.c.permission_id)
+            .filter(Collaborator.email == email, Permission.name == permission_name)
         )
+        return session.query(granted.exists()).scalar()
 
     @staticmethod
     def get_all(session):
         return session.query(Collaborator).all()
+
+    @staticmethod
+    async def get_all_async(session):
+        collaborators = select(Collaborator).options(
+            selectinload(Collaborator.role)
+        )
+        return (await session.scalars(collaborators)).all()
+
+    @staticmethod
+    async def get_by_employee_number_async(employee_number, session):
+        return (await session.scalars(collaborator_lookup("employee_number"),
+                                      {"value": employee_number})).first()
+
+
+# Lookups by a unique column, built on first use and then reused: a call
+# only binds its value, and the compiled SQL comes from the statement cache
+# instead of a new Query being built and its cache key computed each time.
+@cache
+def collaborator_lookup(column_name, with_role=False):
+    """
+    Returns the SELECT of the collaborator by a unique column, with its
+    value as the "value" parameter.
+
+    Args:
+        column_name (str): The name of the column.
+        with_role (bool, optional): Load the role in the same query.
+
+    Returns:
+        Select: The statement.
+    """
+    statement = (
+        select(Collaborator)
+        .where(getattr(Collaborator, column_name) == bindparam("value"))
+        .limit(1)
+    )
+    if with_role:
+        statement = statement.options(joinedload(Collaborator.role))
+    return statement
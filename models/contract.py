@@ -5,13 +5,16 @@ from sqlalchemy import (
     Boolean,
     Numeric,
     ForeignKey,
+    select,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 from datetime import datetime
 from config.database import Base
+from models.async_record import AsyncRecordMixin
+from models.ownership import OwnedMixin
 
 
-class Contract(Base):
+class Contract(OwnedMixin, AsyncRecordMixin, Base):
     """
     Represents a contract in the system.
 
@@ -31,6 +34,8 @@ class Contract(Base):
     """
 
     __tablename__ = "contracts"
+    __owner_column__ = "commercial_collaborator_id"
+    __owner_roles__ = ("sales",)
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer,
@@ -39,7 +44,8 @@ class Contract(Base):
     commercial_collaborator_id = Column(Integer,
                                         ForeignKey("collaborators.id",
                                                    ondelete="SET NULL"),
-                                        nullable=True)
+                                        nullable=True,
+                                        index=True)
     total_amount = Column(Numeric, nullable=False)
     amount_due = Column(Numeric, nullable=False)
     creation_date = Column(Date, default=datetime.utcnow)
@@ -69,6 +75,10 @@ class Contract(Base):
         session.add(self)
         session.commit()
 
+    def set_fields(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
     def update(self, session, **kwargs):
         """
         Updates the contract with the specified attributes.
@@ -80,8 +90,7 @@ class Contract(Base):
         Returns:
             None
         """
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self.set_fields(**kwargs)
         session.merge(self)
         session.commit()
 
@@ -101,7 +110,8 @@ class Contract(Base):
     @staticmethod
     def get_by_id(contract_id, session):
         """
-        Retrieves a contract by its ID.
+        Retrieves a contract by its ID, from the identity map when it is
+        already loaded, else with one cached primary key SELECT.
 
         Args:
             contract_id (int): The ID of the contract.
@@ -110,26 +120,67 @@ class Contract(Base):
         Returns:
             Contract: The contract with the specified ID, or None if not found.
         """
-        return session.query(Contract).filter(Contract.id == contract_id).first()
+        if contract_id is None:
+            return None
+        return session.get(Contract, contract_id)
 
     @staticmethod
-    def get_all(session, filters):
+    def apply_filters(contracts, filters, collaborator_id=None):
         """
-        Retrieves all contracts based on the specified filters.
+        Applies the list filters to a Query or a select() of contracts.
 
         Args:
-            session (Session): The database session.
+            contracts (Query or Select): The contracts.
             filters (list): The filters to apply.
+            collaborator_id (int, optional): The login collaborator, for the
+            "mine" filter.
 
         Returns:
-            list: A list of contracts that match the filters.
+            Query or Select: The filtered contracts.
         """
-        contracts = session.query(Contract)
+        if "mine" in filters:
+            contracts = Contract.mine(contracts, collaborator_id)
         if "unpaid" in filters:
             contracts = contracts.filter(Contract.amount_due != 0)
         if "unsigned" in filters:
             contracts = contracts.filter(Contract.status.is_(False))
-        return contracts.all()
+        return contracts
+
+    @staticmethod
+    def get_all(session, filters, collaborator_id=None):
+        """
+        Retrieves all contracts based on the specified filters.
+
+        Args:
+            session (Session): The database session.
+            filters (list): The filters to apply.
+            collaborator_id (int, optional): The login collaborator, for the
+            "mine" filter.
+
+        Returns:
+            list: A list of contracts that match the filters.
+        """
+        return Contract.apply_filters(session.query(Contract), filters,
+                                      collaborator_id).all()
+
+    @staticmethod
+    async def get_all_async(session, filters, collaborator_id=None):
+        """
+        Retrieves all contracts based on the specified filters, with their
+        commercial collaborator.
+
+        Args:
+            session (AsyncSession): The database session.
+            filters (list): The filters to apply.
+            collaborator_id (int, optional): The login collaborator, for the
+            "mine" filter.
+
+        Returns:
+            list: A list of contracts that match the filters.
+        """
+        contracts = select(Contract).options(selectinload(Contract.collaborator))
+        contracts = Contract.apply_filters(contracts, filters, collaborator_id)
+        return (await session.scalars(contracts)).all()
 
     def __str__(self):
         """
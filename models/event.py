@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, select
 from sqlalchemy.orm import relationship
 from config.database import Base
+from models.async_record import AsyncRecordMixin
+from models.ownership import OwnedMixin
 
 
-class Event(Base):
+class Event(OwnedMixin, AsyncRecordMixin, Base):
     """
     Represents an event in the system.
 
@@ -28,6 +30,8 @@ class Event(Base):
     """
 
     __tablename__ = "events"
+    __owner_column__ = "collaborator_support_id"
+    __owner_roles__ = ("support",)
     id = Column(Integer, primary_key=True, autoincrement=True)
     client_id = Column(Integer,
                        ForeignKey("clients.id", ondelete="CASCADE"),
@@ -39,7 +43,8 @@ class Event(Base):
     date_start = Column(DateTime, nullable=False)
     date_end = Column(DateTime, nullable=False)
     collaborator_support_id = Column(
-        Integer, ForeignKey("collaborators.id", ondelete="SET NULL"), nullable=True
+        Integer, ForeignKey("collaborators.id", ondelete="SET NULL"), nullable=True,
+        index=True,
     )
     location = Column(String, nullable=False)
     attendees = Column(Integer, nullable=False)
@@ -53,10 +58,13 @@ class Event(Base):
         session.add(self)
         session.commit()
 
-    def update(self, session, **kwargs):
+    def set_fields(self, **kwargs):
         for key, value in kwargs.items():
             if value:
                 setattr(self, key, value)
+
+    def update(self, session, **kwargs):
+        self.set_fields(**kwargs)
         session.merge(self)
         session.commit()
 
@@ -65,19 +73,31 @@ class Event(Base):
         session.commit()
 
     @staticmethod
-    def get_all(session, filters, login_collaborator):
-        events = session.query(Event)
+    def apply_filters(events, filters, collaborator_id=None):
+        # Works on a Query as on a select().
         if "with_no_support" in filters:
             events = events.filter(Event.collaborator_support_id.is_(None))
         if "assigned_to_me" in filters:
-            events = events.filter(
-                Event.collaborator_support_id == login_collaborator.id
-            )
-        return events.all()
+            events = Event.mine(events, collaborator_id)
+        return events
+
+    @staticmethod
+    def get_all(session, filters, login_collaborator):
+        collaborator_id = login_collaborator.id if login_collaborator else None
+        return Event.apply_filters(session.query(Event), filters,
+                                   collaborator_id).all()
+
+    @staticmethod
+    async def get_all_async(session, filters, collaborator_id=None):
+        events = Event.apply_filters(select(Event), filters, collaborator_id)
+        return (await session.scalars(events)).all()
 
     @staticmethod
     def get_by_id(event_id, session):
-        return session.query(Event).filter(Event.id == event_id).first()
+        # Identity map first, then a primary key SELECT compiled once.
+        if event_id is None:
+            return None
+        return session.get(Event, event_id)
 
     def __str__(self):
         return (
@@ -0,0 +1,98 @@
+from sqlalchemy import literal
+
+
+class OwnedMixin:
+    """
+    Row-level ownership for the models owned by a collaborator. The owner
+    predicate is added to the query itself, so that an ownership check is a
+    single indexed ``SELECT 1`` instead of loading the row.
+
+    Attributes:
+        __owner_column__ (str): The column of the collaborator owning a row.
+        __owner_roles__ (tuple): The roles that may only act on the rows they
+        own; the other roles act on every row.
+    """
+
+    __owner_column__ = None
+    __owner_roles__ = ()
+
+    @classmethod
+    def owner_column(cls):
+        return getattr(cls, cls.__owner_column__)
+
+    @classmethod
+    def mine(cls, query, collaborator_id):
+        """
+        Restricts a query to the rows owned by the collaborator.
+
+        Args:
+            query (Query): A query of the model.
+            collaborator_id (int): The id of the collaborator.
+
+        Returns:
+            Query: The filtered query.
+        """
+        return query.filter(cls.owner_column() == collaborator_id)
+
+    @classmethod
+    def scoped(cls, query, collaborator_id, role):
+        """
+        Restricts a query to the rows the collaborator may act on with its
+        role.
+
+        Args:
+            query (Query): A query of the model.
+            collaborator_id (int): The id of the collaborator.
+            role (str): The name of the role of the collaborator.
+
+        Returns:
+            Query: The query, filtered if the role only acts on its own rows.
+        """
+        if role in cls.__owner_roles__:
+            query = cls.mine(query, collaborator_id)
+        return query
+
+    @classmethod
+    def row_exists(cls, query):
+        return query.limit(1).scalar() is not None
+
+    @classmethod
+    def select_one(cls, row_id, session):
+        return session.query(literal(1)).select_from(cls).filter(cls.id == row_id)
+
+    @classmethod
+    def exists(cls, row_id, session):
+        return cls.row_exists(cls.select_one(row_id, session))
+
+    @classmethod
+    def is_owned_by(cls, row_id, collaborator_id, session):
+        """
+        Checks whether the row is owned by the collaborator.
+
+        Args:
+            row_id (int): The id of the row.
+            collaborator_id (int): The id of the collaborator.
+            session (Session): The database session.
+
+        Returns:
+            bool: True if the row exists and is owned by the collaborator.
+        """
+        return cls.row_exists(cls.mine(cls.select_one(row_id, session),
+                                       collaborator_id))
+
+    @classmethod
+    def is_accessible(cls, row_id, collaborator_id, role, session):
+        """
+        Checks whether the collaborator may act on the row with its role.
+
+        Args:
+            row_id (int): The id of the row.
+            collaborator_id (int): The id of the collaborator.
+            role (str): The name of the role of the collaborator.
+            session (Session): The database session.
+
+        Returns:
+            bool: True if the row exists and is in the scope of the role.
+        """
+        return cls.row_exists(cls.scoped(cls.select_one(row_id, session),
+                                         collaborator_id, role))
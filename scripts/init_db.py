@@ -5,8 +5,8 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from config.database import Base, engine  # noqa: E402
 from config.database import SessionLocal  # noqa: E402
-from config.permissions import ROLES_PERMISSIONS  # noqa: E402
-from models.collaborator import Collaborator, Permission, Role  # noqa: E402
+from controllers.permission_controller import sync_permissions  # noqa: E402
+from models.collaborator import Collaborator  # noqa: E402
 
 
 # Create the database tables
@@ -14,13 +14,7 @@ Base.metadata.create_all(bind=engine)
 
 # Create the default roles and permissions
 session = SessionLocal()
-for role, permissions in ROLES_PERMISSIONS.items():
-    role_instance = Role.get_or_create(session, role)
-    for permission in permissions:
-        permission_instance = Permission.get_or_create(session, permission)
-        permission_instance.save(session)
-        role_instance.permissions.append(permission_instance)
-        role_instance.save(session)
+sync_permissions(session)
 
 # Create the superuser
 collaborator_email = os.getenv("SUPER_USER_EMAIL")
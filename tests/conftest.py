@@ -7,6 +7,7 @@ import pytest  # noqa: E402
 from unittest.mock import MagicMock  # noqa: E402
 from sqlalchemy import create_engine  # noqa: E402
 from sqlalchemy.orm import sessionmaker  # noqa: E402
+from config.cache import ReferenceCache  # noqa: E402
 from config.database import Base  # noqa: E402
 from models.client import Client  # noqa: E402
 from models.collaborator import Collaborator, Role  # noqa: E402
@@ -24,6 +25,14 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reference_cache():
+    # Each test starts with an empty cache: the tests reuse the same ids.
+    cache = ReferenceCache()
+    with patch("config.cache._cache", cache):
+        yield cache
+
+
 @pytest.fixture(scope="function")
 def test_db():
     Base.metadata.create_all(bind=engine)  # Create tables for the test
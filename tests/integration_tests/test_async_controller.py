@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from config.async_database import dispose_async, get_async_url
+from controllers import async_controller
+from models import Client, Collaborator, Contract
+
+
+def run(coroutine):
+    # Each test has its own event loop: the pool must not outlive it.
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await dispose_async()
+
+    return asyncio.run(main())
+
+
+def test_get_async_url():
+    assert get_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert (get_async_url("postgresql://user@db/epic")
+            == "postgresql+asyncpg://user@db/epic")
+    assert (get_async_url("postgresql+asyncpg://user@db/epic")
+            == "postgresql+asyncpg://user@db/epic")
+
+
+def test_async_client_crud(test_db, collaborator):
+    client = run(async_controller.create_client_controller(
+        collaborator.id, "Foo Async", "async@example.com", "+33123456789",
+        "Async Corp",
+    ))
+    assert client.id is not None
+    assert client.commercial_collaborator_id == collaborator.id
+
+    clients = run(async_controller.list_clients_controller(("mine",),
+                                                           collaborator.id))
+    assert [row.email for row in clients] == ["async@example.com"]
+    assert run(async_controller.list_clients_controller(("mine",), 999)) == []
+
+    updated = run(async_controller.update_client_controller(
+        client.id, "Foo Updated", "async@example.com", "+33123456789",
+        "Async Corp", collaborator.id,
+    ))
+    assert updated.full_name == "Foo Updated"
+    test_db.expire_all()
+    assert Client.get_by_id(client.id, test_db).full_name == "Foo Updated"
+
+    assert run(async_controller.delete_client_controller(client.id)) is True
+    assert run(async_controller.delete_client_controller(client.id)) is False
+    test_db.expire_all()
+    assert Client.get_by_id(client.id, test_db) is None
+
+
+def test_async_contract_and_event(test_db, client, collaborator):
+    contract = run(async_controller.create_contract_controller(
+        client.id, 1000, 500, True
+    ))
+    assert contract.commercial_collaborator_id == collaborator.id
+    contracts = run(async_controller.list_contracts_controller(["unpaid"]))
+    # The collaborator is loaded with the contract: __str__ does no IO.
+    assert "Test Collaborator" in str(contracts[0])
+
+    start = datetime.now() + timedelta(days=1)
+    event = run(async_controller.create_event_controller(
+        contract.id, "Launch", start, start + timedelta(hours=2), "Paris", 50,
+        None,
+    ))
+    assert event.client_id == client.id
+    events = run(async_controller.list_events_controller(["with_no_support"]))
+    assert [row.id for row in events] == [event.id]
+    updated = run(async_controller.update_event_controller(
+        event.id, collaborator_support_id=collaborator.id, location="Lyon"
+    ))
+    assert updated.location == "Lyon"
+    assert run(async_controller.list_events_controller(
+        ["assigned_to_me"], collaborator.id
+    ))[0].id == event.id
+    assert run(async_controller.create_event_controller(
+        999, "Launch", start, start + timedelta(hours=2), "Paris", 50, None,
+    )) is None
+    test_db.expire_all()
+    assert Contract.get_by_id(contract.id, test_db).amount_due == 500
+
+
+def test_async_collaborator(test_db, collaborator):
+    created = run(async_controller.create_collaborator_controller(
+        42, "Async Collaborator", "async.collab@example.com", collaborator.role_id,
+        "secret-password",
+    ))
+    test_db.expire_all()
+    stored = Collaborator.get_by_employee_number(42, test_db)
+    assert stored.id == created.id
+    assert stored.verify_password("secret-password")
+
+    collaborators = run(async_controller.list_collaborators_controller())
+    assert "role=sales" in str(collaborators[-1])
+
+    with pytest.raises(ValidationError):
+        run(async_controller.create_collaborator_controller(
+            43, "Bad", "not-an-email", collaborator.role_id, "secret-password"
+        ))
+    assert run(async_controller.delete_collaborator_controller(42)) is True
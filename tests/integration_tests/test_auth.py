@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import jwt
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from epic_events import cli
+from models.collaborator import Collaborator, Permission
+
+
+def test_identity_is_resolved_once_per_command(test_db, collaborator, runner):
+    permission = Permission.get_or_create(test_db, "list-events")
+    role = collaborator.role
+    role.permissions.append(permission)
+    test_db.commit()
+    token = jwt.encode(
+        {
+            "sub": collaborator.email,
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        },
+        "secret",
+        algorithm="HS256",
+    )
+    identity_queries = []
+
+    def count_identity_queries(conn, cursor, statement, *args):
+        if "FROM collaborators" in statement and "collaborators.email" in statement:
+            identity_queries.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count_identity_queries)
+    try:
+        with patch("config.auth.SECRET_KEY", "secret"), patch(
+            "config.auth.ALGORITHM", "HS256"
+        ), patch("config.auth.get_token_from_file", return_value=token):
+            result = runner.invoke(cli, ["list-events", "--assigned_to_me"])
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_identity_queries)
+
+    assert result.exit_code == 0, result.output
+    assert "Permission denied" not in result.output
+    assert len(identity_queries) == 1
+
+
+def test_collaborator_has_permission(test_db, collaborator):
+    permission = Permission.get_or_create(test_db, "list-events")
+    role = collaborator.role
+    role.permissions.append(permission)
+    test_db.commit()
+
+    assert Collaborator.has_permission(collaborator.email, "list-events", test_db)
+    assert not Collaborator.has_permission(collaborator.email, "delete-event", test_db)
+    assert not Collaborator.has_permission("nobody@example.com", "list-events", test_db)
+
+    # Decided by the database on every call: a revocation applies at once.
+    role.permissions.remove(permission)
+    test_db.commit()
+    assert not Collaborator.has_permission(collaborator.email, "list-events", test_db)
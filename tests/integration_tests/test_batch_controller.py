@@ -0,0 +1,44 @@
+import io
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import click
+
+from config.auth import LoginSession
+from controllers.batch_controller import run_batch_controller
+from epic_events import cli
+from models.contract import Contract
+
+
+def test_run_batch_controller(test_db, client, collaborator, capsys):
+    login_session = LoginSession(
+        token="token",
+        expires_at=(datetime.now(timezone.utc) + timedelta(hours=1)).timestamp(),
+        collaborator=collaborator,
+        permissions=frozenset({"create-contract", "list-contracts"}),
+    )
+    file = io.StringIO(
+        '{"cmd": "create-contract", "args": {"client_id": 1, '
+        '"total_amount": "100", "amount_due": "50", "status": true}}\n'
+        '{"cmd": "create-contract", "args": {"client_id": 1, '
+        '"total_amount": "100", "amount_due": "500", "status": true}}\n'
+        '{"cmd": "delete-client", "args": {"client_id": 1}}\n'
+        '{"cmd": "create-contract", "args": {"client_id": 1, '
+        '"total_amount": "200", "amount_due": "0", "status": false}}\n'
+    )
+    with patch(
+        "controllers.batch_controller.is_authenticated", return_value=True
+    ), patch(
+        "controllers.batch_controller.LoginSession.open",
+        return_value=login_session,
+    ), click.Context(cli) as ctx:
+        result = run_batch_controller(cli, ctx, file, chunk_size=1)
+
+    assert result == (2, 2)
+    output = capsys.readouterr().out
+    assert output.count('"status": "ok"') == 2
+    assert '"line": 2, "cmd": "create-contract", "status": "error"' in output
+    assert "Permission denied" in output
+    test_db.expire_all()
+    contracts = test_db.query(Contract).order_by(Contract.id).all()
+    assert [contract.total_amount for contract in contracts] == [100, 200]
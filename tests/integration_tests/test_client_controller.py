@@ -81,3 +81,23 @@ def test_list_clients_integration(test_db, collaborator, client, capsys):
         # Check that each client is printed as expected
         expected_output = "Client id=1, name=Foo floo, Email= foofloo@example.com,"
         assert expected_output in str(captured.out)
+
+
+def test_client_ownership(test_db, collaborator, client):
+    other = Client(full_name="Bar", email="bar@example.com",
+                   phone_number="+33123456780", company_name="Other Corp",
+                   commercial_collaborator_id=None)
+    test_db.add(other)
+    test_db.commit()
+
+    assert Client.is_owned_by(client.id, collaborator.id, test_db)
+    assert not Client.is_owned_by(other.id, collaborator.id, test_db)
+    assert Client.is_accessible(other.id, collaborator.id, "management", test_db)
+    assert not Client.is_accessible(other.id, collaborator.id, "sales", test_db)
+    assert Client.exists(other.id, test_db)
+    assert not Client.exists(999, test_db)
+
+    mine = Client.get_all(test_db, filters=("mine",),
+                          collaborator_id=collaborator.id)
+    assert [row.id for row in mine] == [client.id]
+    assert len(Client.get_all(test_db)) == 2
@@ -1,12 +1,17 @@
 from unittest.mock import patch
+
+from sqlalchemy.exc import OperationalError
+
+from config.throttle import LoginThrottle
 from controllers.collaborator_controller import (
     create_collaborator_controller,
     update_collaborator_controller,
     delete_collaborator_controller,
     list_collaborators_controller,
     authentication,
+    import_collaborators_controller,
 )
-from models.collaborator import Collaborator
+from models.collaborator import Collaborator, Role, collaborator_lookup
 
 
 # Integration test for creating a collaborator
@@ -164,3 +169,203 @@ def test_authentication(test_db, capsys):
     assert result is not None
     assert "access_token" in result
     assert result["token_type"] == "bearer"
+
+
+def test_authentication_rehashes_password(test_db, capsys):
+    collaborator = Collaborator(
+        employee_number=124,
+        name="Test User",
+        email="rehash@example.com",
+        role_id=1,
+        password="securepassword",
+    )
+    with patch("models.collaborator.BCRYPT_ROUNDS", 4):
+        collaborator.save(test_db)
+    assert collaborator.password.startswith("$2b$04$")
+
+    with patch("models.collaborator.BCRYPT_ROUNDS", 5), patch(
+        "controllers.collaborator_controller.SessionLocal",
+        return_value=test_db,
+    ), patch("controllers.collaborator_controller.create_access_token",
+             return_value="token"), patch(
+        "controllers.collaborator_controller.create_refresh_token"
+    ):
+        result = authentication(
+            email="rehash@example.com", password="securepassword"
+        )
+
+    assert result["access_token"] == "token"
+    collaborator = Collaborator.get_by_email("rehash@example.com", test_db)
+    assert collaborator.password.startswith("$2b$05$")
+    assert collaborator.verify_password("securepassword")
+
+
+def test_authentication_throttled(test_db, capsys):
+    with patch("controllers.collaborator_controller.check_login",
+               return_value=30), patch.object(
+        Collaborator, "verify_password"
+    ) as verify_password:
+        result = authentication(email="collab@example.com", password="password")
+
+    assert result is None
+    assert "Too many login attempts" in capsys.readouterr().out
+    verify_password.assert_not_called()
+
+
+def test_authentication_throttles_concurrent_logins(test_db, collaborator):
+    # Each bcrypt check starts the next login, so that every login passes
+    # the throttle before any of them has failed.
+    throttle = LoginThrottle(max_attempts=3, max_user_attempts=100, window=60)
+    checked = []
+
+    def verify_password(password):
+        checked.append(password)
+        authentication(email="collab@example.com", password="wrong")
+        return False
+
+    with patch("config.throttle._throttle", throttle), \
+            patch.object(Collaborator, "verify_password",
+                         side_effect=verify_password):
+        assert authentication(email="collab@example.com", password="wrong") is None
+
+    assert len(checked) == 3
+
+
+def test_authentication_throttle_unavailable(test_db, capsys):
+    with patch("controllers.collaborator_controller.check_login",
+               side_effect=OperationalError("SELECT", {}, Exception("down"))
+               ), patch.object(Collaborator, "verify_password") as verify_password:
+        result = authentication(email="collab@example.com", password="password")
+
+    assert result is None
+    assert "Login is unavailable" in capsys.readouterr().out
+    verify_password.assert_not_called()
+
+
+def test_import_collaborators_controller(test_db, tmp_path, capsys):
+    Role.get_or_create(test_db, "sales")
+    import_file = tmp_path / "hires.csv"
+    import_file.write_text(
+        "employee_number,name,email,role_id,password\n"
+        "200,Alice,alice@example.com,1,password1\n"
+        "201,Bob,bob@example.com,1,password2\n"
+    )
+    with patch(
+        "controllers.collaborator_controller.SessionLocal", return_value=test_db
+    ), patch("controllers.collaborator_controller.BCRYPT_ROUNDS", 4):
+        with open(import_file) as file:
+            assert import_collaborators_controller(file, workers=2) == 2
+
+    assert "2 collaborators successfully imported" in capsys.readouterr().out
+    bob = Collaborator.get_by_email("bob@example.com", test_db)
+    assert bob.employee_number == 201
+    assert bob.password.startswith("$2b$04$")
+    assert bob.verify_password("password2")
+
+
+def test_import_collaborators_controller_errors(test_db, tmp_path, capsys):
+    Role.get_or_create(test_db, "sales")
+    import_file = tmp_path / "hires.jsonl"
+    import_file.write_text(
+        '{"employee_number": 300, "name": "Carol", "email": "carol@example.com",'
+        ' "role_id": 1, "password": "password3"}\n'
+        '{"employee_number": 300, "name": "Dan", "email": "dan@example.com",'
+        ' "role_id": 9, "password": "password4"}\n'
+    )
+    with patch(
+        "controllers.collaborator_controller.SessionLocal", return_value=test_db
+    ), patch("controllers.collaborator_controller.hash_passwords") as hash_passwords:
+        with open(import_file) as file:
+            assert import_collaborators_controller(file) is None
+
+    output = capsys.readouterr().out
+    assert "Line 2: Duplicate employee_number 300, see line 1" in output
+    assert "Line 2: Role 9 not found" in output
+    hash_passwords.assert_not_called()
+    assert Collaborator.get_by_email("carol@example.com", test_db) is None
+
+
+def test_import_collaborators_controller_malformed_rows(test_db, tmp_path, capsys):
+    Role.get_or_create(test_db, "sales")
+    csv_file = tmp_path / "hires.csv"
+    csv_file.write_text(
+        "employee_number,name,email,role_id,password\n"
+        "400,Erin,erin@example.com,1,password5,extra,values\n"
+        "401,Fay,fay@example.com,1,password6\n"
+    )
+    jsonl_file = tmp_path / "hires.jsonl"
+    jsonl_file.write_text(
+        '{"employee_number": 402, "name": "Gus", "email": "gus@example.com",'
+        ' "role_id": 1, "password": "password7", "manager": "Fay"}\n'
+        '[402, "Gus"]\n'
+        '{"employee_number": 403, "name": "Ida"\n'
+        '{"employee_number": 404, "name": "Jo", "email": "jo@example.com",'
+        ' "role_id": 1, "password": "password9", "team": "east"}\n'
+    )
+    with patch(
+        "controllers.collaborator_controller.SessionLocal", return_value=test_db
+    ):
+        for import_file in (csv_file, jsonl_file):
+            with open(import_file) as file:
+                assert import_collaborators_controller(file) is None
+
+    output = capsys.readouterr().out
+    assert "Line 2: 2 more values than columns in the header" in output
+    assert "Line 1: Unknown fields: manager" in output
+    assert "Line 2: Expected an object with the collaborator fields" in output
+    # The lines after one that isn't JSON are still checked.
+    assert "Line 3: Invalid JSON: Expecting ',' delimiter" in output
+    assert "Line 4: Unknown fields: team" in output
+    assert Collaborator.get_by_email("fay@example.com", test_db) is None
+
+
+def test_import_collaborators_controller_conflict(test_db, collaborator, tmp_path,
+                                                  capsys):
+    import_file = tmp_path / "hires.csv"
+    import_file.write_text(
+        "employee_number,name,email,role_id,password\n"
+        "500,Hal,collab@example.com,1,password8\n"
+    )
+    # The email is taken after the uniqueness check.
+    with patch(
+        "controllers.collaborator_controller.SessionLocal", return_value=test_db
+    ), patch.object(Collaborator, "get_existing", return_value=[]), \
+            patch("controllers.collaborator_controller.BCRYPT_ROUNDS", 4):
+        with open(import_file) as file:
+            assert import_collaborators_controller(file, workers=1) is None
+
+    assert "File: Nothing imported, a row conflicts with the database" in (
+        capsys.readouterr().out
+    )
+    assert Collaborator.get_by_employee_number(500, test_db) is None
+
+
+def test_collaborator_lookups(test_db, collaborator):
+    assert collaborator_lookup("email") is collaborator_lookup("email")
+    assert Collaborator.get_by_email("collab@example.com", test_db) is collaborator
+    assert Collaborator.get_by_email("nobody@example.com", test_db) is None
+    with_role = Collaborator.get_with_role_by_email("collab@example.com", test_db)
+    assert str(with_role.role) == "sales"
+    test_db.expunge_all()
+    found = Collaborator.get_by_id(collaborator.id, test_db)
+    # Loaded once, then served from the identity map.
+    assert Collaborator.get_by_id(collaborator.id, test_db) is found
+    assert Collaborator.get_by_id(None, test_db) is None
+
+
+def test_collaborator_role_cache(test_db, collaborator, reference_cache):
+    support = Role.get_or_create(test_db, name="support")
+    assert Collaborator.get_role_name(collaborator.id, test_db) == "sales"
+    assert Role.get_name(collaborator.role_id, test_db) == "sales"
+    assert Collaborator.get_role_name(999, test_db) is None
+
+    # Served from the cache until the collaborator is updated.
+    with patch("models.collaborator.Collaborator.get_by_id") as get_by_id:
+        assert Collaborator.get_role_name(collaborator.id, test_db) == "sales"
+    get_by_id.assert_not_called()
+    collaborator.update(test_db, role_id=support.id)
+    assert Collaborator.get_role_name(collaborator.id, test_db) == "support"
+    assert reference_cache.stats()["invalidations"] == 1
+
+    collaborator.delete(test_db)
+    assert Collaborator.get_role_name(collaborator.id, test_db) is None
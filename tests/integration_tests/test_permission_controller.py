@@ -0,0 +1,42 @@
+from config.permissions import PERMISSIONS_VERSION, ROLE_PERMISSIONS
+from controllers.permission_controller import sync_permissions
+from models.collaborator import Permission, PermissionsVersion, Role
+
+
+def test_sync_permissions(test_db):
+    role = Role.get_or_create(test_db, "sales")
+    role.permissions.append(Permission(name="obsolete-permission"))
+    role.permissions.append(Permission(name="list-clients"))
+    test_db.commit()
+
+    changes = sync_permissions(test_db)
+
+    assert changes["roles"] == ["support", "management"]
+    assert changes["permissions_removed"] == ["obsolete-permission"]
+    assert "sales:list-clients" not in changes["granted"]
+    assert changes["version"] == [PERMISSIONS_VERSION]
+    for role in test_db.query(Role):
+        names = {permission.name for permission in role.permissions}
+        assert names == ROLE_PERMISSIONS[str(role)]
+    assert str(PermissionsVersion.get_current(test_db)) == PERMISSIONS_VERSION
+
+    assert not any(sync_permissions(test_db).values())
+
+
+def test_sync_permissions_dry_run(test_db):
+    changes = sync_permissions(test_db, dry_run=True)
+
+    assert changes["roles"] == ["sales", "support", "management"]
+    assert test_db.query(Role).count() == 0
+    assert PermissionsVersion.get_current(test_db) is None
+
+
+def test_sync_permissions_invalidates_cache(test_db, reference_cache):
+    sync_permissions(test_db)
+    support = test_db.query(Role).filter(Role.name == "support").one()
+    assert Role.get_permission_names(support) == sorted(ROLE_PERMISSIONS["support"])
+    sync_permissions(test_db, dry_run=True)
+    assert reference_cache.stats()["invalidations"] == 1
+    assert reference_cache.stats()["size"] == 1
+    sync_permissions(test_db)
+    assert reference_cache.stats()["size"] == 0
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from config import revocation
+from models.collaborator import RevokedToken
+
+
+def test_revoke_tokens(test_db, tmp_path, monkeypatch):
+    monkeypatch.setenv("REVOCATION_CACHE_PATH", str(tmp_path / "revoked.bloom"))
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    with patch("config.revocation.SessionLocal", return_value=test_db):
+        assert not revocation.is_revoked("copied-token")
+        revocation.revoke_tokens([{"jti": "copied-token",
+                                   "exp": expires_at.timestamp()}])
+
+        assert revocation.is_revoked("copied-token")
+        assert not revocation.is_revoked("other-token")
+    assert RevokedToken.is_revoked(test_db, "copied-token")
+
+
+def test_revocation_filter_refreshes_incrementally(test_db):
+    expires_at = datetime.utcnow() + timedelta(hours=1)
+    test_db.add(RevokedToken(jti="first", expires_at=expires_at))
+    test_db.add(RevokedToken(jti="expired", expires_at=datetime.utcnow()))
+    test_db.commit()
+    bloom = revocation.refresh_filter(test_db)
+    assert "first" in bloom and "expired" not in bloom
+
+    last_id = bloom.last_id
+    test_db.add(RevokedToken(jti="second", expires_at=expires_at))
+    test_db.commit()
+    with patch.object(RevokedToken, "get_since",
+                      wraps=RevokedToken.get_since) as get_since:
+        bloom = revocation.refresh_filter(test_db, bloom)
+
+    get_since.assert_called_once_with(test_db, last_id)
+    assert "second" in bloom and bloom.count == 2
@@ -1,5 +1,8 @@
 import os
-from unittest.mock import patch, mock_open
+from unittest.mock import MagicMock, patch, mock_open
+import click
+import jwt
+import pytest
 from datetime import datetime, timedelta, timezone
 from config.auth import (
     is_token_expired,
@@ -9,6 +12,17 @@ from config.auth import (
     get_login_collaborator,
     is_authenticated,
     has_permission,
+    LoginSession,
+    TokenStore,
+    create_refresh_token,
+    get_refresh_token_path,
+    renew_access_token,
+)
+from config.permissions import (
+    PERMISSIONS_VERSION,
+    ROLE_PERMISSIONS,
+    decode_permissions,
+    encode_permissions,
 )
 
 
@@ -196,3 +210,217 @@ def test_has_permission(mock_get_login_collaborator):
     # Assert the function calls
     mock_get_login_collaborator.assert_called_with(session="dummy_session")
     assert mock_collaborator.role.permissions == ["permission1", "permission2"]
+
+
+def test_login_session_short_circuits_auth(mock_get_token_from_file):
+    collaborator = MagicMock()
+    login_session = LoginSession(
+        token="dummy_token",
+        expires_at=datetime.now(timezone.utc).timestamp() + 60,
+        collaborator=collaborator,
+        permissions=frozenset({"list-clients"}),
+    )
+    session = MagicMock()
+    with click.Context(click.Command("shell"), obj=login_session):
+        assert is_authenticated()
+        assert has_permission("list-clients", session)
+        assert not has_permission("delete-client", session)
+        assert get_login_collaborator(session) == session.merge.return_value
+
+    session.merge.assert_called_once_with(collaborator, load=False)
+    session.query.assert_not_called()
+    mock_get_token_from_file.assert_not_called()
+
+
+def test_login_session_expired():
+    login_session = LoginSession(
+        token="dummy_token",
+        expires_at=datetime.now(timezone.utc).timestamp() - 60,
+        collaborator=MagicMock(),
+        permissions=frozenset(),
+    )
+    with click.Context(click.Command("shell"), obj=login_session):
+        assert not is_authenticated()
+
+
+def test_login_session_revoked(capsys):
+    token = jwt.encode({"sub": "collab@example.com", "jti": "revoked-jti"},
+                       "secret", algorithm="HS256")
+    login_session = LoginSession(
+        token=token,
+        expires_at=datetime.now(timezone.utc).timestamp() + 60,
+        collaborator=MagicMock(),
+        permissions=frozenset(),
+    )
+    with click.Context(click.Command("shell"), obj=login_session), \
+            patch("config.auth.SECRET_KEY", "secret"), \
+            patch("config.auth.ALGORITHM", "HS256"), \
+            patch("config.auth.is_revoked", return_value=True) as is_revoked:
+        assert not is_authenticated()
+
+    is_revoked.assert_called_once_with("revoked-jti")
+    assert "Token has been revoked." in capsys.readouterr().out
+
+
+def test_permission_bitmask_roundtrip():
+    names = {"list-clients", "create-event", "unknown-permission"}
+    mask = encode_permissions(names)
+    assert decode_permissions(mask) == {"list-clients", "create-event"}
+    assert decode_permissions(0) == frozenset()
+
+
+@pytest.mark.parametrize("version, queried", [(PERMISSIONS_VERSION, False),
+                                              ("stale", True)])
+def test_has_permission_from_token_claims(version, queried):
+    token = jwt.encode(
+        {"sub": "collab@example.com",
+         "perms": encode_permissions({"list-clients"}),
+         "pv": version},
+        "secret",
+        algorithm="HS256",
+    )
+    session = MagicMock()
+    identity = MagicMock(permissions=frozenset({"list-clients"}))
+    with patch("config.auth.SECRET_KEY", "secret"), \
+            patch("config.auth.ALGORITHM", "HS256"), \
+            patch("config.auth.get_token_from_file", return_value=token), \
+            patch("config.auth.LoginSession.open", return_value=identity) as open_, \
+            click.Context(click.Command("list-clients")):
+        assert has_permission("list-clients", session)
+        assert not has_permission("delete-client", session)
+    assert open_.called is queried
+
+
+def test_has_permission_uses_compiled_matrix(mock_get_login_collaborator):
+    mock_collaborator = mock_get_login_collaborator.return_value
+    mock_collaborator.role.__str__.return_value = "support"
+
+    assert has_permission("update-event", "dummy_session")
+    assert not has_permission("create-contract", "dummy_session")
+    assert not mock_collaborator.role.permissions.__iter__.called
+
+
+def test_has_permission_database_backend(mock_get_token_from_file):
+    login_session = LoginSession(
+        token="dummy_token",
+        expires_at=datetime.now(timezone.utc).timestamp() + 60,
+        collaborator=MagicMock(email="collab@example.com"),
+        permissions=frozenset(),
+    )
+    with patch("config.auth.AUTHORIZATION_BACKEND", "database"), \
+            patch("config.auth.Collaborator.has_permission",
+                  return_value=True) as exists, \
+            click.Context(click.Command("shell"), obj=login_session):
+        assert has_permission("list-clients", "dummy_session")
+    exists.assert_called_once_with("collab@example.com", "list-clients", "dummy_session")
+
+
+def test_token_store_reads_and_decodes_once(tmp_path):
+    token_path = tmp_path / "access_token"
+    token = jwt.encode({"sub": "collab@example.com"}, "secret", algorithm="HS256")
+    token_path.write_text(token)
+    store = TokenStore()
+
+    with patch("config.auth.jwt.decode", wraps=jwt.decode) as decode:
+        for _ in range(3):
+            assert store.read(str(token_path)) == token
+            claims = store.decode(token, "secret", "HS256")
+            assert claims["sub"] == "collab@example.com"
+            unverified = store.decode(token, "secret", "HS256", verify_signature=False)
+            assert unverified == claims
+    assert decode.call_count == 1
+
+    other = jwt.encode({"sub": "other@example.com"}, "secret", algorithm="HS256")
+    token_path.write_text(other)
+    assert store.read(str(token_path)) == other
+    token_path.unlink()
+    with pytest.raises(FileNotFoundError):
+        store.read(str(token_path))
+
+
+@pytest.fixture
+def token_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("TOKEN_DIR_PATH", ".epic_events")
+    monkeypatch.setenv("TOKEN_FILENAME", "access_token")
+    with patch("config.auth.SECRET_KEY", "secret"), \
+            patch("config.auth.ALGORITHM", "HS256"):
+        yield
+
+
+def db_collaborator(role="support"):
+    collaborator = MagicMock(email="collab@example.com", role_id=2)
+    collaborator.role.__str__.return_value = role
+    return collaborator
+
+
+def test_renew_access_token(token_files):
+    auth_time = int(datetime.now(timezone.utc).timestamp()) - 29 * 86400
+    data = {"sub": "collab@example.com", "perms": 3, "role": "sales",
+            "auth_time": auth_time}
+    refresh_token = create_refresh_token(data)
+    old_refresh = jwt.decode(refresh_token, "secret", algorithms=["HS256"])
+    with pytest.raises(ValueError):
+        get_email_from_access_token(refresh_token)
+    with patch("config.auth.ACCESS_TOKEN_EXPIRE_MINUTES", 1):
+        create_access_token(data)
+
+    with patch("config.auth.Collaborator.get_with_role_by_email",
+               return_value=db_collaborator()), \
+            patch("config.auth.is_revoked", return_value=False), \
+            patch("config.auth.revoke_tokens") as revoke:
+        assert renew_access_token()
+        # A token far from its expiration is kept.
+        assert not renew_access_token()
+
+    claims = jwt.decode(get_token_from_file(), "secret", algorithms=["HS256"])
+    # The role and permissions come from the database, not the old token.
+    assert claims["role"] == "support" and claims["role_id"] == 2
+    assert decode_permissions(claims["perms"]) == ROLE_PERMISSIONS["support"]
+    assert claims["auth_time"] == auth_time and "typ" not in claims
+    revoke.assert_called_once_with([old_refresh])
+    with open(get_refresh_token_path()) as file:
+        refresh = jwt.decode(file.read(), "secret", algorithms=["HS256"])
+    # Capped REFRESH_TOKEN_MAX_DAYS after the login, not slid 7 days.
+    assert refresh["exp"] == auth_time + 30 * 86400
+    assert refresh["jti"] != old_refresh["jti"]
+
+
+@pytest.mark.parametrize("collaborator, revoked", [
+    (None, False),
+    (db_collaborator(), True),
+])
+def test_renew_access_token_rejected(token_files, collaborator, revoked):
+    data = {"sub": "collab@example.com", "perms": 3}
+    create_refresh_token(data)
+    with patch("config.auth.ACCESS_TOKEN_EXPIRE_MINUTES", 1):
+        token = create_access_token(data)
+
+    with patch("config.auth.Collaborator.get_with_role_by_email",
+               return_value=collaborator), \
+            patch("config.auth.is_revoked", return_value=revoked), \
+            patch("config.auth.revoke_tokens") as revoke:
+        assert not renew_access_token()
+    assert get_token_from_file() == token
+    revoke.assert_not_called()
+
+
+def test_renew_access_token_in_shell(token_files):
+    data = {"sub": "collab@example.com", "perms": 3}
+    create_refresh_token(data)
+    login_session = LoginSession(
+        token="old", expires_at=datetime.now(timezone.utc).timestamp() + 30,
+        collaborator=MagicMock(), permissions=frozenset(),
+    )
+    collaborator = db_collaborator()
+    with patch("config.auth.Collaborator.get_with_role_by_email",
+               return_value=collaborator), \
+            patch("config.auth.is_revoked", return_value=False), \
+            patch("config.auth.revoke_tokens"), \
+            click.Context(click.Command("shell"), obj=login_session):
+        assert renew_access_token()
+
+    assert login_session.token == get_token_from_file()
+    assert login_session.expires_at > datetime.now(timezone.utc).timestamp() + 60
+    assert login_session.collaborator is collaborator
+    assert login_session.permissions == ROLE_PERMISSIONS["support"]
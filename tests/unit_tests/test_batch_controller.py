@@ -0,0 +1,58 @@
+import io
+from unittest.mock import MagicMock
+
+import click
+import pytest
+
+from controllers.batch_controller import build_argv, read_operations, resolve_command
+
+
+@click.command()
+@click.option("--client_id", type=int)
+@click.option("--full-name", type=str)
+@click.option("--unpaid", is_flag=True)
+def toy_command(client_id, full_name, unpaid):
+    pass
+
+
+def test_build_argv():
+    argv = build_argv(
+        toy_command,
+        "toy-command",
+        {"client_id": 1, "full_name": "Foo", "unpaid": True},
+    )
+    assert argv == ["toy-command", "--client_id", "1", "--full-name", "Foo",
+                    "--unpaid"]
+
+
+def test_build_argv_skips_false_flags_and_none():
+    argv = build_argv(toy_command, "toy-command", {"unpaid": False, "client_id": None})
+    assert argv == ["toy-command"]
+
+
+def test_build_argv_unknown_option():
+    with pytest.raises(ValueError):
+        build_argv(toy_command, "toy-command", {"bogus": 1})
+
+
+def test_read_operations():
+    file = io.StringIO(
+        '{"cmd": "list-clients"}\n'
+        "\n"
+        "not json\n"
+        '{"args": {}}\n'
+    )
+    operations = list(read_operations(file))
+    assert operations[0] == (1, {"cmd": "list-clients"})
+    assert operations[1][0] == 3
+    assert isinstance(operations[1][1], ValueError)
+    assert operations[2][0] == 4
+    assert isinstance(operations[2][1], ValueError)
+
+
+def test_resolve_command_routes_update_event_by_role():
+    cli = MagicMock()
+    login_session = MagicMock()
+    login_session.collaborator.role.__str__.return_value = "support"
+    resolve_command(cli, "ctx", "update-event", login_session)
+    cli.get_command.assert_called_once_with("ctx", "update-event-support")
@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock, patch
+
+from config.cache import ReferenceCache
+
+
+def test_reference_cache_hits_and_misses():
+    cache = ReferenceCache(maxsize=10, ttl=60)
+    loader = MagicMock(return_value="sales")
+
+    assert cache.get("roles", 1, loader) == "sales"
+    assert cache.get("roles", "1", loader) == "sales"
+    loader.assert_called_once_with()
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_reference_cache_does_not_cache_none():
+    cache = ReferenceCache(maxsize=10, ttl=60)
+    loader = MagicMock(return_value=None)
+
+    assert cache.get("collaborators", "id:1", loader) is None
+    assert cache.get("collaborators", "id:1", loader) is None
+    assert loader.call_count == 2
+
+
+def test_reference_cache_ttl_and_lru():
+    cache = ReferenceCache(maxsize=2, ttl=60)
+    with patch("config.cache.time.monotonic", return_value=1000.0):
+        for key in ("a", "b"):
+            cache.get("roles", key, lambda: key)
+        cache.get("roles", "a", MagicMock())
+        cache.get("roles", "c", lambda: "c")
+    assert cache.stats()["evictions"] == 1
+    assert set(cache._entries) == {("roles", "a"), ("roles", "c")}
+
+    loader = MagicMock(return_value="a2")
+    with patch("config.cache.time.monotonic", return_value=1061.0):
+        assert cache.get("roles", "a", loader) == "a2"
+    loader.assert_called_once_with()
+
+
+def test_reference_cache_invalidate_namespace():
+    cache = ReferenceCache(maxsize=10, ttl=60)
+    cache.get("roles", 1, lambda: "sales")
+    cache.get("collaborators", "id:1", lambda: "sales")
+
+    cache.invalidate("collaborators")
+    assert set(cache._entries) == {("roles", "1")}
+    cache.invalidate()
+    assert not cache._entries
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_reference_cache_shared_store(tmp_path):
+    path = str(tmp_path / "reference_cache.db")
+    first = ReferenceCache(path, maxsize=10, ttl=60)
+    assert first.get("permissions", "sales", lambda: ["list-clients"]) == [
+        "list-clients"
+    ]
+
+    # Another process finds the value in the store.
+    second = ReferenceCache(path, maxsize=10, ttl=60)
+    loader = MagicMock()
+    assert second.get("permissions", "sales", loader) == ["list-clients"]
+    loader.assert_not_called()
+    assert second.stats()["shared_hits"] == 1
+
+    first.invalidate("permissions")
+    first.flush()  # At exit in a command.
+    third = ReferenceCache(path, maxsize=10, ttl=60)
+    assert third.get("permissions", "sales", lambda: []) == []
+    shared = third.stats()["shared"]
+    assert shared["misses"] == 2
+    assert shared["shared_hits"] == 1
+    assert shared["invalidations"] == 1
+
+
+def test_reference_cache_store_unavailable(tmp_path):
+    cache = ReferenceCache(str(tmp_path), maxsize=10, ttl=60)
+    with patch("config.cache.get_logger"):
+        assert cache.get("roles", 1, lambda: "sales") == "sales"
+        assert cache.get("roles", 1, MagicMock()) == "sales"
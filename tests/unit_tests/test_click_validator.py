@@ -24,7 +24,9 @@ from validators.click_validator import (
     validate_role,
     validate_support,
     validate_employee_number,
+    validate_email_exist,
 )
+from config.database import REPLICA_KEY, command_session
 
 
 def test_validate_email():
@@ -62,23 +64,20 @@ def test_validate_boolean():
         validate_boolean(None, None, "maybe")
 
 
-@patch("validators.click_validator.Client.get_by_id")
-@patch("validators.click_validator.get_login_collaborator")
+@patch("validators.click_validator.Client.is_owned_by")
+@patch("validators.click_validator.get_identity")
 @patch("validators.click_validator.SessionLocal")
 def test_validate_client_by_sales(
-    mock_session, mock_get_login_collaborator, mock_get_by_id
+    mock_session, mock_get_identity, mock_is_owned_by
 ):
     mock_session.return_value = MagicMock()
-    mock_client = MagicMock()
-    mock_client.commercial_collaborator_id = 1
-    mock_get_by_id.return_value = mock_client
-    mock_login_collaborator = MagicMock()
-    mock_login_collaborator.id = 1
-    mock_get_login_collaborator.return_value = mock_login_collaborator
+    mock_get_identity.return_value = MagicMock(collaborator_id=1)
+    mock_is_owned_by.return_value = True
 
     assert validate_client_by_sales(None, None, 1) == 1
+    mock_is_owned_by.assert_called_once_with(1, 1, mock_session.return_value)
 
-    mock_login_collaborator.id = 2
+    mock_is_owned_by.return_value = False
     with pytest.raises(click.BadParameter):
         validate_client_by_sales(None, None, 1)
 
@@ -139,77 +138,89 @@ def test_validate_attendees():
         validate_attendees(None, None, "invalid")
 
 
-@patch("validators.click_validator.Client.get_by_id")
+@patch("validators.click_validator.Client.exists")
+@patch("validators.click_validator.Client.is_accessible")
+@patch("validators.click_validator.get_identity")
 @patch("validators.click_validator.SessionLocal")
-def test_validate_client(mock_session, mock_get_by_id):
+def test_validate_client(mock_session, mock_get_identity, mock_is_accessible,
+                         mock_exists):
     mock_session.return_value = MagicMock()
-    mock_get_by_id.return_value = True  # Simulate a found client
+    mock_get_identity.return_value = MagicMock(collaborator_id=1, role="sales")
+    mock_is_accessible.return_value = True  # Simulate a found client
 
     assert validate_client(None, None, 1) == 1
+    mock_is_accessible.assert_called_once_with(1, 1, "sales",
+                                               mock_session.return_value)
 
-    mock_get_by_id.return_value = None  # Simulate a not found client
-    with pytest.raises(click.BadParameter):
+    mock_is_accessible.return_value = False  # Simulate a not found client
+    mock_exists.return_value = False
+    with pytest.raises(click.BadParameter, match="Client not found"):
+        validate_client(None, None, 1)
+
+    mock_exists.return_value = True  # Simulate the client of another sales
+    with pytest.raises(click.BadParameter, match="only your clients"):
         validate_client(None, None, 1)
 
 
-@patch("validators.click_validator.Event.get_by_id")
+@patch("validators.click_validator.Event.exists")
+@patch("validators.click_validator.Event.is_accessible")
+@patch("validators.click_validator.get_identity")
 @patch("validators.click_validator.SessionLocal")
-def test_validate_event_id(mock_session, mock_get_by_id):
+def test_validate_event_id(mock_session, mock_get_identity, mock_is_accessible,
+                           mock_exists):
     mock_session.return_value = MagicMock()
-    mock_get_by_id.return_value = True  # Simulate a found event
+    mock_get_identity.return_value = MagicMock(collaborator_id=1, role="support")
+    mock_is_accessible.return_value = True  # Simulate a found event
 
     assert validate_event_id(None, None, 1) == 1
 
-    mock_get_by_id.return_value = None  # Simulate a not found event
-    with pytest.raises(click.BadParameter):
+    mock_is_accessible.return_value = False  # Simulate a not found event
+    mock_exists.return_value = False
+    with pytest.raises(click.BadParameter, match="Event not found"):
         validate_event_id(None, None, 1)
 
 
-@patch("validators.click_validator.Event.get_by_id")
-@patch("validators.click_validator.get_login_collaborator")
+@patch("validators.click_validator.Event.exists")
+@patch("validators.click_validator.Event.is_owned_by")
+@patch("validators.click_validator.get_identity")
 @patch("validators.click_validator.SessionLocal")
 def test_validate_event_assigned_to_support_id(
-    mock_session, mock_get_login_collaborator, mock_get_by_id
+    mock_session, mock_get_identity, mock_is_owned_by, mock_exists
 ):
     mock_session.return_value = MagicMock()
-    mock_event = MagicMock()
-    mock_event.collaborator_support_id = 1
-    mock_get_by_id.return_value = mock_event
-    mock_login_collaborator = MagicMock()
-    mock_login_collaborator.id = 1
-    mock_get_login_collaborator.return_value = mock_login_collaborator
+    mock_get_identity.return_value = MagicMock(collaborator_id=1)
+    mock_is_owned_by.return_value = True
 
     assert validate_event_assigned_to_support_id(None, None, 1) == 1
 
-    mock_login_collaborator.id = 2
-    with pytest.raises(click.BadParameter):
+    mock_is_owned_by.return_value = False
+    mock_exists.return_value = True
+    with pytest.raises(click.BadParameter, match="not allowed"):
         validate_event_assigned_to_support_id(None, None, 1)
 
 
-@patch("validators.click_validator.Collaborator.get_by_id")
+@patch("validators.click_validator.Collaborator.get_role_name")
 @patch("validators.click_validator.SessionLocal")
-def test_validate_collaborator(mock_session, mock_get_by_id):
+def test_validate_collaborator(mock_session, mock_get_role_name):
     mock_session.return_value = MagicMock()
-    mock_get_by_id.return_value = True  # Simulate a found collaborator
+    mock_get_role_name.return_value = "sales"  # Simulate a found collaborator
 
     assert validate_collaborator(None, None, 1) == 1
 
-    mock_get_by_id.return_value = None  # Simulate a not found collaborator
+    mock_get_role_name.return_value = None  # Simulate a not found collaborator
     with pytest.raises(click.BadParameter):
         validate_collaborator(None, None, 1)
 
 
-@patch("validators.click_validator.Collaborator.get_by_id")
+@patch("validators.click_validator.Collaborator.get_role_name")
 @patch("validators.click_validator.SessionLocal")
-def test_validate_commercial(mock_session, mock_get_by_id):
+def test_validate_commercial(mock_session, mock_get_role_name):
     mock_session.return_value = MagicMock()
-    mock_collaborator = MagicMock()
-    mock_collaborator.role = "sales"
-    mock_get_by_id.return_value = mock_collaborator
+    mock_get_role_name.return_value = "sales"
 
     assert validate_commercial(None, None, 1) == 1
 
-    mock_collaborator.role = "support"  # Simulate a non-sales role
+    mock_get_role_name.return_value = "support"  # Simulate a non-sales role
     with pytest.raises(click.BadParameter):
         validate_commercial(None, None, 1)
 
@@ -242,53 +253,47 @@ def test_validate_contract_id_is_signed(mock_session, mock_get_by_id):
         validate_contract_id_is_signed(None, None, 1)
 
 
-@patch("validators.click_validator.Contract.get_by_id")
-@patch("validators.click_validator.get_login_collaborator")
+@patch("validators.click_validator.Contract.exists")
+@patch("validators.click_validator.Contract.is_accessible")
+@patch("validators.click_validator.get_identity")
 @patch("validators.click_validator.SessionLocal")
 def test_validate_contract_by_collaborator(
-    mock_session, mock_get_login_collaborator, mock_get_by_id
+    mock_session, mock_get_identity, mock_is_accessible, mock_exists
 ):
     mock_session.return_value = MagicMock()
-    mock_contract = MagicMock()
-    mock_contract.commercial_collaborator_id = 1
-    mock_contract.status = True
-    mock_get_by_id.return_value = mock_contract
-    mock_login_collaborator = MagicMock()
-    mock_login_collaborator.id = 1
-    mock_login_collaborator.role = "sales"
-    mock_get_login_collaborator.return_value = mock_login_collaborator
+    mock_get_identity.return_value = MagicMock(collaborator_id=1, role="sales")
+    mock_is_accessible.return_value = True
 
     assert validate_contract_by_collaborator(None, None, 1) == 1
 
-    mock_login_collaborator.id = 2
-    with pytest.raises(click.BadParameter):
+    mock_is_accessible.return_value = False
+    mock_exists.return_value = True
+    with pytest.raises(click.BadParameter, match="permission"):
         validate_contract_by_collaborator(None, None, 1)
 
 
-@patch("validators.click_validator.Role.get_by_id")
+@patch("validators.click_validator.Role.get_name")
 @patch("validators.click_validator.SessionLocal")
-def test_validate_role(mock_session, mock_get_by_id):
+def test_validate_role(mock_session, mock_get_name):
     mock_session.return_value = MagicMock()
-    mock_get_by_id.return_value = True  # Simulate a found role
+    mock_get_name.return_value = "sales"  # Simulate a found role
 
     assert validate_role(None, None, 1) == 1
 
-    mock_get_by_id.return_value = None  # Simulate a not found role
+    mock_get_name.return_value = None  # Simulate a not found role
     with pytest.raises(click.BadParameter):
         validate_role(None, None, 1)
 
 
-@patch("validators.click_validator.Collaborator.get_by_id")
+@patch("validators.click_validator.Collaborator.get_role_name")
 @patch("validators.click_validator.SessionLocal")
-def test_validate_support(mock_session, mock_get_by_id):
+def test_validate_support(mock_session, mock_get_role_name):
     mock_session.return_value = MagicMock()
-    mock_collaborator = MagicMock()
-    mock_collaborator.role = "support"
-    mock_get_by_id.return_value = mock_collaborator
+    mock_get_role_name.return_value = "support"
 
     assert validate_support(None, None, 1) == 1
 
-    mock_collaborator.role = "sales"  # Simulate a non-support role
+    mock_get_role_name.return_value = "sales"  # Simulate a non-support role
     with pytest.raises(click.BadParameter):
         validate_support(None, None, 1)
 
@@ -304,3 +309,22 @@ def test_validate_employee_number(mock_session, mock_get_by_employee_number):
     mock_get_by_employee_number.return_value = None  # Simulate a not found employee
     with pytest.raises(click.BadParameter):
         validate_employee_number(None, None, 1)
+
+
+@pytest.mark.parametrize("read_only", [True, False])
+def test_validators_follow_the_command_replica_flag(read_only):
+    # Only the read-only commands flag their session for the replica.
+    replica_reads = []
+
+    def get_by_email(email, session):
+        replica_reads.append(bool(session.info.get(REPLICA_KEY)))
+
+    ctx = click.Context(click.Command("create-collaborator"))
+    with ctx, patch("validators.click_validator.Collaborator") as collaborator:
+        collaborator.get_by_email.side_effect = get_by_email
+        session = command_session(ctx)
+        if read_only:
+            session.info[REPLICA_KEY] = True
+        validate_email_exist(ctx, None, "new@example.com")
+
+    assert replica_reads == [read_only]
@@ -25,15 +25,11 @@ def test_delete(mock_session, client_unit):
 
 def test_get_by_id(mock_session):
     client_id = 1
-    mock_client = MagicMock(id=client_id)
-    mock_session.query.return_value.filter.return_value.first.return_value = (
-        mock_client
-    )
+    mock_session.get.return_value = MagicMock(id=client_id)
     client_unit = Client.get_by_id(client_id, mock_session)
     assert client_unit.id == client_id
-    mock_session.query.assert_called_once_with(Client)
-    first_call = mock_session.query.return_value.filter.return_value.first
-    first_call.assert_called_once()
+    mock_session.get.assert_called_once_with(Client, client_id)
+    assert Client.get_by_id(None, mock_session) is None
 
 
 def test_get_all(mock_session):
@@ -0,0 +1,59 @@
+from benchmarks.cold_start import (
+    check_budgets,
+    import_breakdown,
+    load_budgets,
+    parse_importtime,
+    write_baseline,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     sentry_sdk.utils
+import time:       200 |        300 |   sentry_sdk
+import time:        50 |        350 | config.logger
+import time:       400 |        400 |   sqlalchemy
+import time:        10 |        410 | controllers.client_controller
+import time:        20 |         20 | controllers.event_controller
+"""
+
+
+def test_parse_importtime():
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+    assert imports[0] == ("sentry_sdk.utils", 2, 100, 100)
+    assert imports[2] == ("config.logger", 0, 50, 350)
+    assert len(imports) == 6
+
+
+def test_import_breakdown_counts_outermost_imports():
+    breakdown = import_breakdown(
+        parse_importtime(IMPORTTIME_OUTPUT),
+        tracked=["config.logger", "sentry_sdk", "sqlalchemy", "controllers.*"],
+    )
+    assert breakdown == {
+        "config.logger": 0.35,
+        "sentry_sdk": 0.3,
+        "sqlalchemy": 0.4,
+        "controllers.*": 0.43,
+        "total": 0.78,
+    }
+
+
+def test_check_budgets():
+    results = {"whoami": {"wall_ms": 120, "imports_ms": {"total": 80}}}
+    assert check_budgets(results, {"whoami": {"wall_ms": 150, "import_ms": 100}}) == []
+    assert check_budgets(results, {"whoami": {"wall_ms": 100}}) == [
+        "whoami: wall_ms 120 > budget 100"
+    ]
+    assert check_budgets(results, {}) == []
+
+
+def test_budgets_derived_from_baseline(tmp_path):
+    path = str(tmp_path / "budgets.json")
+    results = {"whoami": {"wall_ms": 500.4, "imports_ms": {"total": 300.2}}}
+    write_baseline(results, path, tolerance=1.3)
+
+    budgets = load_budgets(path)
+    assert budgets == {"whoami": {"wall_ms": 650.0, "import_ms": 390.0}}
+    slower = {"whoami": {"wall_ms": 1000, "imports_ms": {"total": 300}}}
+    assert check_budgets(slower, budgets) == ["whoami: wall_ms 1000 > budget 650"]
+    assert load_budgets(str(tmp_path / "missing.json")) == {}
@@ -57,7 +57,7 @@ def test_list_contracts_controller(mock_session):
         mock_get_all.return_value = mock_contracts
 
         list_contracts_controller(filters=[])
-        mock_get_all.assert_called_once_with(mock_session, [])
+        mock_get_all.assert_called_once_with(mock_session, [], None)
         mock_list_view.assert_called_once_with(mock_contracts)
 
 
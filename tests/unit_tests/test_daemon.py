@@ -0,0 +1,143 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import click
+import pytest
+
+from config.daemon import (
+    bind_socket,
+    forward_to_daemon,
+    read_piped_stdin,
+    run_command,
+    serve,
+)
+from config.logger import get_logger
+
+
+@click.group()
+def toy_cli():
+    pass
+
+
+@toy_cli.command()
+@click.option("--name", prompt="Name")
+def hello(name):
+    print(f"Hello {name}")
+
+
+@toy_cli.command()
+def fail():
+    exit(3)
+
+
+@toy_cli.command()
+@click.argument("path", type=click.Path(exists=True))
+def where(path):
+    with open(path) as file:
+        print(f"{file.read()} {os.getenv('GREETING')}")
+    get_logger().info("read %s", path)
+
+
+def test_run_command_captures_output_and_prompts():
+    stdout = io.StringIO()
+    exit_code = run_command(toy_cli, ["hello"], stdin="Ada\n", stdout=stdout)
+    assert exit_code == 0
+    assert "Hello Ada" in stdout.getvalue()
+
+
+def test_run_command_returns_exit_codes():
+    stderr = io.StringIO()
+    assert run_command(toy_cli, ["fail"], stderr=stderr) == 3
+    assert run_command(toy_cli, ["unknown"], stderr=stderr) == 2
+    assert "No such command" in stderr.getvalue()
+
+
+def test_run_command_aborts_when_prompt_has_no_input():
+    stderr = io.StringIO()
+    assert run_command(toy_cli, ["hello"], stdout=io.StringIO(), stderr=stderr) == 1
+    assert "Aborted!" in stderr.getvalue()
+
+
+def test_forward_to_daemon_without_daemon(tmp_path):
+    socket_path = str(tmp_path / "missing.sock")
+    assert forward_to_daemon(["hello"], socket_path=socket_path) is None
+
+
+def test_forward_to_daemon_roundtrip(tmp_path, capsys):
+    socket_path = str(tmp_path / "ee.sock")
+    server = bind_socket(socket_path)
+    assert os.stat(socket_path).st_mode & 0o777 == 0o600
+    process = multiprocessing.get_context("fork").Process(
+        target=serve, args=(toy_cli, server, socket_path), daemon=True
+    )
+    process.start()
+    server.close()
+    try:
+        exit_code = forward_to_daemon(
+            ["hello", "--name", "Bob"], socket_path=socket_path
+        )
+    finally:
+        process.terminate()
+        process.join()
+
+    assert exit_code == 0
+    assert "Hello Bob" in capsys.readouterr().out
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = str(tmp_path / "ee.sock")
+    server = bind_socket(socket_path)
+    process = multiprocessing.get_context("fork").Process(
+        target=serve, args=(toy_cli, server, socket_path), daemon=True
+    )
+    process.start()
+    server.close()
+    yield socket_path
+    process.terminate()
+    process.join()
+
+
+def test_forward_to_daemon_runs_in_client_context(daemon, tmp_path, monkeypatch,
+                                                  capsys):
+    (tmp_path / "data.txt").write_text("data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GREETING", "hi")
+
+    assert forward_to_daemon(["where", "data.txt"], socket_path=daemon) == 0
+    output = capsys.readouterr()
+    assert "data hi" in output.out
+    # The log record goes to the client, not to the daemon's console.
+    assert "read data.txt" in output.err
+
+
+def test_forward_to_daemon_relays_prompts(daemon, capsys):
+    with patch("config.daemon.sys.stdin", MagicMock(isatty=lambda: True)), \
+            patch("builtins.input", return_value="Ada") as answer:
+        assert forward_to_daemon(["hello"], socket_path=daemon) == 0
+    answer.assert_called_once_with("Name: ")
+    assert "Hello Ada" in capsys.readouterr().out
+
+
+def test_forward_to_daemon_with_other_settings(daemon, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///other.db")
+    assert forward_to_daemon(["hello", "--name", "Bob"], socket_path=daemon) is None
+
+
+def test_read_piped_stdin_waits_for_the_writer():
+    read_fd, write_fd = os.pipe()
+
+    def write_late():
+        time.sleep(0.2)
+        os.write(write_fd, b"admin@example.com\nsecret\n")
+        os.close(write_fd)
+
+    writer = threading.Thread(target=write_late)
+    writer.start()
+    with os.fdopen(read_fd) as stdin, patch("config.daemon.sys.stdin", stdin):
+        assert read_piped_stdin() == "admin@example.com\nsecret\n"
+    writer.join()
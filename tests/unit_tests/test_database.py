@@ -0,0 +1,234 @@
+from unittest.mock import MagicMock
+
+import click
+import pytest
+from sqlalchemy import (
+    Column, Integer, String, Table, column, create_engine, table, text,
+)
+from sqlalchemy import select as sql_select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import QueuePool, StaticPool
+
+import config.database
+from config.database import (
+    REPLICA_KEY,
+    SessionLocal,
+    dispose,
+    get_engine,
+    get_pool_profile,
+    get_pool_stats,
+    get_replica_engine,
+    replica_reads,
+    session_scope,
+    set_process_pool_profile,
+    start_sql_profile,
+    stop_sql_profile,
+)
+
+
+def test_engine_is_built_by_the_first_query():
+    dispose()
+    session = SessionLocal()
+    assert config.database._engine is None
+    try:
+        assert session.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        session.close()
+    assert config.database._engine is get_engine()
+
+
+def test_dispose_drops_the_engine():
+    engine = get_engine()
+    dispose()
+    assert config.database._engine is None
+    assert get_engine() is not engine
+    assert config.database.engine is get_engine()
+
+
+def test_session_scope_shares_one_session_per_command():
+    factory = MagicMock()
+
+    @click.command()
+    def command():
+        with session_scope(factory) as first, session_scope(factory) as second:
+            assert first is second
+        first.close.assert_not_called()
+
+    command.main([], standalone_mode=False)
+    factory.assert_called_once()
+    factory.return_value.close.assert_called_once()
+
+
+def test_session_scope_outside_command_closes_session():
+    factory = MagicMock()
+    with session_scope(factory) as session:
+        pass
+    session.close.assert_called_once()
+
+
+def test_pool_profiles(monkeypatch):
+    monkeypatch.setattr(config.database, "DB_POOL_PROFILE", "auto")
+    monkeypatch.setattr(config.database, "_process_profile", "cli")
+    assert get_pool_profile("sqlite://") == "memory"
+    assert get_pool_profile("sqlite:///:memory:") == "memory"
+    assert get_pool_profile("sqlite:///./test.db") == "cli"
+    set_process_pool_profile("server")
+    assert get_pool_profile("postgresql://db/epic") == "server"
+    monkeypatch.setattr(config.database, "DB_POOL_PROFILE", "cli")
+    assert get_pool_profile("sqlite://") == "cli"
+    monkeypatch.setattr(config.database, "DB_POOL_PROFILE", "bogus")
+    with pytest.raises(ValueError):
+        get_pool_profile()
+    dispose()
+
+
+def test_memory_profile_shares_one_database(monkeypatch):
+    dispose()
+    monkeypatch.setattr(config.database, "DATABASE_URL", "sqlite://")
+    try:
+        with get_engine().begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        session = SessionLocal()
+        try:
+            assert session.execute(text("SELECT COUNT(*) FROM t")).scalar() == 0
+        finally:
+            session.close()
+        assert isinstance(get_engine().pool, StaticPool)
+    finally:
+        dispose()
+
+
+def test_pool_metrics_count_checkouts_and_timeouts(monkeypatch, tmp_path):
+    dispose()
+    monkeypatch.setattr(config.database, "DATABASE_URL",
+                        f"sqlite:///{tmp_path / 'pool.db'}")
+    monkeypatch.setattr(config.database, "DB_POOL_PROFILE", "server")
+    monkeypatch.setattr(config.database, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(config.database, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(config.database, "DB_POOL_TIMEOUT", 0.01)
+    try:
+        engine = get_engine()
+        assert isinstance(engine.pool, QueuePool)
+        with engine.connect():
+            assert get_pool_stats()["checked_out"] == 1
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+        stats = get_pool_stats()
+        assert stats["profile"] == "server"
+        assert stats["checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["checked_out"] == 0
+        assert stats["peak_checked_out"] == 1
+        assert stats["saturation"] == 1.0
+        assert stats["wait_max_ms"] >= 10
+    finally:
+        dispose()
+
+
+def test_sql_profile_records_statements(monkeypatch):
+    dispose()
+    monkeypatch.setattr(config.database, "DATABASE_URL", "sqlite://")
+    try:
+        with session_scope(SessionLocal) as session:
+            session.execute(text("CREATE TABLE t (x INTEGER)"))
+            profile = start_sql_profile()
+            for x in range(3):
+                session.execute(text("INSERT INTO t VALUES (:x)"), {"x": x})
+            # SQLite reports a rowcount of -1 for a SELECT.
+            assert session.execute(text("SELECT x FROM t")).scalars().all() == [
+                0, 1, 2
+            ]
+        assert stop_sql_profile() is profile
+        assert stop_sql_profile() is None
+        result = profile.to_dict()
+        assert result["statements"] == 4
+        assert result["rows"] == 3
+        assert result["db_ms"] <= result["total_ms"]
+        assert len(result["slowest"]) == 4
+        assert result["repeated"][0]["count"] == 3
+        assert result["repeated"][0]["statement"] == "INSERT INTO t VALUES (?)"
+    finally:
+        dispose()
+
+
+def test_sql_profile_counts_returned_rows(monkeypatch):
+    dispose()
+    monkeypatch.setattr(config.database, "DATABASE_URL", "sqlite://")
+    try:
+        with session_scope(SessionLocal) as session:
+            session.execute(text("CREATE TABLE t (x INTEGER)"))
+            session.execute(text("INSERT INTO t VALUES (1), (2)"))
+            profile = start_sql_profile()
+            assert len(session.execute(text("SELECT x FROM t")).all()) == 2
+        stop_sql_profile()
+        assert profile.to_dict()["rows"] == 2
+    finally:
+        dispose()
+
+
+def replica_databases(monkeypatch, tmp_path):
+    dispose()
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (name TEXT)"))
+            connection.execute(text("INSERT INTO t VALUES (:name)"),
+                               {"name": name})
+        engine.dispose()
+    monkeypatch.setattr(config.database, "DATABASE_URL",
+                        f"sqlite:///{tmp_path / 'primary'}.db")
+    monkeypatch.setattr(config.database, "DATABASE_REPLICA_URL",
+                        f"sqlite:///{tmp_path / 'replica'}.db")
+
+
+def test_replica_reads_and_primary_writes(monkeypatch, tmp_path):
+    replica_databases(monkeypatch, tmp_path)
+    select = sql_select(column("name")).select_from(table("t"))
+    session = SessionLocal()
+    try:
+        assert session.execute(select).scalar() == "primary"
+        with replica_reads(session):
+            assert session.execute(select).scalar() == "replica"
+            session.execute(text("INSERT INTO t VALUES ('written')"))
+            session.commit()
+        assert session.execute(select.where(column("name") == "written")
+                               ).scalar() == "written"
+    finally:
+        session.close()
+        dispose()
+
+
+def test_replica_reads_expire_loaded_objects(monkeypatch, tmp_path):
+    replica_databases(monkeypatch, tmp_path)
+    base = declarative_base()
+
+    class Row(base):
+        __table__ = Table("t", base.metadata,
+                          Column("rowid", Integer, primary_key=True),
+                          Column("name", String))
+
+    session = SessionLocal()
+    try:
+        with replica_reads(session):
+            row = session.query(Row).one()
+            assert row.name == "replica"
+        # Code writing afterwards doesn't reuse what the replica returned.
+        assert row.name == "primary"
+    finally:
+        session.close()
+        dispose()
+
+
+def test_replica_lag_falls_back_to_primary(monkeypatch, tmp_path):
+    replica_databases(monkeypatch, tmp_path)
+    monkeypatch.setattr(config.database, "get_replication_lag",
+                        lambda connection: 60.0)
+    select = sql_select(column("name")).select_from(table("t"))
+    try:
+        with session_scope(SessionLocal, replica=True) as session:
+            assert session.execute(select).scalar() == "primary"
+            assert REPLICA_KEY in session.info
+        assert get_replica_engine() is None
+    finally:
+        dispose()
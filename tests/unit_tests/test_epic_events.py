@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+
+import click
+
+from epic_events import LAZY_COMMANDS, cli
+
+
+def test_lazy_commands_resolve_to_click_commands():
+    ctx = click.Context(cli)
+    for name in LAZY_COMMANDS:
+        command = cli.get_command(ctx, name)
+        assert isinstance(command, click.Command)
+        assert command.name == name
+
+
+def test_list_commands_includes_registry():
+    ctx = click.Context(cli)
+    assert set(LAZY_COMMANDS) <= set(cli.list_commands(ctx))
+
+
+def test_get_command_unknown_returns_none():
+    ctx = click.Context(cli)
+    assert cli.get_command(ctx, "unknown-command") is None
+
+
+def test_help_does_not_import_commands():
+    code = (
+        "import sys\n"
+        "from epic_events import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "loaded = [m for m in sys.modules if m.split('.')[0] in "
+        "('commands', 'controllers', 'validators', 'config', 'models')]\n"
+        "print(','.join(loaded))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    )
+    assert "list-events" in result.stdout
+    assert result.stdout.splitlines()[-1] == ""
+
+
+def test_profile_sql_file_option(tmp_path):
+    from unittest.mock import patch
+
+    from click.testing import CliRunner
+    from sqlalchemy import text
+
+    from config.database import SessionLocal, session_scope
+
+    def whoami_controller():
+        with session_scope(SessionLocal) as session:
+            session.execute(text("SELECT 1"))
+
+    path = tmp_path / "profile.json"
+    with patch("commands.auth_commands.whoami_controller", whoami_controller):
+        result = CliRunner().invoke(
+            cli, ["--profile-sql", "--profile-sql-file", str(path), "whoami"]
+        )
+    assert result.exit_code == 0
+    assert "SQL: 1 statements" in result.output
+    assert json.loads(path.read_text())["slowest"][0]["statement"] == "SELECT 1"
+
+
+def test_read_only_commands_check_auth_on_the_primary():
+    from unittest.mock import patch
+
+    from click.testing import CliRunner
+
+    from config.database import REPLICA_KEY, SessionLocal, session_scope
+
+    replica_reads = {}
+
+    def check(name, result=True):
+        def checked(*args, **kwargs):
+            with session_scope(SessionLocal) as session:
+                replica_reads[name] = bool(session.info.get(REPLICA_KEY))
+            return result
+        return checked
+
+    with patch("config.auth.renew_access_token", check("renew")), \
+            patch("config.auth.is_authenticated", check("authenticated")), \
+            patch("config.auth.has_permission", check("permission")), \
+            patch("commands.client_commands.list_clients_controller",
+                  check("controller", None)):
+        result = CliRunner().invoke(cli, ["list-clients"])
+
+    assert result.exit_code == 0
+    assert replica_reads == {"renew": False, "authenticated": False,
+                             "permission": False, "controller": True}
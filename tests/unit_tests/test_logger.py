@@ -0,0 +1,93 @@
+import logging
+import os
+import queue
+import subprocess
+import sys
+from unittest.mock import patch
+
+from logging.handlers import QueueListener
+
+import config.logger
+from config.logger import DroppingQueueHandler, LazySentryHandler, stop_listener
+
+
+def make_record(level=logging.ERROR, msg="Something failed"):
+    return logging.LogRecord("epic_events_logger", level, __file__, 1, msg,
+                             None, None)
+
+
+def test_dropping_queue_handler_does_not_block():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record())
+    handler.handle(make_record())
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_stop_listener_flushes_once(monkeypatch):
+    log_queue = queue.Queue()
+    handler = ListHandler()
+    listener = QueueListener(log_queue, handler)
+    monkeypatch.setattr(config.logger, "_listener", listener)
+    monkeypatch.setattr(config.logger, "_stopped", False)
+    listener.start()
+    for _ in range(3):
+        log_queue.put(make_record())
+
+    with patch.object(listener, "stop", wraps=listener.stop) as stop:
+        stop_listener()
+        stop_listener()
+
+    stop.assert_called_once_with()
+    assert len(handler.records) == 3
+
+
+def test_stop_listener_full_queue(monkeypatch):
+    listener = QueueListener(queue.Queue(maxsize=1), ListHandler())
+    monkeypatch.setattr(config.logger, "_listener", listener)
+    monkeypatch.setattr(config.logger, "_stopped", False)
+    listener.queue.put(make_record())
+    # Not started: the record stays, and the end marker has no room.
+    stop_listener(timeout=0.5)
+    assert config.logger._stopped
+    assert listener.queue.qsize() == 1
+
+
+def test_lazy_sentry_handler_inits_on_first_record():
+    handler = LazySentryHandler("https://key@example.com/1")
+    with patch("sentry_sdk.init") as mock_init, \
+            patch("sentry_sdk.integrations.logging.EventHandler.handle") as mock_handle:
+        handler.handle(make_record())
+        handler.handle(make_record())
+    mock_init.assert_called_once()
+    assert mock_init.call_args.kwargs["traces_sample_rate"] == 0.0
+    assert mock_handle.call_count == 2
+
+
+def test_views_do_not_import_sentry():
+    code = (
+        "import sys\n"
+        "import views.client_view\n"
+        "views.client_view.logger.info('hello')\n"
+        "print('sentry_sdk' in sys.modules)\n"
+    )
+    env = dict(os.environ, SENTRY_DSN="https://key@example.com/1")
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    )
+    assert result.stdout.strip() == "False"
+    assert "hello" in result.stderr
@@ -0,0 +1,27 @@
+import uuid
+
+from config.revocation import BloomFilter
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    revoked = [uuid.uuid4().hex for _ in range(1000)]
+    for jti in revoked:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in revoked)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+    assert false_positives < 300
+    assert bloom.is_full()
+
+
+def test_bloom_filter_roundtrip():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    bloom.add("revoked-jti")
+    bloom.last_id = 42
+
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+    assert "revoked-jti" in restored
+    assert (restored.last_id, restored.count) == (42, 1)
+    assert (restored.size, restored.hash_count) == (bloom.size, bloom.hash_count)
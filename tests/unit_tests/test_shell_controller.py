@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock, patch
+
+from controllers.shell_controller import shell_controller
+
+
+def test_shell_controller_dispatches_with_login_session():
+    login_session = MagicMock()
+    commands = iter(["whoami", "list-clients --help", "shell", "exit"])
+    with patch(
+        "controllers.shell_controller.is_authenticated", return_value=True
+    ), patch(
+        "controllers.shell_controller.open_login_session",
+        return_value=login_session,
+    ) as mock_open_login_session, patch(
+        "controllers.shell_controller.shell_welcome_view"
+    ), patch(
+        "builtins.input", side_effect=lambda prompt: next(commands)
+    ), patch(
+        "controllers.shell_controller.invoke_cli"
+    ) as mock_invoke_cli:
+        cli = MagicMock()
+        shell_controller(cli)
+
+    mock_open_login_session.assert_called_once()
+    assert mock_invoke_cli.call_count == 2
+    mock_invoke_cli.assert_any_call(cli, ["whoami"], obj=login_session)
+    mock_invoke_cli.assert_any_call(
+        cli, ["list-clients", "--help"], obj=login_session
+    )
+
+
+def test_shell_controller_requires_authentication():
+    with patch(
+        "controllers.shell_controller.is_authenticated", return_value=False
+    ), patch(
+        "controllers.shell_controller.authentication_required_view"
+    ) as mock_view, patch(
+        "controllers.shell_controller.open_login_session"
+    ) as mock_open_login_session:
+        shell_controller(MagicMock())
+
+    mock_view.assert_called_once()
+    mock_open_login_session.assert_not_called()
+
+
+def test_shell_controller_stops_after_logout():
+    commands = iter(["logout", "whoami"])
+    with patch(
+        "controllers.shell_controller.is_authenticated", return_value=True
+    ), patch(
+        "controllers.shell_controller.open_login_session"
+    ), patch(
+        "controllers.shell_controller.shell_welcome_view"
+    ), patch(
+        "builtins.input", side_effect=lambda prompt: next(commands)
+    ), patch(
+        "controllers.shell_controller.invoke_cli"
+    ) as mock_invoke_cli:
+        shell_controller(MagicMock())
+
+    assert mock_invoke_cli.call_count == 1
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from config.throttle import LoginThrottle, check_login, get_os_user
+
+
+@pytest.fixture
+def factory(test_db):
+    return sessionmaker(bind=test_db.get_bind())
+
+
+@pytest.fixture
+def throttle_at():
+    # Freezes the clock of the throttle.
+    with patch("config.throttle.datetime") as mock_datetime:
+        yield mock_datetime.utcnow
+
+
+def test_login_throttle_per_email(factory):
+    throttle = LoginThrottle(factory, max_attempts=2,
+                             max_user_attempts=100, window=60)
+    for _ in range(2):
+        assert throttle.check("collab@example.com") == 0
+        throttle.record_failure("collab@example.com")
+
+    assert 0 < throttle.check("Collab@example.com") <= 60
+    assert throttle.check("other@example.com") == 0
+
+    throttle.record_success("collab@example.com")
+    assert throttle.check("collab@example.com") == 0
+    counters = throttle.counters()
+    assert counters["failed"] == 2
+    assert counters["rejected"] == 1
+    assert counters["succeeded"] == 1
+    # The logins of other@ and the last one of collab@ are still in flight.
+    assert counters["window_failures"] == 2
+
+
+def test_login_throttle_reserves_attempts(factory):
+    throttle = LoginThrottle(factory, max_attempts=3, max_user_attempts=100,
+                             window=60)
+    # Logins in flight: none of them has failed yet.
+    allowed = [throttle.check("collab@example.com") == 0 for _ in range(6)]
+    assert allowed == [True] * 3 + [False] * 3
+
+    throttle.record_success("collab@example.com")
+    assert throttle.check("collab@example.com") == 0
+    assert throttle.counters()["window_failures"] == 1
+
+
+def test_login_throttle_per_user(factory):
+    throttle = LoginThrottle(factory, max_attempts=5,
+                             max_user_attempts=3, window=60)
+    for number in range(3):
+        throttle.record_failure(f"user{number}@example.com")
+    assert throttle.check("new@example.com") > 0
+
+    with patch("config.throttle.get_os_user", return_value="someone-else"):
+        assert throttle.check("new@example.com") == 0
+
+
+def test_login_throttle_window_slides(factory, throttle_at):
+    throttle = LoginThrottle(factory, max_attempts=1,
+                             max_user_attempts=100, window=60)
+    start = datetime(2026, 1, 1)
+    throttle_at.return_value = start
+    throttle.record_failure("collab@example.com")
+    assert throttle.check("collab@example.com") == 60
+    throttle_at.return_value = start + timedelta(seconds=61)
+    assert throttle.check("collab@example.com") == 0
+
+
+def test_get_os_user_ignores_environment(monkeypatch):
+    user = get_os_user()
+    monkeypatch.setenv("USER", "spoofed")
+    monkeypatch.setenv("LOGNAME", "spoofed")
+    assert get_os_user() == user != "spoofed"
+
+
+def test_check_login_fails_closed():
+    with patch("config.throttle.get_login_throttle") as get_login_throttle:
+        get_login_throttle.return_value.check.side_effect = OperationalError(
+            "SELECT", {}, Exception("database is locked")
+        )
+        with pytest.raises(OperationalError):
+            check_login("collab@example.com")
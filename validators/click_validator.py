@@ -3,8 +3,8 @@ import re
 
 import click
 
-from config.auth import get_login_collaborator
-from config.database import SessionLocal
+from config.auth import get_identity
+from config.database import SessionLocal, session_scope
 from models.client import Client
 from models.collaborator import Collaborator, Role
 from models.contract import Contract
@@ -34,16 +34,15 @@ def validate_email(ctx, param, value):
 
 def validate_email_exist(ctx, param, value):
     validate_email(ctx, param, value)
-    session = SessionLocal()
-    collaborator = Collaborator.get_by_email(value, session)
-    employee_number = ctx.params.get("employee_number")
-    collaborator_by_employee_number = Collaborator.get_by_employee_number(
-        employee_number,
-        session
-    )
-    if collaborator and collaborator != collaborator_by_employee_number:
-        raise click.BadParameter("Email already exists")
-    session.close()
+    with session_scope(SessionLocal) as session:
+        collaborator = Collaborator.get_by_email(value, session)
+        employee_number = ctx.params.get("employee_number")
+        collaborator_by_employee_number = Collaborator.get_by_employee_number(
+            employee_number,
+            session
+        )
+        if collaborator and collaborator != collaborator_by_employee_number:
+            raise click.BadParameter("Email already exists")
     return value
 
 
@@ -112,12 +111,10 @@ def validate_client_by_sales(ctx, param, value):
         click.BadParameter: If the client is not associated with the salesperson's
         account.
     """
-    session = SessionLocal()
-    client = Client.get_by_id(value, session)
-    login_collaborator = get_login_collaborator(session=session)
-    session.close()
-    if login_collaborator.id != client.commercial_collaborator_id:
-        raise click.BadParameter("Client must be associated with your account")
+    with session_scope(SessionLocal) as session:
+        identity = get_identity(session)
+        if not Client.is_owned_by(value, identity.collaborator_id, session):
+            raise click.BadParameter("Client must be associated with your account")
     return value
 
 
@@ -237,15 +234,13 @@ def validate_client(ctx, param, value):
     Raises:
         click.BadParameter: If the client ID is not found.
     """
-    session = SessionLocal()
-    client = Client.get_by_id(value, session)
-    login_collaborator = get_login_collaborator(session)
-    if str(login_collaborator.role) == "sales":
-        if client.commercial_collaborator_id != login_collaborator.id:
-            raise click.BadParameter("You are alowed to choose only your clients")
-    session.close()
-    if not client:
-        raise click.BadParameter("Client not found")
+    with session_scope(SessionLocal) as session:
+        identity = get_identity(session)
+        if not Client.is_accessible(value, identity.collaborator_id, identity.role,
+                                    session):
+            if Client.exists(value, session):
+                raise click.BadParameter("You are alowed to choose only your clients")
+            raise click.BadParameter("Client not found")
     return value
 
 
@@ -264,15 +259,13 @@ def validate_event_id(ctx, param, value):
     Raises:
         click.BadParameter: If the event is not found in the database.
     """
-    session = SessionLocal()
-    event = Event.get_by_id(value, session)
-    login_collaborator = get_login_collaborator(session)
-    if str(login_collaborator.role) == "support":
-        if event.collaborator_support_id != login_collaborator.id:
-            raise click.BadParameter("You are not allowed to update this event")
-    if not event:
-        raise click.BadParameter("Event not found")
-    session.close()
+    with session_scope(SessionLocal) as session:
+        identity = get_identity(session)
+        if not Event.is_accessible(value, identity.collaborator_id, identity.role,
+                                   session):
+            if Event.exists(value, session):
+                raise click.BadParameter("You are not allowed to update this event")
+            raise click.BadParameter("Event not found")
     return value
 
 
@@ -294,14 +287,12 @@ def validate_event_assigned_to_support_id(ctx, param, value):
         click.BadParameter: If the event is not found or the logged-in
         collaborator is not allowed to update the event.
     """
-    session = SessionLocal()
-    login_collaborator = get_login_collaborator(session)
-    event = Event.get_by_id(value, session)
-    if not event:
-        raise click.BadParameter("Event not found")
-    if event.collaborator_support_id != login_collaborator.id:
-        raise click.BadParameter("You are not allowed to update this event")
-    session.close()
+    with session_scope(SessionLocal) as session:
+        identity = get_identity(session)
+        if not Event.is_owned_by(value, identity.collaborator_id, session):
+            if not Event.exists(value, session):
+                raise click.BadParameter("Event not found")
+            raise click.BadParameter("You are not allowed to update this event")
     return value
 
 
@@ -321,10 +312,9 @@ def validate_collaborator(ctx, param, value):
     Raises:
         click.BadParameter: If the collaborator is not found in the database.
     """
-    session = SessionLocal()
-    collaborator = Collaborator.get_by_id(value, session)
-    session.close()
-    if not collaborator:
+    with session_scope(SessionLocal) as session:
+        role_name = Collaborator.get_role_name(value, session)
+    if role_name is None:
         raise click.BadParameter("Collaborator not found")
     return value
 
@@ -345,11 +335,10 @@ def validate_commercial(ctx, param, value):
     Raises:
         click.BadParameter: If the commercial is not found or has an invalid role.
     """
-    session = SessionLocal()
-    collaborator = Collaborator.get_by_id(value, session)
-    if not collaborator or str(collaborator.role) != "sales":
+    with session_scope(SessionLocal) as session:
+        role_name = Collaborator.get_role_name(value, session)
+    if role_name != "sales":
         raise click.BadParameter("commercial not found")
-    session.close()
     return value
 
 
@@ -369,9 +358,8 @@ def validate_contract(ctx, param, value):
     Raises:
         click.BadParameter: If the contract is not found in the database.
     """
-    session = SessionLocal()
-    found_contract = Contract.get_by_id(value, session)
-    session.close()
+    with session_scope(SessionLocal) as session:
+        found_contract = Contract.get_by_id(value, session)
     if not found_contract:
         raise click.BadParameter("Contract not found")
     return value
@@ -392,9 +380,8 @@ def validate_existing_contract_id(ctx, param, value):
     Raises:
         click.BadParameter: If the contract is not found.
     """
-    session = SessionLocal()
-    found_contract = Contract.get_by_id(value, session)
-    session.close()
+    with session_scope(SessionLocal) as session:
+        found_contract = Contract.get_by_id(value, session)
     if not found_contract:
         raise click.BadParameter("Contract not found")
     return value
@@ -415,9 +402,8 @@ def validate_contract_id_is_signed(ctx, param, value):
     Raises:
         click.BadParameter: If the contract is not found.
     """
-    session = SessionLocal()
-    found_contract = Contract.get_by_id(value, session)
-    session.close()
+    with session_scope(SessionLocal) as session:
+        found_contract = Contract.get_by_id(value, session)
     if not found_contract.status:
         raise click.BadParameter("Contract must be signed")
     return value
@@ -462,14 +448,13 @@ def validate_contract_by_collaborator(ctx, param, value):
         click.BadParameter: If the collaborator does not have
         permission on the contract.
     """
-    session = SessionLocal()
-    found_contract = Contract.get_by_id(value, session)
-    validate_existing_contract_id(ctx, param, value)
-    login_collaborator = get_login_collaborator(session)
-    if str(login_collaborator.role) == "sales":
-        if found_contract.commercial_collaborator_id != login_collaborator.id:
+    with session_scope(SessionLocal) as session:
+        identity = get_identity(session)
+        if not Contract.is_accessible(value, identity.collaborator_id,
+                                      identity.role, session):
+            if not Contract.exists(value, session):
+                raise click.BadParameter("Contract not found")
             raise click.BadParameter("You don't have permission on this contract")
-    session.close()
     return value
 
 
@@ -488,11 +473,10 @@ def validate_contract_is_assigned_to_another_event(ctx, param, value):
     Raises:
         click.BadParameter: If the contract is assigned to another event.
     """
-    session = SessionLocal()
-    found_contract = Contract.get_by_id(value, session)
-    if found_contract.event and found_contract.event.id != ctx.params.get("id"):
-        raise click.BadParameter("Contract is already assigned to an event")
-    session.close()
+    with session_scope(SessionLocal) as session:
+        found_contract = Contract.get_by_id(value, session)
+        if found_contract.event and found_contract.event.id != ctx.params.get("id"):
+            raise click.BadParameter("Contract is already assigned to an event")
     return value
 
 
@@ -511,13 +495,12 @@ def validate_contract_is_not_assigned_to_event(ctx, param, value):
     Raises:
         click.BadParameter: If the contract is assigned to an event.
     """
-    session = SessionLocal()
-    contract_id = ctx.params.get("id")
-    found_contract = Contract.get_by_id(contract_id, session)
-    if found_contract.event:
-        raise click.BadParameter("Contract is already assigned "
-                                 "to an event can't be unsigned")
-    session.close()
+    with session_scope(SessionLocal) as session:
+        contract_id = ctx.params.get("id")
+        found_contract = Contract.get_by_id(contract_id, session)
+        if found_contract.event:
+            raise click.BadParameter("Contract is already assigned "
+                                     "to an event can't be unsigned")
     return value
 
 
@@ -559,10 +542,9 @@ def validate_role(ctx, param, value):
     Raises:
         click.BadParameter: If the role is not found.
     """
-    session = SessionLocal()
-    client = Role.get_by_id(value, session)
-    session.close()
-    if not client:
+    with session_scope(SessionLocal) as session:
+        role_name = Role.get_name(value, session)
+    if role_name is None:
         raise click.BadParameter("Role not found")
     return value
 
@@ -583,11 +565,10 @@ def validate_support(ctx, param, value):
     Raises:
         click.BadParameter: If the support collaborator is not found.
     """
-    session = SessionLocal()
-    collaborator = Collaborator.get_by_id(value, session)
-    if not collaborator or str(collaborator.role) != "support":
+    with session_scope(SessionLocal) as session:
+        role_name = Collaborator.get_role_name(value, session)
+    if role_name != "support":
         raise click.BadParameter("support not found")
-    session.close()
     return value
 
 
@@ -611,11 +592,10 @@ def validate_employee_number(ctx, param, value):
         int(value)
     except ValueError:
         raise click.BadParameter("Employee_number must be a number")
-    session = SessionLocal()
-    collaborator = Collaborator.get_by_employee_number(value, session)
-    if not collaborator:
-        raise click.BadParameter("Employee_number not found")
-    session.close()
+    with session_scope(SessionLocal) as session:
+        collaborator = Collaborator.get_by_employee_number(value, session)
+        if not collaborator:
+            raise click.BadParameter("Employee_number not found")
     return value
 
 
@@ -638,9 +618,8 @@ def validate_employee_number_exist(ctx, param, value):
         int(value)
     except ValueError:
         raise click.BadParameter("Employee_number must be a number")
-    session = SessionLocal()
-    collaborator = Collaborator.get_by_employee_number(value, session)
-    if collaborator:
-        raise click.BadParameter("Employee_number already exist")
-    session.close()
+    with session_scope(SessionLocal) as session:
+        collaborator = Collaborator.get_by_employee_number(value, session)
+        if collaborator:
+            raise click.BadParameter("Employee_number already exist")
     return value
@@ -1,3 +1,6 @@
+import sys
+
+
 def permission_denied_view():
     print("Permission denied")
 
@@ -8,3 +11,16 @@ def forbidden_denied_view():
 
 def authentication_required_view():
     print("Authentication required. Exiting.")
+
+
+def sql_profile_view(profile):
+    # On stderr, so that it doesn't mix with the output of the command.
+    print(f"SQL: {profile['statements']} statements, {profile['db_ms']} ms in "
+          f"the database, {profile['other_ms']} ms outside of "
+          f"{profile['total_ms']} ms, {profile['rows']} rows returned, "
+          f"{profile['objects_loaded']} objects loaded", file=sys.stderr)
+    for entry in profile["slowest"]:
+        print(f"  slowest {entry['ms']} ms: {entry['statement']}", file=sys.stderr)
+    for entry in profile["repeated"]:
+        print(f"  repeated {entry['count']}x, {entry['ms']} ms: "
+              f"{entry['statement']}", file=sys.stderr)
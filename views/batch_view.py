@@ -0,0 +1,16 @@
+import json
+import sys
+
+
+def batch_result_view(line_number, command, succeeded, output):
+    print(json.dumps({
+        "line": line_number,
+        "cmd": command,
+        "status": "ok" if succeeded else "error",
+        "output": output,
+    }))
+
+
+def batch_summary_view(succeeded, failed):
+    print(f"Batch finished: {succeeded} succeeded, {failed} failed",
+          file=sys.stderr)
@@ -17,12 +17,43 @@ def error_invalid_email_password_view(email):
     logger.error(f"Invalid email or password: {email}")
 
 
+def error_too_many_login_attempts_view(email, wait):
+    print(f"Too many login attempts. Try again in {int(wait) + 1} seconds.")
+    logger.warning(f"Login throttled: {email}")
+
+
+def error_login_unavailable_view(e):
+    print("Login is unavailable: the login attempts could not be counted.")
+    logger.error(f"Login throttle unavailable: {e}")
+
+
+def error_tokens_not_revoked_view(e):
+    print("The tokens could not be revoked: copies stay valid until they expire.")
+    logger.error(f"Tokens not revoked: {e}")
+
+
+def login_stats_view(counters):
+    for name, value in counters.items():
+        print(f"{name} {value}")
+
+
 def success_create_collaborator_view(collaborator):
     print("Collaborator successfully created")
     logger.info("Collaborator successfully created: \n"
                 f"{collaborator}")
 
 
+def import_collaborators_error_view(line_number, message):
+    location = f"Line {line_number}" if line_number else "File"
+    print(f"{location}: {message}")
+    logger.error(f"Collaborator import - {location}: {message}")
+
+
+def import_collaborators_summary_view(count):
+    print(f"{count} collaborators successfully imported")
+    logger.info(f"{count} collaborators imported")
+
+
 def validation_error_view(e):
     print("Validation error:", e)
     logger.error(e)
@@ -0,0 +1,11 @@
+def daemon_listening_view(socket_path):
+    print(f"Listening on {socket_path}")
+
+
+def daemon_already_running_view(e):
+    print(e)
+
+
+def pool_stats_view(stats):
+    for name, value in stats.items():
+        print(f"{name} {value}")
@@ -0,0 +1,22 @@
+def sync_permissions_view(changes, version, dry_run=False):
+    if not any(changes.values()):
+        print(f"Permissions are up to date (version {version})")
+        return
+    for key, values in changes.items():
+        for value in values:
+            print(f"{key}: {value}")
+    if dry_run:
+        print(f"Dry run: nothing was changed (version {version})")
+    else:
+        print(f"Permissions synced to version {version}")
+
+
+def cache_stats_view(stats, cleared=False):
+    if cleared:
+        print("Reference cache cleared")
+    shared = stats.pop("shared", None)
+    for name, value in stats.items():
+        print(f"{name} {value}")
+    if shared is not None:
+        for name, value in shared.items():
+            print(f"total_{name} {value}")
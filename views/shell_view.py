@@ -0,0 +1,11 @@
+def shell_welcome_view(collaborator):
+    print(f"Logged in as {collaborator.name}. Type 'help' for the commands, "
+          "'exit' to quit.")
+
+
+def shell_error_view(e):
+    print(f"Error: {e}")
+
+
+def shell_nested_command_view(command):
+    print(f"'{command}' can't run inside the shell")